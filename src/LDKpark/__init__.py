@@ -1,3 +1,4 @@
 from .core import add
+from .launcher import start
 
-__all__=["add"]
+__all__=["add", "start"]
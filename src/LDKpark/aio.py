@@ -0,0 +1,112 @@
+"""
+asyncio 协程版的游戏循环。
+
+pygame 游戏每次迭代只跑一帧 (step + draw), 剩余的帧预算用 await 让给事件循环,
+不在 clock.tick 里阻塞; Tk 游戏每次迭代调用一次 root.update() 处理积压的事件和定时器。
+两者都可以和设备 I/O 等其他协程放在同一个事件循环里。
+
+sleep_until 用一次 asyncio.sleep 等到截止时间, 等待时长按 perf_counter
+换算成事件循环时钟上的剩余时间; 醒来仍早于截止时间 (时钟粒度) 时按新的剩余时间
+再睡一次, 不做忙等, 空闲时不占 CPU。事件循环的定时器 (epoll) 按毫秒向上取整,
+帧开始时间通常比目标晚 1 ms 以内, 其他协程占着事件循环时会更晚。
+
+    import asyncio
+    from LDKpark.games100 import snake
+    asyncio.run(snake.run_async())
+"""
+import asyncio
+import time
+from collections import deque
+
+from .perf import summarize
+
+TK_FPS = 60  # Tk 游戏每秒 update() 的次数
+
+
+async def sleep_until(deadline):
+    """协程式等待到 time.perf_counter() 达到 deadline"""
+    remaining = deadline - time.perf_counter()
+    while remaining > 0:
+        await asyncio.sleep(remaining)
+        remaining = deadline - time.perf_counter()
+
+
+class AsyncFrameClock:
+    """
+    协程版的 pygame.time.Clock.tick: 按固定周期安排帧的截止时间,
+    tick() 等到下一帧开始并返回距上一帧的秒数。
+    落后超过一帧时从当前时间重新排, 不连续补帧。
+    lateness 记录每帧实际开始时间比截止时间晚了多少。
+    """
+    def __init__(self, fps, window=600):
+        self.period = 1.0 / fps
+        self.deadline = None
+        self.last = None
+        self.lateness = deque(maxlen=window)
+
+    async def tick(self):
+        now = time.perf_counter()
+        if self.deadline is None:
+            self.deadline = self.last = now
+            return 0.0
+        self.deadline += self.period
+        if self.deadline < now - self.period:
+            self.deadline = now
+        await sleep_until(self.deadline)
+        now = time.perf_counter()
+        self.lateness.append(now - self.deadline)
+        frame_time = now - self.last
+        self.last = now
+        return frame_time
+
+    def stats(self):
+        """帧开始时间相对截止时间的延迟 p50/p95/p99 (毫秒)"""
+        result = summarize(self.lateness)
+        result["max_ms"] = max(self.lateness) * 1000 if self.lateness else 0.0
+        return result
+
+
+async def run_scene(game, fps, on_frame=None):
+    """
+    用协程跑一个 pygame 场景 (enter / step / draw / exit, 见 LDKpark.arcade),
+    直到 step 返回 False 或 on_frame(game) 返回 False。
+    返回使用的 AsyncFrameClock, 可以查看帧的延迟统计。
+    """
+    clock = AsyncFrameClock(fps)
+    profiler = game.profiler
+    frame_time = 0.0
+    game.enter()
+    try:
+        while True:
+            profiler.begin()
+            if not game.step(frame_time):
+                break
+            game.draw()
+            profiler.mark("draw")
+            frame_time = await clock.tick()
+            game.clock.tick()  # 不限帧率, 只让 clock.get_fps() 保持可用
+            profiler.end()
+            if on_frame and not on_frame(game):
+                break
+    finally:
+        game.exit()
+    return clock
+
+
+async def pump_tk(root, app=None, on_frame=None, fps=TK_FPS):
+    """
+    协程式的 Tk mainloop: 每帧调用一次 root.update(), 窗口关闭
+    或 on_frame(app) 返回 False 时结束 (后者由调用方负责销毁窗口)。
+    窗口被关闭时返回 True。
+    """
+    import tkinter as tk
+
+    clock = AsyncFrameClock(fps)
+    while True:
+        try:
+            root.update()
+        except tk.TclError:
+            return True
+        if on_frame and not on_frame(app):
+            return False
+        await clock.tick()
@@ -0,0 +1,235 @@
+"""
+单进程街机启动器。
+
+pygame 只初始化一次, 所有游戏共用一个窗口; 每个游戏是一个场景
+(enter / exit / step / draw), 切换游戏只是换一个场景, 不会 pygame.quit 再重建
+SDL、窗口和混音器。创建过的场景会保留, 再次进入时接着上次的状态。
+
+菜单里按数字键或点击选择游戏, 游戏中按 ESC 回到菜单, 关闭窗口退出。
+事件每帧只从 SDL 队列取一次: arcade 先处理自己的, 其余按原顺序作为 step(frame_time, events)
+的参数交给场景, 不放回队列, 顺序和时间戳保持不变 (输入延迟统计依赖时间戳)。
+每次切换从发起到新场景第一帧提交的耗时记录在 Arcade.switch_times, stats() 汇总。
+
+    from LDKpark import arcade
+    arcade.run()                    # 从菜单开始
+    arcade.run(start="snake")       # 直接进入贪吃蛇
+"""
+import time
+
+import pygame
+
+from .render import DirtyRenderer, ensure_display
+from .perf import FrameProfiler, summarize
+from .text import load_font, render as render_text
+
+FPS = 60
+MENU_SIZE = (600, 500)
+MENU_KEY = pygame.K_ESCAPE  # 游戏中按下回到菜单
+
+BG_COLOR = (25, 25, 35)
+WHITE = (255, 255, 255)
+DIM = (150, 150, 170)
+BUTTON_COLOR = (33, 150, 243)
+BUTTON_HOVER = (100, 181, 246)
+
+
+def _flappybird(fps):
+    from .games100 import flappybird
+    return flappybird.FlappyBirdGame(fps)
+
+
+def _runner(fps):
+    from .games100 import runner
+    return runner.RunnerGame(fps)
+
+
+def _snake(fps):
+    from .games100 import snake
+    return snake.SnakeGame(fps)
+
+
+def _shooter(fps):
+    from .games100 import shooter
+    return shooter.ShooterGame(fps=fps)
+
+
+# 游戏名 -> (菜单标题, 创建场景的函数)。tetris 和 minesweeper 是 Tk 程序, 不在其中
+GAMES = {
+    "flappybird": ("Flappy Bird", _flappybird),
+    "runner": ("Parkour Runner", _runner),
+    "snake": ("Snake", _snake),
+    "shooter": ("Shooter", _shooter),
+}
+
+
+class ArcadeMenu:
+    """选择游戏的菜单场景"""
+    def __init__(self, arcade):
+        self.arcade = arcade
+        self.screen = None
+        self.renderer = DirtyRenderer(None, True)
+        self.profiler = FrameProfiler()
+        self.font_large = load_font(None, 64)
+        self.font = load_font(None, 36)
+        self.buttons = []
+        for i, name in enumerate(arcade.games):
+            rect = pygame.Rect(MENU_SIZE[0] // 2 - 150, 150 + i * 70, 300, 50)
+            self.buttons.append([name, rect, False])
+
+    def enter(self):
+        self.screen = self.renderer.screen = ensure_display(MENU_SIZE, "LDKpark Arcade")
+        self.renderer.invalidate()
+
+    def exit(self):
+        pass
+
+    def step(self, frame_time, events=None):
+        mouse_pos = pygame.mouse.get_pos()
+        for button in self.buttons:
+            button[2] = button[1].collidepoint(mouse_pos)
+        for event in pygame.event.get() if events is None else events:
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    return False
+                index = event.key - pygame.K_1
+                if 0 <= index < len(self.buttons):
+                    self.arcade.switch(self.buttons[index][0])
+                    return True
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                for name, rect, hovered in self.buttons:
+                    if rect.collidepoint(event.pos):
+                        self.arcade.switch(name)
+                        return True
+        return True
+
+    def draw(self):
+        renderer = self.renderer
+        if renderer.static(tuple(button[2] for button in self.buttons)):
+            self.screen.fill(BG_COLOR)
+            title = render_text(self.font_large, "ARCADE", WHITE)
+            self.screen.blit(title, title.get_rect(center=(MENU_SIZE[0] // 2, 80)))
+            for i, (name, rect, hovered) in enumerate(self.buttons):
+                pygame.draw.rect(self.screen, BUTTON_HOVER if hovered else BUTTON_COLOR, rect, border_radius=10)
+                label = render_text(self.font, f"{i + 1}. {GAMES[name][0]}", WHITE)
+                self.screen.blit(label, label.get_rect(center=rect.center))
+            hint = render_text(self.font, "ESC: back to menu / quit", DIM)
+            self.screen.blit(hint, hint.get_rect(center=(MENU_SIZE[0] // 2, MENU_SIZE[1] - 30)))
+        renderer.present()
+
+
+class Arcade:
+    def __init__(self, games=None, fps=FPS):
+        pygame.init()
+        pygame.mixer.init()
+        self.games = list(games or GAMES)
+        self.fps = fps
+        self.clock = pygame.time.Clock()
+        self.scenes = {}   # 已创建的游戏场景, 切回来时直接复用
+        self.scene = None
+        self.running = True
+        self.switch_times = []    # 秒: 从发起切换到新场景第一帧提交
+        self.switch_start = None
+        self.carried_events = []  # 回到菜单那一帧剩下的事件, 下一帧交给菜单
+        self.menu = ArcadeMenu(self)
+
+    def get_scene(self, name):
+        scene = self.scenes.get(name)
+        if scene is None:
+            scene = self.scenes[name] = GAMES[name][1](self.fps)
+        return scene
+
+    def switch(self, name=None):
+        """切换到游戏 name, None 表示回到菜单"""
+        self.switch_start = time.perf_counter()
+        if self.scene is not None:
+            self.scene.exit()
+        self.scene = self.menu if name is None else self.get_scene(name)
+        self.scene.enter()
+
+    def filter_events(self):
+        """
+        取出本帧的事件, 处理 arcade 自己的 (关闭窗口, 游戏中的 ESC),
+        返回 (是否回到菜单, 其余事件按原顺序组成的列表)
+        """
+        back = False
+        events = self.carried_events
+        self.carried_events = []
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.running = False
+            elif event.type == pygame.KEYDOWN and event.key == MENU_KEY and self.scene is not self.menu:
+                back = True
+            else:
+                events.append(event)
+        return back, events
+
+    def frame(self, frame_time):
+        """跑当前场景的一帧"""
+        if self.switch_start is not None:
+            frame_time = 0  # 切换的耗时不算进新场景的逻辑时间
+        scene = self.scene
+        profiler = scene.profiler
+        profiler.begin()
+        back, events = self.filter_events()
+        if back:
+            self.carried_events = events
+            self.switch(None)
+            return
+        if not self.running:
+            return
+        if not scene.step(frame_time, events):
+            if scene is self.menu:
+                self.running = False
+            else:
+                self.switch(None)
+            return
+        if self.scene is not scene:  # 菜单在 step 里选了游戏
+            return
+        scene.draw()
+        profiler.mark("draw")
+        if self.switch_start is not None:
+            self.switch_times.append(time.perf_counter() - self.switch_start)
+            self.switch_start = None
+        profiler.end()
+
+    def run(self, start=None):
+        self.switch(start)
+        frame_time = 0
+        while self.running:
+            self.frame(frame_time)
+            frame_time = self.clock.tick(self.fps) / 1000.0
+        if self.scene is not None:
+            self.scene.exit()
+
+    def stats(self):
+        """切换次数与切换耗时的 p50/p95/p99 (毫秒)"""
+        result = {"switches": len(self.switch_times), "scenes": list(self.scenes)}
+        result.update(summarize(self.switch_times))
+        return result
+
+    def close(self):
+        self.scenes.clear()
+        self.scene = None
+        pygame.quit()
+
+# --- 模块接口 ---
+_arcade = None
+
+def run(games=None, start=None, fps=FPS):
+    """
+    参数:
+        games: 菜单里列出的游戏名, 默认 GAMES 中的全部
+        start: 启动后直接进入的游戏, 默认显示菜单
+    """
+    global _arcade
+    _arcade = Arcade(games, fps)
+    try:
+        _arcade.run(start)
+    finally:
+        close()
+
+def close():
+    global _arcade
+    if _arcade:
+        _arcade.close()
+        _arcade = None
@@ -0,0 +1,161 @@
+"""
+共享的图片资源管理。
+
+所有表面在加载或构建时就转换成屏幕的像素格式 (convert / convert_alpha),
+之后每次 blit 不再逐像素转换格式; 结果按 (路径, 尺寸) 或构建参数缓存。
+半透明遮罩、渐变天空这类静态表面也只构建一次。
+
+load_async / read_async 在小线程池中解码文件, 返回可轮询的结果,
+游戏主循环每帧检查 done(), 完成前继续显示占位图形, 不会卡住画面。
+线程池里只做解码和缩放, convert 依赖显示表面, 在主线程取结果时再做。
+
+需要在 pygame.display.set_mode 之后使用。
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+LOADER_THREADS = 2
+
+
+def convert(surface, alpha=True):
+    """转换到屏幕像素格式, 没有显示表面时原样返回"""
+    if not pygame.display.get_init() or pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha() if alpha else surface.convert()
+
+
+def _read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+class PendingAsset:
+    """异步加载中的图片, 在主线程调用 result() 转换格式并写入缓存"""
+    def __init__(self, manager, key, future, alpha=True):
+        self.manager = manager
+        self.key = key
+        self.future = future
+        self.alpha = alpha
+
+    def done(self):
+        return self.future.done()
+
+    def result(self):
+        """加载完成后的表面, 解码失败时抛出原异常"""
+        surface = self.future.result()
+        cached = self.manager.surfaces.get(self.key)
+        if cached is None:
+            # 在主线程转换像素格式, 与显示表面的操作不会并发
+            cached = self.manager.surfaces[self.key] = convert(surface, self.alpha)
+        return cached
+
+
+class AssetManager:
+    """按键缓存已转换的表面, 并统计命中与常驻内存"""
+    def __init__(self):
+        self.surfaces = {}
+        self.hits = 0
+        self.misses = 0
+        self._quit_registered = False
+        self._executor = None
+
+    def executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(LOADER_THREADS, thread_name_prefix="LDKpark-assets")
+        return self._executor
+
+    def get(self, key, build):
+        """取缓存的表面, 没有时调用 build() 构建并缓存"""
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+        self.misses += 1
+        if not self._quit_registered:
+            # pygame.quit 之后表面的像素格式与新窗口不再一致
+            pygame.register_quit(self.clear)
+            self._quit_registered = True
+        surface = build()
+        self.surfaces[key] = surface
+        return surface
+
+    def load(self, path, size=None, alpha=True):
+        """加载图片并转换格式, size 为 (宽, 高) 时返回缩放后的版本"""
+        path = os.path.abspath(path)
+        if size is None:
+            return self.get(("image", path, None, alpha),
+                            lambda: convert(pygame.image.load(path), alpha))
+        size = tuple(size)
+        # 从已转换的原图缩放, 结果保持屏幕像素格式
+        return self.get(("image", path, size, alpha),
+                        lambda: pygame.transform.scale(self.load(path, None, alpha), size))
+
+    def load_async(self, path, size=None, alpha=True):
+        """
+        在后台线程中解码并缩放图片, 返回 PendingAsset, 由它在主线程转换格式。
+        已在缓存中的图片直接返回已完成的结果。
+        """
+        path = os.path.abspath(path)
+        size = tuple(size) if size else None
+        key = ("image", path, size, alpha)
+        if key in self.surfaces:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+        def decode():
+            surface = self.surfaces.get(key)
+            if surface is None:
+                surface = pygame.image.load(path)
+                if size:
+                    surface = pygame.transform.scale(surface, size)
+            return surface
+        return PendingAsset(self, key, self.executor().submit(decode), alpha)
+
+    def read_async(self, path):
+        """在后台线程中读入整个文件, 返回 Future (bytes), 用于预读音乐等大文件"""
+        return self.executor().submit(_read_bytes, path)
+
+    def overlay(self, size, color):
+        """纯色半透明遮罩, color 为 (r, g, b, a), 用整面 alpha 而不是逐像素 alpha"""
+        size = tuple(size)
+        color = tuple(color)
+
+        def build():
+            surface = pygame.Surface(size)
+            surface.fill(color[:3])
+            surface = convert(surface, False)
+            surface.set_alpha(color[3] if len(color) > 3 else 255)
+            return surface
+        return self.get(("overlay", size, color), build)
+
+    def gradient(self, size, top, bottom):
+        """从 top 到 bottom 颜色的竖直渐变"""
+        size = tuple(size)
+
+        def build():
+            width, height = size
+            surface = pygame.Surface(size)
+            for y in range(height):
+                color = [int(a + (b - a) * y / height) for a, b in zip(top, bottom)]
+                pygame.draw.line(surface, color, (0, y), (width, y))
+            return convert(surface, False)
+        return self.get(("gradient", size, tuple(top), tuple(bottom)), build)
+
+    def clear(self):
+        self.surfaces.clear()
+        self._quit_registered = False
+
+    def stats(self):
+        """缓存统计: 表面数量、命中、未命中、常驻字节数"""
+        return {
+            "surfaces": len(self.surfaces),
+            "hits": self.hits,
+            "misses": self.misses,
+            "bytes": sum(s.get_pitch() * s.get_height() for s in self.surfaces.values()),
+        }
+
+
+assets = AssetManager()
@@ -0,0 +1,1293 @@
+"""
+性能基准。
+
+每个基准是一个返回结果 dict 的函数, 用 @benchmark 登记到 BENCHMARKS。
+基准在无窗口环境下运行 (SDL dummy 驱动), 随机数全部使用固定种子。
+命令行入口见 LDKpark.core.main_cli:
+
+    mytool bench --output results.json --baseline baseline.json
+    python -m LDKpark.bench
+"""
+import inspect
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from .perf import percentile
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """登记基准函数"""
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+def use_dummy_drivers():
+    """在导入 pygame 之前调用, 让基准无需显示器和声卡"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+
+def frame_stats(frame_times):
+    """帧耗时 (秒) 列表 -> 毫秒单位的 p50/p99/max"""
+    ordered = sorted(frame_times)
+    return {
+        "p50_ms": percentile(ordered, 50) * 1000,
+        "p99_ms": percentile(ordered, 99) * 1000,
+        "max_ms": ordered[-1] * 1000 if ordered else 0.0,
+    }
+
+
+def best_time(func, repeat=5):
+    """多次运行取最短耗时 (秒) 以及最后一次的返回值"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, result
+
+
+# --- 射击游戏 ---
+
+def _naive_bullet_hits(bullets, enemies, check_collision):
+    """旧版逐对检测 (子弹 x 敌机), 作为对照"""
+    hits = []
+    for bullet in bullets:
+        for enemy in enemies:
+            if check_collision(bullet, enemy):
+                hits.append((bullet, enemy))
+                break
+    return hits
+
+
+@benchmark("shooter_collision")
+def bench_shooter_collision(bullets=2000, enemies=300, seed=0, repeat=5):
+    """玩家子弹 x 敌机碰撞: 逐对 sqrt 检测 vs 网格宽相位"""
+    use_dummy_drivers()
+    import math
+    from .games100 import shooter
+
+    def sqrt_collision(a, b):
+        dx = a.x - b.x
+        dy = a.y - b.y
+        return math.sqrt(dx * dx + dy * dy) < (a.radius + b.radius)
+
+    random.seed(seed)
+    rng = random.Random(seed)
+    types = list(shooter.ENEMY_TYPES)
+    enemy_list = [shooter.Enemy(rng.choice(types),
+                                rng.uniform(0, shooter.SCREEN_WIDTH),
+                                rng.uniform(0, shooter.SCREEN_HEIGHT))
+                  for _ in range(enemies)]
+    bullet_list = [shooter.Bullet(rng.uniform(0, shooter.SCREEN_WIDTH),
+                                  rng.uniform(0, shooter.SCREEN_HEIGHT),
+                                  -shooter.BULLET_SPEED)
+                   for _ in range(bullets)]
+    grid = shooter.SpatialGrid()
+
+    naive_time, naive_hits = best_time(
+        lambda: _naive_bullet_hits(bullet_list, enemy_list, sqrt_collision), repeat)
+    grid_time, grid_hits = best_time(
+        lambda: shooter.find_bullet_hits(bullet_list, enemy_list, grid), repeat)
+
+    def as_indices(hits):
+        return [(bullet_list.index(b), enemy_list.index(e)) for b, e in hits]
+
+    return {
+        "bullets": bullets,
+        "enemies": enemies,
+        "hits": len(grid_hits),
+        "identical": as_indices(naive_hits) == as_indices(grid_hits),
+        "naive_ms": naive_time * 1000,
+        "grid_ms": grid_time * 1000,
+        "speedup": naive_time / grid_time,
+    }
+
+
+@benchmark("shooter_bullet_pool")
+def bench_shooter_bullet_pool(bullets=5000, enemies=50, frames=120, seed=0):
+    """弹幕: Bullet 对象逐个更新/绘制 vs NumPy 子弹池, 每帧耗时"""
+    use_dummy_drivers()
+    import pygame
+    from .games100 import shooter
+
+    pygame.init()
+    screen = pygame.display.set_mode((shooter.SCREEN_WIDTH, shooter.SCREEN_HEIGHT))
+    rng = random.Random(seed)
+    random.seed(seed)
+    enemy_list = [shooter.Enemy('medium', rng.uniform(0, shooter.SCREEN_WIDTH),
+                                rng.uniform(0, shooter.SCREEN_HEIGHT / 2))
+                  for _ in range(enemies)]
+    player = shooter.Player()
+    player.invincible = frames * 2
+    starts = [(rng.uniform(0, shooter.SCREEN_WIDTH), rng.uniform(0, shooter.SCREEN_HEIGHT),
+               rng.uniform(-2, 2), rng.uniform(-2, 2)) for _ in range(bullets)]
+
+    def run_objects():
+        objs = []
+        for x, y, vx, vy in starts:
+            objs.append(shooter.Bullet(x, y, vy, False, 1, vx))
+        for _ in range(frames):
+            for b in objs:
+                b.update()
+            objs = [b for b in objs if b.active and -10 < b.x < shooter.SCREEN_WIDTH + 10]
+            for b in objs:
+                shooter.check_collision(b, player)
+            for b in objs:
+                b.draw(screen)
+        return len(objs)
+
+    pool = shooter.BulletPool()
+    pool.build_sprites()
+
+    def run_pool():
+        pool.clear()
+        for x, y, vx, vy in starts:
+            pool.spawn(x, y, vx, vy, shooter.OWNER_ENEMY)
+        for _ in range(frames):
+            pool.update()
+            pool.hits_on_enemies(enemy_list)
+            pool.hits_on(player.x, player.y, player.radius, shooter.OWNER_ENEMY)
+            pool.compact()
+            pool.draw(screen)
+        return pool.count
+
+    object_time, object_left = best_time(run_objects, 1)
+    pool_time, pool_left = best_time(run_pool, 3)
+    pygame.quit()
+    return {
+        "bullets": bullets,
+        "frames": frames,
+        "remaining": pool_left,
+        "same_remaining": object_left == pool_left,
+        "object_frame_ms": object_time / frames * 1000,
+        "pool_frame_ms": pool_time / frames * 1000,
+        "speedup": object_time / pool_time,
+    }
+
+
+@benchmark("shooter_sprites")
+def bench_shooter_sprites(enemies=300, powerups=60, frames=60, seed=0):
+    """绘制大量敌机与道具: 每帧多边形光栅化 vs 预渲染精灵 blit"""
+    use_dummy_drivers()
+    import pygame
+    from .games100 import shooter
+
+    pygame.init()
+    screen = pygame.display.set_mode((shooter.SCREEN_WIDTH, shooter.SCREEN_HEIGHT))
+    random.seed(seed)
+    rng = random.Random(seed)
+    types = list(shooter.ENEMY_TYPES)
+    enemy_list = [shooter.Enemy(rng.choice(types), rng.uniform(0, shooter.SCREEN_WIDTH),
+                                rng.uniform(0, shooter.SCREEN_HEIGHT)) for _ in range(enemies)]
+    powerup_list = [shooter.PowerUp(rng.uniform(0, shooter.SCREEN_WIDTH),
+                                    rng.uniform(0, shooter.SCREEN_HEIGHT)) for _ in range(powerups)]
+
+    build_start = time.perf_counter()
+    sprites = shooter.SpriteCache()
+    build_time = time.perf_counter() - build_start
+
+    def draw_all(cache):
+        for _ in range(frames):
+            for e in enemy_list:
+                e.angle += 2
+                e.draw(screen, cache)
+            for p in powerup_list:
+                p.angle += 3
+                p.draw(screen, cache)
+
+    polygon_time, _ = best_time(lambda: draw_all(None), 3)
+    sprite_time, _ = best_time(lambda: draw_all(sprites), 3)
+    pygame.quit()
+    return {
+        "enemies": enemies,
+        "powerups": powerups,
+        "cache_build_ms": build_time * 1000,
+        "polygon_frame_ms": polygon_time / frames * 1000,
+        "sprite_frame_ms": sprite_time / frames * 1000,
+        "speedup": polygon_time / sprite_time,
+    }
+
+
+@benchmark("shooter_starfield")
+def bench_shooter_starfield(stars=2000, frames=120, seed=0):
+    """背景星空: Star 对象逐个更新/绘制 vs NumPy 星空"""
+    use_dummy_drivers()
+    import pygame
+    from .games100 import shooter
+
+    pygame.init()
+    screen = pygame.display.set_mode((shooter.SCREEN_WIDTH, shooter.SCREEN_HEIGHT))
+    random.seed(seed)
+    star_list = [shooter.Star() for _ in range(stars)]
+    field = shooter.Starfield(stars, seed)
+    field.build_sprites()
+
+    def run_objects():
+        for _ in range(frames):
+            for star in star_list:
+                star.update()
+            for star in star_list:
+                star.draw(screen)
+
+    def run_field():
+        for _ in range(frames):
+            field.update()
+            field.draw(screen)
+
+    object_time, _ = best_time(run_objects, 3)
+    field_time, _ = best_time(run_field, 3)
+    pygame.quit()
+    return {
+        "stars": stars,
+        "object_frame_ms": object_time / frames * 1000,
+        "starfield_frame_ms": field_time / frames * 1000,
+        "speedup": object_time / field_time,
+    }
+
+
+def scripted_keys(game):
+    """射击游戏的脚本输入: 对准最靠下的敌机左右移动"""
+    import pygame
+    from collections import defaultdict
+    keys = defaultdict(bool)
+    player = game.player
+    targets = [e for e in game.enemies if e.y < player.y]
+    if targets:
+        target = max(targets, key=lambda e: e.y)
+        if target.x < player.x - 4:
+            keys[pygame.K_LEFT] = True
+        elif target.x > player.x + 4:
+            keys[pygame.K_RIGHT] = True
+    return keys
+
+
+def run_shooter_script(game, frames):
+    """按脚本运行射击游戏 frames 帧 (玩家不会死), 返回每帧耗时 (秒)"""
+    times = []
+    clock = time.perf_counter
+    for _ in range(frames):
+        keys = scripted_keys(game)
+        start = clock()
+        game.player.hp = game.player.max_hp
+        game.update(keys)
+        game.draw()
+        times.append(clock() - start)
+    return times
+
+
+@benchmark("shooter_object_pools")
+def bench_shooter_object_pools(minutes=5, seed=0):
+    """
+    脚本化的波次流程 (默认 5 分钟游戏时间), 对象池开/关的帧耗时 p50/p99/max、
+    新建的对象数与期间各代 GC 的次数
+    """
+    use_dummy_drivers()
+    import gc
+    import pygame
+    from .games100 import shooter
+
+    frames = int(minutes * 60 * shooter.FPS)
+    result = {"frames": frames}
+    for label, enabled in (("no_pool", False), ("pool", True)):
+        random.seed(seed)
+        game = shooter.ShooterGame()
+        for pool in (game.bullet_objects, game.enemy_objects,
+                     game.powerup_objects, game.particle_objects):
+            pool.enabled = enabled
+        gc.collect()
+        before = [s["collections"] for s in gc.get_stats()]
+        times = run_shooter_script(game, frames)
+        after = [s["collections"] for s in gc.get_stats()]
+        stats = frame_stats(times)
+        stats["gc_collections"] = [b - a for a, b in zip(before, after)]
+        stats["objects_created"] = (game.bullet_objects.created + game.enemy_objects.created
+                                    + game.powerup_objects.created + game.particle_objects.created)
+        stats["wave"] = game.wave
+        result[label] = stats
+        game.close()
+    return result
+
+
+@benchmark("text")
+def bench_text(frames=600, seed=0):
+    """字体加载 (SysFont 扫描 vs 磁盘缓存的路径) 与 HUD 文字 (每帧渲染 vs LRU 缓存)"""
+    use_dummy_drivers()
+    import tempfile
+    import pygame
+    import pygame.sysfont
+    from . import text
+
+    pygame.init()
+    sizes = (48, 32, 20)
+
+    def sysfont_startup():
+        # 模拟新进程: 清掉 pygame 的系统字体表, 下一次 SysFont 会重新扫描
+        pygame.sysfont.Sysfonts.clear()
+        pygame.sysfont.is_init = False
+        return [pygame.font.SysFont("simhei", size) for size in sizes]
+
+    saved_path = text.FONT_CACHE_PATH
+    with tempfile.TemporaryDirectory() as cache_dir:
+        text.FONT_CACHE_PATH = os.path.join(cache_dir, "fonts.json")
+        text.CACHE_DIR = cache_dir
+        text.find_font("simhei")  # 首次启动写入磁盘缓存
+
+        def cached_startup():
+            text._font_paths = None
+            text._fonts.clear()
+            return [text.load_font("simhei", size) for size in sizes]
+
+        sysfont_time, _ = best_time(sysfont_startup, 3)
+        cached_time, fonts = best_time(cached_startup, 3)
+        text.FONT_CACHE_PATH = saved_path
+        text.CACHE_DIR = os.path.dirname(saved_path)
+        text._font_paths = None
+
+    rng = random.Random(seed)
+    hud = []
+    score = 0
+    for i in range(frames):
+        if rng.random() < 0.05:
+            score += 10
+        hud.append([
+            (fonts[1], "分数: %d" % score, (255, 255, 255)),
+            (fonts[1], "波数: %d" % (score // 500 + 1), (255, 255, 100)),
+            (fonts[1], "生命: 3/5", (255, 100, 100)),
+            (fonts[2], "武器 Lv.1", (255, 200, 50)),
+            (fonts[2], "WASD/方向键移动 | P暂停", (150, 150, 150)),
+        ])
+
+    def render_direct():
+        for lines in hud:
+            for font, s, color in lines:
+                font.render(s, True, color)
+
+    def render_cached():
+        cache = text.TextCache()
+        for lines in hud:
+            for font, s, color in lines:
+                cache.render(font, s, color)
+        return cache
+
+    direct_time, _ = best_time(render_direct, 3)
+    cached_time_frames, cache = best_time(render_cached, 3)
+    pygame.quit()
+    return {
+        "sysfont_startup_ms": sysfont_time * 1000,
+        "cached_startup_ms": cached_time * 1000,
+        "direct_frame_ms": direct_time / frames * 1000,
+        "cached_frame_ms": cached_time_frames / frames * 1000,
+        "renders_per_frame_direct": len(hud[0]),
+        "renders_per_frame_cached": cache.misses / frames,
+    }
+
+
+@benchmark("assets_blit")
+def bench_assets_blit(blits=200, frames=60, seed=0):
+    """
+    blit 开销: 加载格式 vs 转换后的图片, 每帧新建遮罩 vs 预构建遮罩,
+    每帧逐行画渐变 vs 预构建背景
+    """
+    use_dummy_drivers()
+    import tempfile
+    import pygame
+    from .assets import AssetManager
+
+    pygame.init()
+    width, height = 480, 800
+    screen = pygame.display.set_mode((width, height))
+    rng = random.Random(seed)
+    positions = [(rng.randint(0, width - 64), rng.randint(0, height - 64)) for _ in range(blits)]
+    manager = AssetManager()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # 24 位 BMP 与带透明通道的 PNG, 和玩家自定义图片的常见格式一致
+        source = pygame.Surface((64, 64), pygame.SRCALPHA)
+        source.fill((0, 0, 0, 0))
+        pygame.draw.circle(source, (255, 120, 0, 255), (32, 32), 30)
+        paths = {"bmp": os.path.join(tmp, "image.bmp"), "png": os.path.join(tmp, "image.png")}
+        opaque = pygame.Surface((64, 64), depth=24)
+        opaque.blit(source, (0, 0))
+        pygame.image.save(opaque, paths["bmp"])
+        pygame.image.save(source, paths["png"])
+
+        images = {}
+        for kind, path in paths.items():
+            raw = pygame.image.load(path)
+            images[kind] = (raw, manager.load(path, alpha=kind == "png"))
+            manager.load(path, alpha=kind == "png")  # 第二次命中缓存
+
+    def blit_images(index):
+        for _ in range(frames):
+            for kind in images:
+                image = images[kind][index]
+                for pos in positions:
+                    screen.blit(image, pos)
+
+    def overlay_per_frame():
+        for _ in range(frames):
+            overlay = pygame.Surface((width, height), pygame.SRCALPHA)
+            overlay.fill((0, 0, 0, 180))
+            screen.blit(overlay, (0, 0))
+
+    def overlay_prebuilt():
+        for _ in range(frames):
+            screen.blit(manager.overlay((width, height), (0, 0, 0, 180)), (0, 0))
+
+    def gradient_per_frame():
+        for _ in range(frames):
+            for y in range(height):
+                c = int(135 + (100 - 135) * y / height)
+                pygame.draw.line(screen, (c, c, c), (0, y), (width, y))
+
+    def gradient_prebuilt():
+        for _ in range(frames):
+            screen.blit(manager.gradient((width, height), (135, 135, 135), (100, 100, 100)), (0, 0))
+
+    raw_time, _ = best_time(lambda: blit_images(0), 3)
+    converted_time, _ = best_time(lambda: blit_images(1), 3)
+    overlay_time, _ = best_time(overlay_per_frame, 3)
+    overlay_cached_time, _ = best_time(overlay_prebuilt, 3)
+    gradient_time, _ = best_time(gradient_per_frame, 3)
+    gradient_cached_time, _ = best_time(gradient_prebuilt, 3)
+    stats = manager.stats()
+    pygame.quit()
+    return {
+        "image_raw_frame_ms": raw_time / frames * 1000,
+        "image_converted_frame_ms": converted_time / frames * 1000,
+        "image_speedup": raw_time / converted_time,
+        "overlay_frame_ms": overlay_time / frames * 1000,
+        "overlay_prebuilt_frame_ms": overlay_cached_time / frames * 1000,
+        "gradient_frame_ms": gradient_time / frames * 1000,
+        "gradient_prebuilt_frame_ms": gradient_cached_time / frames * 1000,
+        "assets": stats,
+    }
+
+
+@benchmark("assets_async")
+def bench_assets_async(size=(3840, 2160), fps=60, seed=0):
+    """在 60 FPS 的帧循环中加载 4K PNG: 同步解码的卡顿 vs 后台加载期间的帧间隔"""
+    use_dummy_drivers()
+    import tempfile
+    import pygame
+    from .assets import AssetManager
+
+    pygame.init()
+    screen = pygame.display.set_mode((400, 600))
+    rng = random.Random(seed)
+    manager = AssetManager()
+    budget = 1.0 / fps
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "4k.png")
+        # 随机噪声几乎不可压缩, 解码耗时接近真实照片
+        n = size[0] * size[1] * 3
+        noise = rng.getrandbits(n * 8).to_bytes(n, "little")
+        pygame.image.save(pygame.image.frombuffer(noise, size, "RGB"), path)
+        del noise
+
+        start = time.perf_counter()
+        pygame.image.load(path)
+        sync_time = time.perf_counter() - start
+
+        clock = pygame.time.Clock()
+        background = manager.gradient(screen.get_size(), (135, 206, 235), (100, 180, 220))
+        pending = manager.load_async(path, (40, 30))
+        frames = []
+        last = time.perf_counter()
+        while True:
+            done = pending.done()
+            if done:
+                image = pending.result()
+            screen.blit(background, (0, 0))
+            pygame.display.flip()
+            clock.tick(fps)
+            now = time.perf_counter()
+            frames.append(now - last)
+            last = now
+            if done:
+                break
+    pygame.quit()
+    return {
+        "sync_decode_ms": sync_time * 1000,
+        "frames_until_ready": len(frames),
+        "max_frame_ms": max(frames) * 1000,
+        "dropped_frames": sum(1 for t in frames if t > budget * 1.5),
+        "image_size": image.get_size(),
+    }
+
+
+@benchmark("dirty_rects")
+def bench_dirty_rects(seconds=1.0):
+    """
+    静态画面的空闲 CPU 占用: 每帧整屏重绘 + flip vs 脏矩形渲染,
+    帧间等待走游戏自己的 FramePacer (默认策略), 等待的开销一并计入
+    """
+    use_dummy_drivers()
+    import pygame
+    from .games100 import flappybird, runner, shooter
+
+    def flappy_home(dirty):
+        return flappybird.FlappyBirdGame(dirty_rects=dirty)
+
+    def runner_menu(dirty):
+        return runner.RunnerGame(dirty_rects=dirty)
+
+    def shooter_paused(dirty):
+        game = shooter.ShooterGame(dirty_rects=dirty)
+        game.paused = True
+        return game
+
+    results = {}
+    for name, make in (("flappybird_home", flappy_home), ("runner_menu", runner_menu),
+                       ("shooter_paused", shooter_paused)):
+        for dirty in (False, True):
+            pygame.init()
+            game = make(dirty)
+            wall_start = time.perf_counter()
+            cpu_start = time.process_time()
+            while time.perf_counter() - wall_start < seconds:
+                game.handle_events()
+                game.draw()
+                game.pacer.tick()
+            cpu = (time.process_time() - cpu_start) / (time.perf_counter() - wall_start)
+            results[name + ("_dirty" if dirty else "_full") + "_cpu_pct"] = cpu * 100
+            if dirty:
+                results[name + "_updates"] = game.renderer.stats()
+            pygame.quit()
+    return results
+
+
+@benchmark("profiler_overhead")
+def bench_profiler_overhead(frames=100000):
+    """FrameProfiler 每帧的额外开销: 未启用 vs 启用 (begin + 3 次 mark + end)"""
+    from .perf import FrameProfiler
+
+    def loop(profiler):
+        for _ in range(frames):
+            profiler.begin()
+            profiler.mark("events")
+            profiler.mark("update")
+            profiler.mark("draw")
+            profiler.end()
+
+    def empty():
+        for _ in range(frames):
+            pass
+
+    base_time, _ = best_time(empty, 3)
+    off_time, _ = best_time(lambda: loop(FrameProfiler(False)), 3)
+    on_time, _ = best_time(lambda: loop(FrameProfiler(True, lambda: {"entities": 0})), 3)
+    return {
+        "disabled_ns_per_frame": (off_time - base_time) / frames * 1e9,
+        "enabled_ns_per_frame": (on_time - base_time) / frames * 1e9,
+    }
+
+
+# --- 各游戏整体: 模拟吞吐、绘制帧耗时、内存 ---
+
+def measure_game(step, draw, ticks=3000, frames=300):
+    """
+    先只模拟 ticks 步测吞吐, 再每步绘制一帧测 frames 帧的绘制耗时,
+    最后用 tracemalloc 记录同样 frames 帧的 Python 内存分配峰值
+    """
+    start = time.perf_counter()
+    for _ in range(ticks):
+        step()
+    sim_time = time.perf_counter() - start
+
+    draw_times = []
+    for _ in range(frames):
+        step()
+        start = time.perf_counter()
+        draw()
+        draw_times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    for _ in range(frames):
+        step()
+        draw()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    render = frame_stats(draw_times)
+    return {
+        "ticks_per_sec": ticks / sim_time,
+        "render_p50_ms": render["p50_ms"],
+        "render_p99_ms": render["p99_ms"],
+        "peak_alloc_kib": peak / 1024,
+    }
+
+
+@benchmark("game_runner")
+def bench_game_runner(ticks=3000, frames=300, seed=0):
+    """跑酷: Autopilot 操作, 撞上障碍后立即重开"""
+    use_dummy_drivers()
+    import pygame
+    from .games100 import runner
+
+    pygame.init()
+    random.seed(seed)
+    game = runner.RunnerGame()
+    game.sim.rng = random.Random(seed)
+    game.state = "PLAYING"
+    game.reset_game()
+    pilot = runner.Autopilot()
+
+    def step():
+        pilot.act(game.sim)
+        game.update_game()
+        if game.state != "PLAYING":
+            game.state = "PLAYING"
+            game.reset_game()
+
+    result = measure_game(step, game.draw, ticks, frames)
+    pygame.quit()
+    return result
+
+
+@benchmark("game_flappybird")
+def bench_game_flappybird(ticks=3000, frames=300, seed=0):
+    """Flappy Bird: 低于下一个管道缺口中线就起跳, 失败后立即重开"""
+    use_dummy_drivers()
+    import pygame
+    from .games100 import flappybird
+
+    pygame.init()
+    random.seed(seed)
+    game = flappybird.FlappyBirdGame()
+    game.rng = random.Random(seed)
+    game.state = "PLAYING"
+    game.reset_game()
+
+    def step():
+        bird = game.bird
+        ahead = [p for p in game.pipes if p.x + p.width > bird.x - 15]
+        target = ahead[0].top_height + ahead[0].gap / 2 + 20 if ahead else 250
+        if bird.y > target and bird.velocity >= 0:
+            bird.jump()
+        game.update()
+        if game.state != "PLAYING":
+            game.state = "PLAYING"
+            game.reset_game()
+
+    result = measure_game(step, game.draw, ticks, frames)
+    pygame.quit()
+    return result
+
+
+@benchmark("game_shooter")
+def bench_game_shooter(ticks=3000, frames=300, seed=0, difficulty="normal"):
+    """射击: 脚本瞄准最靠下的敌机, 玩家不会死"""
+    use_dummy_drivers()
+    import pygame
+    from .games100 import shooter
+
+    random.seed(seed)
+    game = shooter.ShooterGame(difficulty)
+
+    def step():
+        game.player.hp = game.player.max_hp
+        game.update(scripted_keys(game))
+
+    result = measure_game(step, game.draw, ticks, frames)
+    result["wave"] = game.wave
+    pygame.quit()
+    return result
+
+
+@benchmark("game_snake")
+def bench_game_snake(ticks=3000, frames=300, seed=0):
+    """贪吃蛇: 贪心 Autopilot 操作, 只重画变化的格子, 死亡后立即重开"""
+    use_dummy_drivers()
+    import pygame
+    from .games100 import snake
+
+    pygame.init()
+    game = snake.SnakeGame(rng=random.Random(seed))
+    game.start_game()
+    pilot = snake.Autopilot()
+
+    def step():
+        pilot.act(game.sim)
+        game.update()
+        if game.state != "PLAYING":
+            game.start_game()
+
+    result = measure_game(step, game.draw, ticks, frames)
+    pygame.quit()
+    return result
+
+
+@benchmark("snake_food")
+def bench_snake_food(size=64, fills=(0.5, 0.9, 0.99), placements=2000, seed=0):
+    """放食物: 随机重试直到抽到空格 vs 从维护的空格索引里直接抽, 棋盘越满差距越大"""
+    from .games100.snake import SnakeSim
+
+    result = {}
+    for fill in fills:
+        rng = random.Random(seed)
+        sim = SnakeSim(size, size, rng)
+        cells = size * size
+        for cell in rng.sample(sim.free, int(cells * fill) - len(sim.body)):
+            sim._occupy(cell)
+        occupied = sim.occupied
+
+        start = time.perf_counter()
+        for _ in range(placements):
+            cell = rng.randrange(cells)
+            while occupied[cell]:
+                cell = rng.randrange(cells)
+        rejection = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(placements):
+            sim.place_food()
+        indexed = time.perf_counter() - start
+
+        pct = int(fill * 100)
+        result["rejection_%d_us" % pct] = rejection / placements * 1e6
+        result["indexed_%d_us" % pct] = indexed / placements * 1e6
+        result["speedup_%d" % pct] = rejection / indexed
+    return result
+
+
+@benchmark("rewind_snapshots")
+def bench_rewind_snapshots(ticks=1200, rewind=300, seed=0):
+    """
+    跑酷 (Autopilot) 与 Flappy Bird (脚本起跳) 的回退快照: 每 tick 打包与恢复一条记录的耗时;
+    回退 rewind 个 tick 后用同样的操作重放, 检查与原来的局面一致 (随机数状态按版本恢复)
+    """
+    use_dummy_drivers()
+    import pygame
+    from .games100 import flappybird, runner
+
+    def runner_game():
+        game = runner.RunnerGame()
+        game.sim.rng = random.Random(seed)
+        pilot = runner.Autopilot()
+
+        def step():
+            pilot.act(game.sim)
+            game.update_game()
+
+        def state():
+            sim = game.sim
+            return (sim.tick, sim.score, sim.player.y, sim.next_gap,
+                    [(o.type, o.x, o.y) for o in sim.obstacles])
+        return game, step, state
+
+    def flappy_game():
+        game = flappybird.FlappyBirdGame()
+        game.rng = random.Random(seed)
+
+        def step():
+            bird = game.bird
+            ahead = [p for p in game.pipes if p.x + p.width > bird.x - 15]
+            target = ahead[0].top_height + ahead[0].gap / 2 + 20 if ahead else 250
+            if bird.y > target and bird.velocity >= 0:
+                bird.jump()
+            game.update()
+
+        def state():
+            return (game.score, game.ground_x, game.bird.y,
+                    [(p.x, p.top_height) for p in game.pipes])
+        return game, step, state
+
+    result = {}
+    for name, make in (("runner", runner_game), ("flappybird", flappy_game)):
+        pygame.init()
+        random.seed(seed)
+        game, step, state = make()
+        game.state = "PLAYING"
+        game.reset_game()
+        history = game.history
+        timeline = [state()]  # 本局每个 tick 之后的局面
+        snapshot_times = []
+        for _ in range(ticks):
+            step()
+            if game.state != "PLAYING":
+                game.state = "PLAYING"
+                game.reset_game()
+                timeline = [state()]
+                continue
+            timeline.append(state())
+            history.pop()  # 单独计时: 撤掉 update 里写的记录, 重新打包一次
+            start = time.perf_counter()
+            game.snapshot()
+            snapshot_times.append(time.perf_counter() - start)
+
+        restore_times = []
+        for _ in range(min(rewind, len(history) - 1)):
+            start = time.perf_counter()
+            game.rewind(1)
+            restore_times.append(time.perf_counter() - start)
+        back = len(restore_times)
+        matches = state() == timeline[-1 - back]
+        for i in range(back):
+            step()
+            matches = matches and state() == timeline[len(timeline) - back + i]
+        pygame.quit()
+
+        snapshot = frame_stats(snapshot_times)
+        restore = frame_stats(restore_times)
+        result[name + "_snapshot_p99_ms"] = snapshot["p99_ms"]
+        result[name + "_restore_p99_ms"] = restore["p99_ms"]
+        result[name + "_record_bytes"] = history.record_size
+        result[name + "_replay_matches"] = matches
+    return result
+
+
+@benchmark("arcade_switch")
+def bench_arcade_switch(rounds=5, games=("flappybird", "runner", "snake")):
+    """
+    切换游戏到新画面第一帧提交的耗时: 每次 pygame.quit 后重新初始化并创建游戏
+    vs arcade 在同一个窗口里切换场景。dummy 驱动下 SDL 初始化很便宜,
+    真实显示器和声卡上冷启动的差距会大得多
+    """
+    use_dummy_drivers()
+    import pygame
+    from . import arcade
+
+    cold = []
+    for _ in range(rounds):
+        for name in games:
+            start = time.perf_counter()
+            pygame.quit()
+            pygame.init()
+            pygame.mixer.init()
+            game = arcade.GAMES[name][1](arcade.FPS)
+            game.enter()
+            game.step(0)
+            game.draw()
+            cold.append(time.perf_counter() - start)
+    pygame.quit()
+
+    hub = arcade.Arcade(games)
+    for name in games:  # 先把场景都创建好, 只测切换本身
+        hub.switch(name)
+        hub.frame(0)
+    hub.switch_times = []
+    for _ in range(rounds):
+        for name in games:
+            hub.switch(name)
+            hub.frame(0)
+    warm = hub.switch_times
+    hub.close()
+
+    cold_p50 = frame_stats(cold)["p50_ms"]
+    warm_p50 = frame_stats(warm)["p50_ms"]
+    return {
+        "cold_p50_ms": cold_p50,
+        "arcade_p50_ms": warm_p50,
+        "arcade_p99_ms": frame_stats(warm)["p99_ms"],
+        "speedup": cold_p50 / warm_p50,
+    }
+
+
+@benchmark("pixel_observation")
+def bench_pixel_observation(frames=300, seed=0):
+    """
+    dummy 驱动下跑酷和射击逐帧取像素观测: 每帧 array3d 复制 vs pixels3d 视图 vs
+    灰度 + 4 倍降采样 + 4 帧叠加。取观测的耗时, 以及含模拟与绘制的每秒步数
+    """
+    use_dummy_drivers()
+    import pygame
+    from .observe import PixelObserver
+    from .games100 import runner, shooter
+
+    def runner_game():
+        game = runner.RunnerGame()
+        game.sim.rng = random.Random(seed)
+        game.enter()
+        game.state = "PLAYING"
+        game.reset_game()
+        pilot = runner.Autopilot()
+
+        def step():
+            pilot.act(game.sim)
+            game.update_game()
+            if game.state != "PLAYING":
+                game.state = "PLAYING"
+                game.reset_game()
+        return game, step
+
+    def shooter_game():
+        game = shooter.ShooterGame()
+        game.enter()
+
+        def step():
+            game.player.hp = game.player.max_hp
+            game.update(scripted_keys(game))
+        return game, step
+
+    configs = (
+        ("copy", None),
+        ("view", {}),
+        ("stacked", {"grayscale": True, "downsample": 4, "stack": 4}),
+    )
+    result = {}
+    for name, make in (("runner", runner_game), ("shooter", shooter_game)):
+        for config, options in configs:
+            pygame.init()
+            random.seed(seed)
+            game, step = make()
+            observer = PixelObserver(game, **options) if options is not None else None
+            observe_times = []
+            start = time.perf_counter()
+            for _ in range(frames):
+                step()
+                if observer:
+                    observer.release()
+                game.draw()
+                t = time.perf_counter()
+                if observer:
+                    observer.observe()
+                else:
+                    pygame.surfarray.array3d(game.screen)
+                observe_times.append(time.perf_counter() - t)
+            elapsed = time.perf_counter() - start
+            game.exit()
+            pygame.quit()
+
+            result["%s_%s_observe_ms" % (name, config)] = frame_stats(observe_times)["p50_ms"]
+            result["%s_%s_steps_per_sec" % (name, config)] = frames / elapsed
+    return result
+
+
+@benchmark("input_latency")
+def bench_input_latency(frames=180, seed=0):
+    """
+    各 pygame 游戏在真实主循环 (run, 60 FPS) 里的按键到画面提交延迟:
+    另一个线程每隔 50~200 ms 在随机时刻投递一个带时间戳的 KEYDOWN
+    (模拟 SDL 的事件时间戳), 由 FrameProfiler.latency 统计
+    """
+    use_dummy_drivers()
+    import threading
+    import pygame
+    from .games100 import flappybird, runner, snake, shooter
+
+    rng = random.Random(seed)
+    timing = random.Random(seed + 1)  # 投递线程专用
+
+    def flappy_keys(game):
+        if game.state != "PLAYING":
+            game.state = "PLAYING"
+            game.reset_game()
+        return pygame.K_SPACE
+
+    def snake_keys(game):
+        if game.state != "PLAYING":
+            game.start_game()
+        dx, dy = game.sim.direction  # 只按垂直方向, 保证转向会生效
+        return rng.choice([pygame.K_UP, pygame.K_DOWN] if dx else [pygame.K_LEFT, pygame.K_RIGHT])
+
+    def shooter_keys(game):
+        if game.game_over:
+            game.reset_game()
+        return rng.choice([pygame.K_LEFT, pygame.K_RIGHT])
+
+    games = {
+        "flappybird": (flappybird.FlappyBirdGame, flappy_keys),
+        "runner": (runner.RunnerGame, flappy_keys),
+        "snake": (snake.SnakeGame, snake_keys),
+        "shooter": (shooter.ShooterGame, shooter_keys),
+    }
+    result = {}
+    for name, (cls, next_key) in games.items():
+        pygame.init()
+        game = cls()
+        game.profiler.toggle()
+        drawn = [0]
+        key = [next_key(game)]  # 游戏状态只在主线程里改, 线程只负责投递
+        done = threading.Event()
+
+        def on_frame(game):
+            drawn[0] += 1
+            key[0] = next_key(game)
+            return drawn[0] < frames
+
+        def press():
+            while not done.wait(timing.uniform(0.05, 0.2)):
+                pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key[0], mod=0, unicode="",
+                                                     scancode=0, timestamp=pygame.time.get_ticks()))
+
+        presser = threading.Thread(target=press, daemon=True)
+        presser.start()
+        game.run(on_frame)
+        done.set()
+        presser.join()
+        stats = game.profiler.latency.stats()
+        result[name + "_p50_ms"] = stats["p50_ms"]
+        result[name + "_p99_ms"] = stats["p99_ms"]
+        result[name + "_inputs"] = stats["count"]
+        pygame.quit()
+    return result
+
+
+@benchmark("gc_pauses")
+def bench_gc_pauses(frames=3000, seed=0):
+    """
+    弹幕模式射击游戏 (玩家不会死, 每 600 帧重开一局), 自动 GC vs GCController:
+    帧耗时 (含空闲时间里的回收) 与超出 60 FPS 帧预算的帧数, 以及 GC 暂停
+    """
+    use_dummy_drivers()
+    import gc
+    import pygame
+    from .games100 import shooter
+
+    result = {}
+    for name, gc_control in (("auto", False), ("controlled", True)):
+        pygame.init()
+        random.seed(seed)
+        gc.collect()
+        game = shooter.ShooterGame('bullet_hell', gc_control=gc_control)
+        game.enter()
+        times = []
+        for i in range(frames):
+            start = time.perf_counter()
+            game.collector.begin()
+            game.player.hp = game.player.max_hp
+            if i and i % 600 == 0:
+                game.reset_game()
+            game.update()
+            game.draw()
+            times.append(time.perf_counter() - start)
+        pauses = game.collector.stats()
+        game.exit()
+        pygame.quit()
+
+        frame = frame_stats(times)
+        result[name + "_frame_p99_ms"] = frame["p99_ms"]
+        result[name + "_frame_max_ms"] = frame["max_ms"]
+        result[name + "_over_budget"] = sum(1 for t in times if t > 1 / 60)
+        result[name + "_gc_count"] = pauses["count"]
+        result[name + "_gc_max_ms"] = pauses["max_ms"]
+    return result
+
+
+@benchmark("quality_governor")
+def bench_quality_governor(frames=1200, slowdown=10.0, seed=0):
+    """
+    模拟慢 slowdown 倍的机器 (每帧工作时间乘以 slowdown 后交给 QualityGovernor):
+    射击游戏前一半帧每 4 帧一次 30 粒子的大爆炸, 后一半平静。
+    固定最高画质 vs 自适应画质: 超出 60 FPS 帧预算的帧数、p99, 以及档位升降次数
+    """
+    use_dummy_drivers()
+    import pygame
+    from .games100 import shooter
+
+    result = {}
+    for name, adaptive in (("fixed", False), ("adaptive", True)):
+        pygame.init()
+        random.seed(seed)
+        rng = random.Random(seed)
+        game = shooter.ShooterGame('normal')
+        game.enter()
+        governor = game.quality  # 未启用, 下面用模拟的帧时间手动喂给它
+        times = []
+        for i in range(frames):
+            start = time.perf_counter()
+            game.player.hp = game.player.max_hp
+            if i < frames // 2 and i % 4 == 0:
+                game.create_explosion(rng.uniform(0, shooter.SCREEN_WIDTH),
+                                      rng.uniform(0, shooter.SCREEN_HEIGHT), (255, 200, 0), 30)
+            game.update()
+            game.draw()
+            frame_time = (time.perf_counter() - start) * slowdown
+            times.append(frame_time)
+            if adaptive:
+                governor.add(frame_time)
+        stats = governor.stats()
+        game.exit()
+        pygame.quit()
+
+        frame = frame_stats(times)
+        result[name + "_frame_p99_ms"] = frame["p99_ms"]
+        result[name + "_over_budget"] = sum(1 for t in times if t > 1 / 60)
+        if adaptive:
+            result["downgrades"] = stats["downgrades"]
+            result["upgrades"] = stats["upgrades"]
+            result["final_level"] = stats["level"]
+    return result
+
+
+@benchmark("frame_pacing")
+def bench_frame_pacing(frames=120, fps=60, seed=0):
+    """
+    dummy 驱动下每帧随机忙 2~6 ms 再 flip, 比较各帧节奏策略的帧间隔:
+    抖动 (标准差)、与目标周期的最大偏差和实际帧率
+    """
+    use_dummy_drivers()
+    import pygame
+    from .pacing import STRATEGIES, FramePacer
+    from .render import ensure_display
+
+    result = {}
+    for strategy in STRATEGIES:
+        pygame.init()
+        rng = random.Random(seed)
+        pacer = FramePacer(fps, strategy)
+        screen = ensure_display((320, 240), "pacing", pacer.vsync)
+        pacer.tick()
+        start = time.perf_counter()
+        for i in range(frames):
+            end = time.perf_counter() + rng.uniform(0.002, 0.006)
+            while time.perf_counter() < end:
+                pass
+            screen.fill((i % 256, 0, 0))
+            pygame.display.flip()
+            pacer.tick()
+        elapsed = time.perf_counter() - start
+        pygame.quit()
+
+        stats = pacer.stats()
+        result[strategy + "_jitter_ms"] = stats["jitter_ms"]
+        result[strategy + "_max_error_ms"] = stats["max_error_ms"]
+        result[strategy + "_fps"] = frames / elapsed
+    return result
+
+
+@benchmark("async_pacing")
+def bench_async_pacing(frames=300, fps=60, io_tasks=4, seed=0):
+    """
+    asyncio 下跑贪吃蛇 (run_scene), 同时有几个模拟设备 I/O 的协程
+    (随机 sleep 0.5~3 ms 后忙 0.05~0.2 ms): 帧开始时间相对目标的延迟
+    """
+    use_dummy_drivers()
+    import asyncio
+    import pygame
+    from .aio import run_scene
+    from .games100 import snake
+
+    pygame.init()
+    game = snake.SnakeGame(fps, rng=random.Random(seed))
+    game.start_game()
+    pilot = snake.Autopilot()
+    rng = random.Random(seed)
+    served = [0]
+    drawn = [0]
+
+    def on_frame(game):
+        drawn[0] += 1
+        pilot.act(game.sim)
+        if game.state != "PLAYING":
+            game.start_game()
+        return drawn[0] < frames
+
+    async def device_io():
+        while True:
+            await asyncio.sleep(rng.uniform(0.0005, 0.003))
+            end = time.perf_counter() + rng.uniform(0.00005, 0.0002)
+            while time.perf_counter() < end:
+                pass
+            served[0] += 1
+
+    async def main():
+        tasks = [asyncio.ensure_future(device_io()) for _ in range(io_tasks)]
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        clock = await run_scene(game, fps, on_frame)
+        elapsed = time.perf_counter() - start
+        cpu = time.process_time() - cpu_start
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return clock, elapsed, cpu
+
+    clock, elapsed, cpu = asyncio.run(main())
+    pygame.quit()
+    lateness = clock.stats()
+    return {
+        "lateness_p50_ms": lateness["p50_ms"],
+        "lateness_p99_ms": lateness["p99_ms"],
+        "lateness_max_ms": lateness["max_ms"],
+        "io_per_sec": served[0] / elapsed,
+        "fps": drawn[0] / elapsed,
+        "cpu_pct": cpu / elapsed * 100,
+    }
+
+
+# --- 运行与基线比较 ---
+
+# 结果中按键名后缀判断方向: 越小越好 / 越大越好, 其余 (计数、布尔) 不参与比较
+LOWER_IS_BETTER = ("_ms", "_kib", "_bytes", "_pct")
+HIGHER_IS_BETTER = ("per_sec", "speedup", "fps")
+
+
+def run_benchmarks(names=None, seed=0, log=None):
+    """运行指定 (默认全部) 基准, 返回带环境信息的结果 dict"""
+    names = list(names or BENCHMARKS)
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        raise KeyError("未知的基准: %s" % ", ".join(unknown))
+    results = {}
+    for name in names:
+        func = BENCHMARKS[name]
+        kwargs = {"seed": seed} if "seed" in inspect.signature(func).parameters else {}
+        start = time.perf_counter()
+        results[name] = func(**kwargs)
+        if log:
+            log("%s (%.1f s)" % (name, time.perf_counter() - start))
+    return {
+        "meta": {
+            "seed": seed,
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def flatten(results, prefix=""):
+    """嵌套结果展开成 {"基准.指标": 数值}"""
+    flat = {}
+    for key, value in results.items():
+        name = prefix + key
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(current, baseline, threshold=0.1):
+    """
+    与基线比较, 返回变差超过 threshold (相对值) 的指标列表:
+    [(指标, 基线值, 当前值, 变化比例), ...], 变化比例为正表示变差
+    """
+    now = flatten(current["results"])
+    old = flatten(baseline["results"])
+    regressions = []
+    for name, before in sorted(old.items()):
+        after = now.get(name)
+        if after is None or not before:
+            continue
+        if name.endswith(LOWER_IS_BETTER):
+            change = (after - before) / before
+        elif name.endswith(HIGHER_IS_BETTER):
+            change = (before - after) / before
+        else:
+            continue
+        if change > threshold:
+            regressions.append((name, before, after, change))
+    return regressions
+
+
+if __name__ == "__main__":
+    for name, func in BENCHMARKS.items():
+        print(name, func())
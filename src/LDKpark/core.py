@@ -1,2 +1,76 @@
+import argparse
+import json
+import sys
+
+
 def add(a,b):
-    return a+b
\ No newline at end of file
+    return a+b
+
+
+def cmd_bench(args):
+    """运行基准, 保存结果并与基线比较; 有指标变差超过阈值时返回 1"""
+    from . import bench
+
+    if args.list:
+        for name, func in bench.BENCHMARKS.items():
+            doc = (func.__doc__ or "").strip().splitlines()
+            print("%-22s %s" % (name, doc[0] if doc else ""))
+        return 0
+
+    try:
+        current = bench.run_benchmarks(args.names, args.seed, log=lambda msg: print(msg, file=sys.stderr))
+    except KeyError as e:
+        print(e.args[0], file=sys.stderr)
+        return 2
+
+    for name, value in sorted(bench.flatten(current["results"]).items()):
+        print("%-50s %12.3f" % (name, value))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(current, f, ensure_ascii=False, indent=1)
+
+    if not args.baseline:
+        return 0
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(current, f, ensure_ascii=False, indent=1)
+        print("基线已写入 %s" % args.baseline)
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = bench.compare(current, baseline, args.threshold)
+    for name, before, after, change in regressions:
+        print("变差 %-45s %12.3f -> %12.3f (差了 %.0f%%)" % (name, before, after, change * 100))
+    if regressions:
+        print("%d 项指标变差超过 %.0f%%" % (len(regressions), args.threshold * 100))
+        return 1
+    print("与基线相比没有超过 %.0f%% 的变差" % (args.threshold * 100))
+    return 0
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(prog="mytool", description="LDKpark 命令行工具")
+    sub = parser.add_subparsers(dest="command")
+
+    p = sub.add_parser("bench", help="运行无窗口、固定种子的性能基准")
+    p.add_argument("names", nargs="*", help="要运行的基准, 默认全部 (--list 查看)")
+    p.add_argument("--list", action="store_true", help="列出所有基准")
+    p.add_argument("--seed", type=int, default=0, help="随机种子, 默认 0")
+    p.add_argument("-o", "--output", help="结果写入该 JSON 文件")
+    p.add_argument("--baseline", help="基线 JSON 文件, 与之比较")
+    p.add_argument("--threshold", type=float, default=0.1,
+                   help="允许的相对变差, 默认 0.1 即 10%%")
+    p.add_argument("--save-baseline", action="store_true", help="把本次结果写成 --baseline 指定的基线")
+    p.set_defaults(func=cmd_bench)
+
+    args = parser.parse_args(argv)
+    if not getattr(args, "func", None):
+        parser.print_help()
+        return 2
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
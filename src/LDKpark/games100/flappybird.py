@@ -1,12 +1,24 @@
 import pygame
 import random
 import os
+import io
 import math
+import struct
 import tkinter as tk
 from tkinter import filedialog
 import threading
 import time
 
+from ..timestep import FixedTimestep, lerp
+from ..text import load_font, render as render_text
+from ..assets import assets
+from ..render import DirtyRenderer, ensure_display
+from ..perf import FrameProfiler
+from ..aio import run_scene
+from ..gcpause import GCController
+from ..pacing import FramePacer
+from ..rewind import SnapshotRing
+
 # 初始化 Pygame
 pygame.init()
 pygame.mixer.init()
@@ -14,7 +26,7 @@ pygame.mixer.init()
 # 游戏常量
 SCREEN_WIDTH = 400
 SCREEN_HEIGHT = 600
-FPS = 60
+FPS = 60  # 渲染帧率上限, 物理固定以 timestep.SIM_HZ 推进
 
 # 颜色定义
 WHITE = (255, 255, 255)
@@ -27,14 +39,27 @@ YELLOW = (255, 215, 0)
 ORANGE = (255, 165, 0)
 RED = (255, 69, 0)
 
+# 回退快照的记录格式 (见 LDKpark.rewind), 管道和粒子按上限预留位置
+MAX_PIPES = 8
+MAX_PARTICLES = 64
+# 分数, 地面滚动, 随机数版本, 管道数, 粒子数, 小鸟 y/prev_y/速度/角度/prev_angle/动画时间/翅膀
+SNAP_HEADER = struct.Struct("<iqIBB7d")
+SNAP_PIPE = struct.Struct("<2di?")       # x, prev_x, 上管高度, 已越过
+SNAP_PARTICLE = struct.Struct("<6fh3B")  # x, y, px, py, vx, vy, 寿命, 颜色
+PIPES_AT = SNAP_HEADER.size
+PARTICLES_AT = PIPES_AT + MAX_PIPES * SNAP_PIPE.size
+RECORD_SIZE = PARTICLES_AT + MAX_PARTICLES * SNAP_PARTICLE.size
+
 class Bird:
     def __init__(self):
         self.x = 100
         self.y = SCREEN_HEIGHT // 2
+        self.prev_y = self.y
         self.velocity = 0
         self.gravity = 0.5
         self.jump_strength = -10
         self.angle = 0
+        self.prev_angle = 0
         self.image = None
         self.animation_time = 0
         self.wing_offset = 0
@@ -43,6 +68,8 @@ class Bird:
         self.velocity = self.jump_strength
         
     def update(self):
+        self.prev_y = self.y
+        self.prev_angle = self.angle
         self.velocity += self.gravity
         self.velocity = min(self.velocity, 15)
         self.y += self.velocity
@@ -55,34 +82,34 @@ class Bird:
         self.animation_time += 0.3
         self.wing_offset = math.sin(self.animation_time) * 3
         
-    def draw(self, screen):
+    def draw(self, screen, t=1.0):
+        y = lerp(self.prev_y, self.y, t)
         if self.image:
-            rotated_img = pygame.transform.rotate(self.image, self.angle)
-            rect = rotated_img.get_rect(center=(self.x, self.y))
+            rotated_img = pygame.transform.rotate(self.image, lerp(self.prev_angle, self.angle, t))
+            rect = rotated_img.get_rect(center=(self.x, y))
             screen.blit(rotated_img, rect)
         else:
-            self._draw_default_bird(screen)
+            self._draw_default_bird(screen, self.x, y)
     
-    def _draw_default_bird(self, screen):
-        pygame.draw.ellipse(screen, (200, 180, 0), (self.x - 20 + 3, self.y - 15 + 3, 40, 30))
-        pygame.draw.ellipse(screen, YELLOW, (self.x - 20, self.y - 15, 40, 30))
-        pygame.draw.ellipse(screen, (255, 240, 100), (self.x - 18, self.y - 13, 36, 26))
+    def _draw_default_bird(self, screen, x, y):
+        pygame.draw.ellipse(screen, (200, 180, 0), (x - 20 + 3, y - 15 + 3, 40, 30))
+        pygame.draw.ellipse(screen, YELLOW, (x - 20, y - 15, 40, 30))
+        pygame.draw.ellipse(screen, (255, 240, 100), (x - 18, y - 13, 36, 26))
         
-        wing_y = self.y + self.wing_offset
-        pygame.draw.ellipse(screen, WHITE, (self.x - 10, wing_y - 5, 20, 15))
-        pygame.draw.ellipse(screen, (255, 220, 150), (self.x - 8, wing_y - 3, 16, 11))
+        wing_y = y + self.wing_offset
+        pygame.draw.ellipse(screen, WHITE, (x - 10, wing_y - 5, 20, 15))
+        pygame.draw.ellipse(screen, (255, 220, 150), (x - 8, wing_y - 3, 16, 11))
         
-        pygame.draw.circle(screen, WHITE, (self.x + 8, self.y - 5), 8)
-        pygame.draw.circle(screen, BLACK, (self.x + 10, self.y - 5), 4)
+        pygame.draw.circle(screen, WHITE, (x + 8, y - 5), 8)
+        pygame.draw.circle(screen, BLACK, (x + 10, y - 5), 4)
         
-        beak_points = [(self.x + 15, self.y), (self.x + 30, self.y + 5), (self.x + 15, self.y + 8)]
+        beak_points = [(x + 15, y), (x + 30, y + 5), (x + 15, y + 8)]
         pygame.draw.polygon(screen, ORANGE, beak_points)
         pygame.draw.polygon(screen, (255, 140, 0), beak_points, 2)
     
     def load_custom_image(self, path):
         try:
-            img = pygame.image.load(path)
-            self.image = pygame.transform.scale(img, (40, 30))
+            self.image = assets.load(path, (40, 30))
             return True
         except Exception as e:
             print(f"加载图片失败: {e}")
@@ -92,22 +119,27 @@ class Bird:
         return pygame.Rect(self.x - 15, self.y - 12, 30, 24)
 
 class Pipe:
-    def __init__(self, x):
+    def __init__(self, x, rng=random, top_height=None):
         self.x = x
+        self.prev_x = x
         self.width = 70
         self.gap = 180
-        self.top_height = random.randint(50, SCREEN_HEIGHT - 150 - self.gap)
+        if top_height is None:
+            top_height = rng.randint(50, SCREEN_HEIGHT - 150 - self.gap)
+        self.top_height = top_height
         self.speed = 4
         self.passed = False
         
     def update(self):
+        self.prev_x = self.x
         self.x -= self.speed
         
-    def draw(self, screen):
-        self._draw_pipe(screen, self.x, 0, self.top_height, True)
+    def draw(self, screen, t=1.0):
+        x = lerp(self.prev_x, self.x, t)
+        self._draw_pipe(screen, x, 0, self.top_height, True)
         bottom_y = self.top_height + self.gap
         bottom_height = SCREEN_HEIGHT - bottom_y - 100
-        self._draw_pipe(screen, self.x, bottom_y, bottom_height, False)
+        self._draw_pipe(screen, x, bottom_y, bottom_height, False)
     
     def _draw_pipe(self, screen, x, y, height, is_top):
         pygame.draw.rect(screen, PIPE_GREEN, (x, y, self.width, height))
@@ -140,7 +172,7 @@ class Button:
         self.hover_color = hover_color
         self.text_color = text_color
         self.is_hovered = False
-        self.font = pygame.font.Font(None, 36)
+        self.font = load_font(None, 36)
         
     def draw(self, screen):
         color = self.hover_color if self.is_hovered else self.color
@@ -150,7 +182,7 @@ class Button:
         pygame.draw.rect(screen, (0, 0, 0, 128), shadow_rect, border_radius=10)
         pygame.draw.rect(screen, color, self.rect, border_radius=10)
         pygame.draw.rect(screen, WHITE, self.rect, 3, border_radius=10)
-        text_surface = self.font.render(self.text, True, self.text_color)
+        text_surface = render_text(self.font, self.text, self.text_color)
         text_rect = text_surface.get_rect(center=self.rect.center)
         screen.blit(text_surface, text_rect)
         
@@ -162,10 +194,22 @@ class Button:
         return clicked and self.rect.collidepoint(pos)
 
 class FlappyBirdGame:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("Flappy Bird")
-        self.clock = pygame.time.Clock()
+    def __init__(self, fps=FPS, dirty_rects=False, profile=None, gc_control=False, pacing="tick",
+                 memory_limit_mb=None):
+        # 帧节奏: 默认 clock.tick, 见 LDKpark.pacing
+        self.pacer = FramePacer(fps, pacing)
+        self.screen = ensure_display((SCREEN_WIDTH, SCREEN_HEIGHT), "Flappy Bird", self.pacer.vsync)
+        self.clock = self.pacer.clock
+        self.fps = fps
+        # 脏矩形渲染: 静态画面只画一次, 只提交改动区域
+        self.renderer = DirtyRenderer(self.screen, dirty_rects)
+        # 分阶段计时, F3 切换 HUD; profile 为导出路径时从启动开始记录, 退出时写出
+        self.profile_path = profile
+        self.profiler = FrameProfiler(bool(profile), self.entity_counts)
+        # 可选的 GC 暂停控制: 冻结已加载的资源, 只在帧的空闲时间或两局之间回收
+        self.collector = GCController(gc_control, memory_limit_mb=memory_limit_mb)
+        self.profiler.collector = self.collector
+        self.timestep = FixedTimestep()
         
         self.state = "HOME"
         self.score = 0
@@ -174,19 +218,29 @@ class FlappyBirdGame:
         self.bird = Bird()
         self.pipes = []
         self.ground_x = 0
+        # 管道高度的随机数, 每消耗一次版本加一, 回退时按版本恢复
+        self.rng = random.Random()
+        self.rng_version = 0
         
         # 键位设置 (存储整数键值)
         self.jump_key = pygame.K_SPACE
         self.jump_key_name = "SPACE"
+        self.rewind_key = pygame.K_BACKSPACE
+        
+        # 回退: 每个 tick 一条快照, 按住 rewind_key 倒放最近 10 秒
+        self.history = SnapshotRing(RECORD_SIZE)
+        self.rewinding = False
         
         self.bgm_path = None
+        self.bgm_data = None  # 后台预读的音乐文件 (Future)
         self.bgm_playing = False
+        self.pending_bird_image = None  # 后台加载中的小鸟图片
         
         self.setup_buttons()
         self.particles = []
-        self.font_large = pygame.font.Font(None, 72)
-        self.font_medium = pygame.font.Font(None, 48)
-        self.font_small = pygame.font.Font(None, 32)
+        self.font_large = load_font(None, 72)
+        self.font_medium = load_font(None, 48)
+        self.font_small = load_font(None, 32)
         
     def setup_buttons(self):
         center_x = SCREEN_WIDTH // 2
@@ -211,6 +265,7 @@ class FlappyBirdGame:
                                  (158, 158, 158), (224, 224, 224), BLACK)
     
     def reset_game(self):
+        self.collector.between_rounds()
         self.bird = Bird()
         # 恢复自定义图片
         if hasattr(self, 'saved_bird_image'):
@@ -218,11 +273,14 @@ class FlappyBirdGame:
         self.pipes = []
         self.score = 0
         self.particles = []
+        self.timestep.reset()
+        self.history.clear()
+        self.snapshot()
         
     def add_score_particle(self, x, y):
         for _ in range(10):
             self.particles.append({
-                'x': x, 'y': y,
+                'x': x, 'y': y, 'px': x, 'py': y,
                 'vx': random.uniform(-3, 3),
                 'vy': random.uniform(-5, -1),
                 'life': 30,
@@ -231,6 +289,8 @@ class FlappyBirdGame:
     
     def update_particles(self):
         for p in self.particles[:]:
+            p['px'] = p['x']
+            p['py'] = p['y']
             p['x'] += p['vx']
             p['y'] += p['vy']
             p['vy'] += 0.2
@@ -238,90 +298,95 @@ class FlappyBirdGame:
             if p['life'] <= 0:
                 self.particles.remove(p)
     
-    def draw_particles(self):
+    def draw_particles(self, t=1.0):
         for p in self.particles:
             pygame.draw.circle(self.screen, p['color'], 
-                             (int(p['x']), int(p['y'])), 4)
+                             (int(lerp(p['px'], p['x'], t)), int(lerp(p['py'], p['y'], t))), 4)
     
     def draw_background(self):
-        for y in range(SCREEN_HEIGHT):
-            r = int(135 + (100 - 135) * y / SCREEN_HEIGHT)
-            g = int(206 + (180 - 206) * y / SCREEN_HEIGHT)
-            b = int(235 + (220 - 235) * y / SCREEN_HEIGHT)
-            pygame.draw.line(self.screen, (r, g, b), (0, y), (SCREEN_WIDTH, y))
-        self._draw_clouds()
-    
-    def _draw_clouds(self):
+        # 渐变天空和云都是静态的, 只构建一次
+        self.screen.blit(assets.get("flappybird.background", self._build_background), (0, 0))
+    
+    def _build_background(self):
+        background = assets.gradient((SCREEN_WIDTH, SCREEN_HEIGHT), (135, 206, 235), (100, 180, 220)).copy()
+        self._draw_clouds(background)
+        return background
+    
+    def _draw_clouds(self, surface):
         cloud_positions = [(50, 80), (250, 150), (150, 100), (320, 200)]
         for x, y in cloud_positions:
-            pygame.draw.ellipse(self.screen, WHITE, (x, y, 60, 40))
-            pygame.draw.ellipse(self.screen, WHITE, (x + 30, y - 10, 50, 35))
-            pygame.draw.ellipse(self.screen, WHITE, (x + 50, y + 5, 40, 30))
+            pygame.draw.ellipse(surface, WHITE, (x, y, 60, 40))
+            pygame.draw.ellipse(surface, WHITE, (x + 30, y - 10, 50, 35))
+            pygame.draw.ellipse(surface, WHITE, (x + 50, y + 5, 40, 30))
     
-    def draw_ground(self):
+    def draw_ground(self, t=1.0):
         ground_y = SCREEN_HEIGHT - 100
+        ground_x = self.ground_x - (1 - t) * 4
         pygame.draw.rect(self.screen, (222, 184, 135), (0, ground_y, SCREEN_WIDTH, 100))
         pygame.draw.rect(self.screen, GRASS_GREEN, (0, ground_y, SCREEN_WIDTH, 20))
         for i in range(-1, 15):
-            x = i * 30 - (self.ground_x % 30)
+            x = i * 30 - (ground_x % 30)
             pygame.draw.line(self.screen, (139, 119, 101), (x, ground_y + 30), (x + 15, ground_y + 50), 2)
     
     def draw_score(self):
         score_text = str(self.score)
-        shadow = self.font_large.render(score_text, True, BLACK)
+        shadow = render_text(self.font_large, score_text, BLACK)
         shadow_rect = shadow.get_rect(center=(SCREEN_WIDTH // 2 + 2, 52))
         self.screen.blit(shadow, shadow_rect)
-        score_surface = self.font_large.render(score_text, True, WHITE)
+        score_surface = render_text(self.font_large, score_text, WHITE)
         score_rect = score_surface.get_rect(center=(SCREEN_WIDTH // 2, 50))
         self.screen.blit(score_surface, score_rect)
+        
+        if self.rewinding:
+            self.screen.blit(render_text(self.font_small, "<< REWIND", WHITE), (10, 10))
     
     def draw_home_screen(self):
         self.draw_background()
         self.draw_ground()
-        title = self.font_large.render("FLAPPY BIRD", True, WHITE)
-        title_shadow = self.font_large.render("FLAPPY BIRD", True, BLACK)
+        title = render_text(self.font_large, "FLAPPY BIRD", WHITE)
+        title_shadow = render_text(self.font_large, "FLAPPY BIRD", BLACK)
         title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, 150))
         self.screen.blit(title_shadow, (title_rect.x + 3, title_rect.y + 3))
         self.screen.blit(title, title_rect)
         
-        self.bird.y = 250 + math.sin(pygame.time.get_ticks() / 200) * 20
-        self.bird.draw(self.screen)
-        
         self.play_button.draw(self.screen)
         self.settings_button.draw(self.screen)
         
         if self.high_score > 0:
-            high_score_text = self.font_small.render(f"Best: {self.high_score}", True, WHITE)
+            high_score_text = render_text(self.font_small, f"Best: {self.high_score}", WHITE)
             self.screen.blit(high_score_text, (SCREEN_WIDTH // 2 - 50, 450))
     
-    def draw_game_screen(self):
+    def draw_home_bird(self):
+        """首页上下浮动的小鸟, 只重画它占据的区域"""
+        self.bird.y = 250 + math.sin(pygame.time.get_ticks() / 200) * 20
+        rect = pygame.Rect(self.bird.x - 22, self.bird.y - 18, 54, 38)
+        self.renderer.animate("home_bird", rect, lambda: self.bird.draw(self.screen))
+    
+    def draw_game_screen(self, t=1.0):
         self.draw_background()
         for pipe in self.pipes:
-            pipe.draw(self.screen)
-        self.draw_ground()
-        self.bird.draw(self.screen)
+            pipe.draw(self.screen, t)
+        self.draw_ground(t)
+        self.bird.draw(self.screen, t)
         self.draw_score()
-        self.draw_particles()
+        self.draw_particles(t)
     
     def draw_game_over_screen(self):
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.fill(BLACK)
-        overlay.set_alpha(128)
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(assets.overlay((SCREEN_WIDTH, SCREEN_HEIGHT), (*BLACK, 128)), (0, 0))
         
         panel_rect = pygame.Rect(50, 150, 300, 300)
         pygame.draw.rect(self.screen, WHITE, panel_rect, border_radius=20)
         pygame.draw.rect(self.screen, ORANGE, panel_rect, 4, border_radius=20)
         
-        title = self.font_large.render("GAME OVER", True, RED)
+        title = render_text(self.font_large, "GAME OVER", RED)
         title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, 200))
         self.screen.blit(title, title_rect)
         
-        score_text = self.font_medium.render(f"Score: {self.score}", True, BLACK)
+        score_text = render_text(self.font_medium, f"Score: {self.score}", BLACK)
         score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, 270))
         self.screen.blit(score_text, score_rect)
         
-        high_text = self.font_small.render(f"Best: {self.high_score}", True, BLACK)
+        high_text = render_text(self.font_small, f"Best: {self.high_score}", BLACK)
         high_rect = high_text.get_rect(center=(SCREEN_WIDTH // 2, 320))
         self.screen.blit(high_text, high_rect)
         
@@ -334,7 +399,7 @@ class FlappyBirdGame:
         pygame.draw.rect(self.screen, WHITE, panel_rect, border_radius=20)
         pygame.draw.rect(self.screen, (33, 150, 243), panel_rect, 4, border_radius=20)
         
-        title = self.font_medium.render("SETTINGS", True, BLACK)
+        title = render_text(self.font_medium, "SETTINGS", BLACK)
         title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, 100))
         self.screen.blit(title, title_rect)
         
@@ -384,8 +449,8 @@ class FlappyBirdGame:
             filetypes=[("Image files", "*.png *.jpg *.jpeg *.bmp")]
         )
         if file_path:
-            if self.bird.load_custom_image(file_path):
-                self.saved_bird_image = self.bird.image
+            # 在后台线程解码, 完成前小鸟保持原来的样子
+            self.pending_bird_image = assets.load_async(file_path, (40, 30))
         root.destroy()
     
     def load_bgm(self):
@@ -398,12 +463,28 @@ class FlappyBirdGame:
         )
         if file_path:
             self.bgm_path = file_path
+            self.bgm_data = assets.read_async(file_path)
         root.destroy()
     
+    def poll_assets(self):
+        """把后台加载完成的图片换上去"""
+        pending = self.pending_bird_image
+        if pending and pending.done():
+            self.pending_bird_image = None
+            try:
+                self.bird.image = pending.result()
+                self.saved_bird_image = self.bird.image
+            except Exception as e:
+                print(f"加载图片失败: {e}")
+    
     def play_bgm(self):
         if self.bgm_path and not self.bgm_playing:
             try:
-                pygame.mixer.music.load(self.bgm_path)
+                source = self.bgm_path
+                # 预读完成时直接从内存播放, 不在主线程读盘
+                if self.bgm_data and self.bgm_data.done() and not self.bgm_data.exception():
+                    source = io.BytesIO(self.bgm_data.result())
+                pygame.mixer.music.load(source, os.path.splitext(self.bgm_path)[1][1:])
                 pygame.mixer.music.play(-1)
                 self.bgm_playing = True
             except Exception as e:
@@ -414,11 +495,11 @@ class FlappyBirdGame:
             pygame.mixer.music.stop()
             self.bgm_playing = False
     
-    def handle_events(self):
+    def handle_events(self, events=None):
         mouse_pos = pygame.mouse.get_pos()
         clicked = False
         
-        for event in pygame.event.get():
+        for event in pygame.event.get() if events is None else events:
             if event.type == pygame.QUIT:
                 return False
             
@@ -426,7 +507,13 @@ class FlappyBirdGame:
                 clicked = True
             
             if event.type == pygame.KEYDOWN:
-                if self.state == "PLAYING":
+                self.profiler.latency.input(event)
+                if event.key == pygame.K_F3:
+                    self.profiler.toggle()
+                    self.renderer.invalidate()
+                elif event.key == self.rewind_key:
+                    self.rewinding = True
+                elif self.state == "PLAYING":
                     if event.key == self.jump_key:
                         self.bird.jump()
                 elif self.state == "HOME":
@@ -434,6 +521,9 @@ class FlappyBirdGame:
                         self.state = "PLAYING"
                         self.reset_game()
                         self.play_bgm()
+            
+            if event.type == pygame.KEYUP and event.key == self.rewind_key:
+                self.rewinding = False
         
         if self.state == "HOME":
             self.play_button.check_hover(mouse_pos)
@@ -483,7 +573,8 @@ class FlappyBirdGame:
             self.update_particles()
             
             if len(self.pipes) == 0 or self.pipes[-1].x < SCREEN_WIDTH - 200:
-                self.pipes.append(Pipe(SCREEN_WIDTH + 50))
+                self.pipes.append(Pipe(SCREEN_WIDTH + 50, self.rng))
+                self.rng_version += 1
             
             for pipe in self.pipes[:]:
                 pipe.update()
@@ -505,6 +596,9 @@ class FlappyBirdGame:
                 top_rect, bottom_rect = pipe.get_rects()
                 if bird_rect.colliderect(top_rect) or bird_rect.colliderect(bottom_rect):
                     self.game_over()
+            
+            if self.state == "PLAYING":
+                self.snapshot()
     
     def game_over(self):
         self.state = "GAME_OVER"
@@ -512,36 +606,195 @@ class FlappyBirdGame:
         if self.score > self.high_score:
             self.high_score = self.score
     
+    # --- 回退 ---
+    
+    def snapshot(self):
+        """把当前 tick 的状态打包进回退缓冲区"""
+        history = self.history
+        buffer = history.buffer
+        base = history.push()
+        bird = self.bird
+        pipes = self.pipes
+        if len(pipes) > MAX_PIPES:
+            pipes = pipes[:MAX_PIPES]
+        particles = self.particles
+        if len(particles) > MAX_PARTICLES:
+            particles = particles[-MAX_PARTICLES:]  # 只保留最新的粒子
+        SNAP_HEADER.pack_into(buffer, base, self.score, self.ground_x, self.rng_version,
+                              len(pipes), len(particles), bird.y, bird.prev_y, bird.velocity,
+                              bird.angle, bird.prev_angle, bird.animation_time, bird.wing_offset)
+        offset = base + PIPES_AT
+        for pipe in pipes:
+            SNAP_PIPE.pack_into(buffer, offset, pipe.x, pipe.prev_x, pipe.top_height, pipe.passed)
+            offset += SNAP_PIPE.size
+        offset = base + PARTICLES_AT
+        for p in particles:
+            SNAP_PARTICLE.pack_into(buffer, offset, p['x'], p['y'], p['px'], p['py'],
+                                    p['vx'], p['vy'], p['life'], *p['color'])
+            offset += SNAP_PARTICLE.size
+        history.save_rng(self.rng_version, self.rng)
+    
+    def restore(self, base):
+        """从回退缓冲区 base 处的记录恢复状态"""
+        history = self.history
+        buffer = history.buffer
+        bird = self.bird
+        (self.score, self.ground_x, version, n_pipes, n_particles, bird.y, bird.prev_y,
+         bird.velocity, bird.angle, bird.prev_angle, bird.animation_time,
+         bird.wing_offset) = SNAP_HEADER.unpack_from(buffer, base)
+        history.load_rng(version, self.rng)
+        self.rng_version = version
+        
+        pipes = []
+        offset = base + PIPES_AT
+        for _ in range(n_pipes):
+            x, prev_x, top_height, passed = SNAP_PIPE.unpack_from(buffer, offset)
+            pipe = Pipe(x, top_height=top_height)
+            pipe.prev_x = prev_x
+            pipe.passed = passed
+            pipes.append(pipe)
+            offset += SNAP_PIPE.size
+        self.pipes = pipes
+        
+        particles = []
+        offset = base + PARTICLES_AT
+        for _ in range(n_particles):
+            x, y, px, py, vx, vy, life, r, g, b = SNAP_PARTICLE.unpack_from(buffer, offset)
+            particles.append({'x': x, 'y': y, 'px': px, 'py': py, 'vx': vx, 'vy': vy,
+                              'life': life, 'color': (r, g, b)})
+            offset += SNAP_PARTICLE.size
+        self.particles = particles
+    
+    def rewind(self, ticks):
+        """退回 ticks 个 tick, 最早的一条快照保留; 在结束画面里回退会回到游戏中"""
+        history = self.history
+        for _ in range(ticks):
+            if len(history) < 2:
+                break
+            history.pop()
+        base = history.peek()
+        if base is None:
+            return
+        self.restore(base)
+        if self.state == "GAME_OVER":
+            self.state = "PLAYING"
+            self.play_bgm()
+    
     def draw(self):
+        renderer = self.renderer
         if self.state == "HOME":
-            self.draw_home_screen()
+            if renderer.static(("HOME", self.high_score, self.play_button.is_hovered,
+                                self.settings_button.is_hovered)):
+                self.draw_home_screen()
+            self.draw_home_bird()
         elif self.state == "PLAYING":
-            self.draw_game_screen()
+            renderer.dynamic()
+            self.draw_game_screen(self.timestep.alpha)
         elif self.state == "GAME_OVER":
-            self.draw_game_screen()
-            self.draw_game_over_screen()
+            if renderer.static(("GAME_OVER", self.restart_button.is_hovered,
+                                self.home_button.is_hovered)):
+                self.draw_game_screen()
+                self.draw_game_over_screen()
         elif self.state == "SETTINGS":
-            self.draw_settings_screen()
-        
-        pygame.display.flip()
+            if renderer.static(("SETTINGS", self.key_button.text, self.bird.image,
+                                self.key_button.is_hovered, self.bird_image_button.is_hovered,
+                                self.bgm_button.is_hovered, self.back_button.is_hovered)):
+                self.draw_settings_screen()
+        
+        renderer.overlay("hud", lambda: self.profiler.draw_hud(self.screen))
+        renderer.present()
+        self.profiler.latency.presented()
+        self.collector.idle(1.0 / self.fps)
+    
+    def entity_counts(self):
+        return {"pipes": len(self.pipes), "particles": len(self.particles)}
+    
+    # --- 场景接口, 独立运行和 arcade 共用 ---
     
-    def run(self):
-        running = True
-        while running:
-            running = self.handle_events()
-            self.update()
+    def enter(self):
+        """切入: 复用当前窗口, 整屏重绘, 丢弃离开期间的时间"""
+        self.screen = self.renderer.screen = ensure_display((SCREEN_WIDTH, SCREEN_HEIGHT), "Flappy Bird", self.pacer.vsync)
+        self.pacer.reset()
+        self.renderer.invalidate()
+        self.timestep.reset()
+        self.collector.enter()
+        if self.state == "PLAYING":
+            self.play_bgm()
+    
+    def exit(self):
+        self.stop_bgm()
+        self.rewinding = False
+        self.collector.exit()
+    
+    def step(self, frame_time, events=None):
+        """
+        处理输入并推进一帧的逻辑, 收到退出请求时返回 False。
+        events 为本帧的事件 (默认从队列取), 见 LDKpark.arcade
+        """
+        self.collector.begin()
+        running = self.handle_events(events)
+        self.poll_assets()
+        self.profiler.mark("events")
+        steps = 0
+        if running and self.rewinding and self.state in ("PLAYING", "GAME_OVER"):
+            # 按住回退键: 每个 tick 退回一条快照
+            steps = self.timestep.advance(frame_time)
+            self.rewind(steps)
+        elif running and self.state == "PLAYING":
+            # 固定步长推进物理, 与渲染帧率无关
+            steps = self.timestep.advance(frame_time)
+            for _ in range(steps):
+                self.update()
+                if self.state != "PLAYING":
+                    break
+        if steps or self.state != "PLAYING":
+            self.profiler.latency.applied()
+        self.profiler.mark("update")
+        return running
+    
+    def run(self, on_frame=None):
+        """on_frame(game) 在每帧末尾调用, 返回 False 时退出循环 (见 LDKpark.launcher)"""
+        frame_time = 0
+        profiler = self.profiler
+        self.enter()
+        while True:
+            profiler.begin()
+            if not self.step(frame_time):
+                break
             self.draw()
-            self.clock.tick(FPS)
-        
+            profiler.mark("draw")
+            frame_time = self.pacer.tick()
+            profiler.end()
+            if on_frame and not on_frame(self):
+                break
+        self.exit()
+        
+        if self.profile_path:
+            profiler.export(self.profile_path)
+        pygame.quit()
+
+    async def run_async(self, on_frame=None):
+        """run() 的协程版本, 每帧之间把剩余时间让给 asyncio 事件循环"""
+        await run_scene(self, self.fps, on_frame)
+        if self.profile_path:
+            self.profiler.export(self.profile_path)
         pygame.quit()
 
 # --- 模块接口 ---
 _game_instance = None
 
-def run():
+def run(fps=FPS, dirty_rects=False, profile=None, gc_control=False, pacing="tick", memory_limit_mb=None,
+        on_frame=None):
+    global _game_instance
+    _game_instance = FlappyBirdGame(fps, dirty_rects, profile, gc_control, pacing, memory_limit_mb)
+    _game_instance.run(on_frame)
+
+async def run_async(fps=FPS, dirty_rects=False, profile=None, gc_control=False, pacing="tick",
+                    memory_limit_mb=None, on_frame=None):
+    """run() 的协程版本, 可以和其他协程共用一个 asyncio 事件循环"""
     global _game_instance
-    _game_instance = FlappyBirdGame()
-    _game_instance.run()
+    _game_instance = FlappyBirdGame(fps, dirty_rects, profile, gc_control, pacing, memory_limit_mb)
+    await _game_instance.run_async(on_frame)
 
 def close():
     global _game_instance
@@ -2,8 +2,11 @@ import tkinter as tk
 from tkinter import messagebox
 import random
 
+from ..aio import pump_tk
+
 # 全局变量，存储窗口实例，用于控制关闭
 _root = None
+POLL_MS = 50  # on_frame 的调用间隔
 
 # 难度配置
 DIFFICULTY = {
@@ -258,15 +261,8 @@ class MinesweeperGUI:
             self.buttons[(r, c)].config(text="💣", bg="#ffcccc")
 
 
-def run(difficulty="简单"):
-    """
-    启动扫雷游戏。
-    这是一个阻塞函数，会启动 Tkinter 主循环。
-    关闭窗口后，函数才会返回。
-
-    参数:
-        difficulty: 难度级别，可选 "简单"、"中级"、"困难"
-    """
+def _open(difficulty):
+    """创建窗口并返回游戏对象；窗口已存在时把它置于前台并返回 None"""
     global _root
 
     if difficulty not in DIFFICULTY:
@@ -276,15 +272,53 @@ def run(difficulty="简单"):
     if _root is not None:
         try:
             _root.lift()
-            return
+            return None
         except tk.TclError:
             pass
 
     _root = tk.Tk()
-    game = MinesweeperGUI(_root, difficulty)
+    return MinesweeperGUI(_root, difficulty)
+
+
+def run(difficulty="简单", on_frame=None):
+    """
+    启动扫雷游戏。
+    这是一个阻塞函数，会启动 Tkinter 主循环。
+    关闭窗口后，函数才会返回。
+
+    参数:
+        difficulty: 难度级别，可选 "简单"、"中级"、"困难"
+        on_frame: 每 POLL_MS 毫秒调用一次 on_frame(game)，返回 False 时关闭窗口
+    """
+    game = _open(difficulty)
+    if game is None:
+        return
+    if on_frame:
+        _poll(on_frame, game)
     _root.mainloop()
 
 
+async def run_async(difficulty="简单", on_frame=None):
+    """
+    run() 的协程版本：用 root.update() 代替 mainloop，
+    不会阻塞 asyncio 事件循环。参数与 run() 相同。
+    """
+    game = _open(difficulty)
+    if game is None:
+        return
+    await pump_tk(_root, game, on_frame)
+    close()
+
+
+def _poll(on_frame, game):
+    if _root is None:
+        return
+    if on_frame(game):
+        _root.after(POLL_MS, _poll, on_frame, game)
+    else:
+        close()
+
+
 def close():
     """
     关闭扫雷游戏窗口。
@@ -1,15 +1,29 @@
 import pygame
 import random
 import os
+import io
 import math
+import struct
 import tkinter as tk
 from tkinter import filedialog
 import threading
+from itertools import chain
+
+from ..timestep import FixedTimestep, SIM_HZ, lerp
+from ..text import load_font, render as render_text
+from ..assets import assets
+from ..render import DirtyRenderer, ensure_display
+from ..perf import FrameProfiler
+from ..aio import run_scene
+from ..gcpause import GCController
+from ..pacing import FramePacer
+from ..quality import QualityGovernor
+from ..rewind import SnapshotRing
 
 # --- 游戏配置 ---
 SCREEN_WIDTH = 900
 SCREEN_HEIGHT = 500
-FPS = 60
+FPS = 60  # 渲染帧率上限, 物理固定以 timestep.SIM_HZ 推进
 
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -18,10 +32,43 @@ GROUND_COLOR = (194, 178, 128)
 PLAYER_COLOR = (50, 50, 200)
 OBSTACLE_COLOR = (200, 50, 50)
 
+# 自定义图片的绘制尺寸 (宽, 高)
+PLAYER_STAND_SIZE = (40, 60)
+PLAYER_DUCK_SIZE = (50, 30)
+OBSTACLE_SIZES = {'ground': (30, 50), 'air': (50, 50)}
+
+# 回退快照的记录格式 (见 LDKpark.rewind), 障碍和粒子按上限预留位置
+MAX_OBSTACLES = 8
+MAX_PARTICLES = 64
+# tick, 分数, 速度, 下一个间距, 随机数版本, 背景滚动, 玩家 y/prev_y/vel_y/跳/蹲/高度/动画, 障碍数, 粒子数
+SNAP_HEADER = struct.Struct("<IidiI4d??BIBB")
+SNAP_SCENERY = struct.Struct("<27f")     # 5 朵云和 4 座山, 各 (x, y, 大小)
+SNAP_OBSTACLE = struct.Struct("<?5d?")   # 空中?, x, prev_x, y, prev_y, 速度, 已越过
+SNAP_PARTICLE = struct.Struct("<7fh3B")  # x, y, prev_x, prev_y, vx, vy, 大小, 寿命, 颜色
+OBSTACLES_AT = SNAP_HEADER.size + SNAP_SCENERY.size
+PARTICLES_AT = OBSTACLES_AT + MAX_OBSTACLES * SNAP_OBSTACLE.size
+RECORD_SIZE = PARTICLES_AT + MAX_PARTICLES * SNAP_PARTICLE.size
+
+class ScaledImageCache:
+    """自定义图片的缩放版本, 加载时一次性取好所有绘制尺寸的表面"""
+    def __init__(self, path, sizes=()):
+        self.path = path
+        # 尺寸 -> 已缩放并转换格式的表面, 每帧直接 blit, 不再经过资源管理器查找
+        self.surfaces = {tuple(size): assets.load(path, size) for size in sizes}
+            
+    def get(self, size):
+        surface = self.surfaces.get(size)
+        if surface is None:
+            # 未预先缩放的尺寸, 第一次用到时缩放并保存
+            surface = self.surfaces[tuple(size)] = assets.load(self.path, size)
+        return surface
+
 class Particle:
     def __init__(self, x, y, color):
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
         self.color = color
         self.vx = random.uniform(-2, 2)
         self.vy = random.uniform(-4, 0)
@@ -29,18 +76,22 @@ class Particle:
         self.size = random.randint(3, 6)
         
     def update(self):
+        self.prev_x = self.x
+        self.prev_y = self.y
         self.x += self.vx
         self.y += self.vy
         self.vy += 0.2
         self.life -= 1
         self.size = max(1, self.size - 0.1)
         
-    def draw(self, screen):
+    def draw(self, screen, t=1.0):
         if self.life > 0:
             s = pygame.Surface((self.size*2, self.size*2), pygame.SRCALPHA)
             alpha = int(255 * (self.life / 40))
             pygame.draw.circle(s, (*self.color, alpha), (self.size, self.size), int(self.size))
-            screen.blit(s, (self.x - self.size, self.y - self.size))
+            x = lerp(self.prev_x, self.x, t)
+            y = lerp(self.prev_y, self.y, t)
+            screen.blit(s, (x - self.size, y - self.size))
 
 class Player:
     def __init__(self):
@@ -48,6 +99,7 @@ class Player:
         self.width = 40
         self.height = 60
         self.y = 350
+        self.prev_y = self.y
         
         # 物理属性 - 降低跳跃力
         self.gravity = 0.8
@@ -56,7 +108,7 @@ class Player:
         self.is_jumping = False
         self.is_ducking = False
         
-        self.image = None
+        self.image = None  # ScaledImageCache
         self.animation_count = 0
         
     def jump(self):
@@ -69,6 +121,7 @@ class Player:
         self.is_ducking = state
         
     def update(self):
+        self.prev_y = self.y
         self.vel_y += self.gravity
         self.y += self.vel_y
         
@@ -76,6 +129,8 @@ class Player:
         target_height = 30 if self.is_ducking else 60
         
         if self.height != target_height:
+            # 上一步位置一起平移, 避免插值时出现悬空的一帧
+            self.prev_y += self.height - target_height
             self.y = self.y + self.height - target_height
             self.height = target_height
             
@@ -88,26 +143,26 @@ class Player:
             
         self.animation_count += 1
         
-    def draw(self, screen):
+    def draw(self, screen, t=1.0):
         current_height = self.height
         current_width = 50 if self.is_ducking else 40
+        y = lerp(self.prev_y, self.y, t)
         
         if self.image:
-            scaled_img = pygame.transform.scale(self.image, (current_width, current_height))
-            screen.blit(scaled_img, (self.x, self.y))
+            screen.blit(self.image.get((current_width, current_height)), (self.x, y))
         else:
-            self._draw_default(screen, current_width, current_height)
+            self._draw_default(screen, self.x, y, current_width, current_height)
             
-    def _draw_default(self, screen, w, h):
+    def _draw_default(self, screen, x, y, w, h):
         color = PLAYER_COLOR
-        pygame.draw.rect(screen, color, (self.x, self.y + 10, w, h - 10))
+        pygame.draw.rect(screen, color, (x, y + 10, w, h - 10))
         head_radius = 12 if not self.is_ducking else 8
-        pygame.draw.circle(screen, color, (self.x + w//2, self.y + 10), head_radius)
+        pygame.draw.circle(screen, color, (x + w//2, y + 10), head_radius)
         
         if not self.is_jumping:
             leg_offset = math.sin(self.animation_count * 0.3) * 5
-            pygame.draw.line(screen, color, (self.x + 10, self.y + h), (self.x + 10 - leg_offset, self.y + h + 15), 4)
-            pygame.draw.line(screen, color, (self.x + w - 10, self.y + h), (self.x + w - 10 + leg_offset, self.y + h + 15), 4)
+            pygame.draw.line(screen, color, (x + 10, y + h), (x + 10 - leg_offset, y + h + 15), 4)
+            pygame.draw.line(screen, color, (x + w - 10, y + h), (x + w - 10 + leg_offset, y + h + 15), 4)
 
     def get_rect(self):
         return pygame.Rect(self.x, self.y, self.width if not self.is_ducking else 50, self.height)
@@ -116,45 +171,182 @@ class Obstacle:
     def __init__(self, type, speed, custom_img=None):
         self.type = type
         self.x = SCREEN_WIDTH + 100
+        self.prev_x = self.x
         self.speed = speed
-        self.image = custom_img
         self.passed = False
+        self.width, self.height = OBSTACLE_SIZES[type]
+        # 生成时取好本尺寸的表面, 每帧直接 blit
+        self.image = custom_img.get((self.width, self.height)) if custom_img else None
         
         if type == 'ground':
-            self.width = 30
-            self.height = 50
             self.y = 360  # 地面障碍物
         else:  # air
-            self.width = 50
-            self.height = 50
             # 关键：调整为 Y=320，让站立/跳跃都撞，下蹲能过
             self.y = 320
+        self.prev_y = self.y
             
-    def update(self, speed):
+    def update(self, speed, time_ms):
+        self.prev_x = self.x
+        self.prev_y = self.y
         self.x -= speed
         if self.type == 'air':
-            self.y += math.sin(pygame.time.get_ticks() * 0.01) * 0.5
+            self.y += math.sin(time_ms * 0.01) * 0.5
             
-    def draw(self, screen):
+    def draw(self, screen, t=1.0):
+        x = lerp(self.prev_x, self.x, t)
+        y = lerp(self.prev_y, self.y, t)
         if self.image:
-            screen.blit(pygame.transform.scale(self.image, (self.width, self.height)), (self.x, self.y))
+            screen.blit(self.image, (x, y))
         else:
             color = OBSTACLE_COLOR
             if self.type == 'ground':
-                pygame.draw.rect(screen, color, (self.x, self.y, self.width, self.height))
-                pygame.draw.rect(screen, (0,0,0), (self.x, self.y, self.width, self.height), 2)
+                pygame.draw.rect(screen, color, (x, y, self.width, self.height))
+                pygame.draw.rect(screen, (0,0,0), (x, y, self.width, self.height), 2)
             else:
                 # 空中障碍物 - 画成更明显的方块
-                pygame.draw.rect(screen, color, (self.x, self.y, self.width, self.height))
-                pygame.draw.rect(screen, (150, 30, 30), (self.x, self.y, self.width, self.height), 3)
+                pygame.draw.rect(screen, color, (x, y, self.width, self.height))
+                pygame.draw.rect(screen, (150, 30, 30), (x, y, self.width, self.height), 3)
                 # 添加警示标志
-                pygame.draw.line(screen, WHITE, (self.x + 10, self.y + 10), (self.x + 40, self.y + 40), 3)
-                pygame.draw.line(screen, WHITE, (self.x + 40, self.y + 10), (self.x + 10, self.y + 40), 3)
+                pygame.draw.line(screen, WHITE, (x + 10, y + 10), (x + 40, y + 40), 3)
+                pygame.draw.line(screen, WHITE, (x + 40, y + 10), (x + 10, y + 40), 3)
                 
     def get_rect(self):
         # 稍微缩小碰撞箱增加容错
         return pygame.Rect(self.x + 5, self.y + 5, self.width - 10, self.height - 10)
 
+# --- 无显示模拟 ---
+
+class RunnerSim:
+    """
+    跑酷的纯逻辑部分: 障碍生成、物理和碰撞, 不依赖显示窗口。
+    随机数发生器可注入, 时间按 tick 计算, 同一种子得到同一条障碍流,
+    可用于批量跑局调参。
+    """
+    def __init__(self, rng=None, start_speed=7, max_speed=20, speed_step=0.5,
+                 speed_every=100, spawn_gap=(300, 500), air_chance=0.4):
+        self.rng = rng if rng is not None else random.Random()
+        self.start_speed = start_speed
+        self.max_speed = max_speed
+        self.speed_step = speed_step
+        self.speed_every = speed_every
+        self.spawn_gap = spawn_gap
+        self.air_chance = air_chance
+        self.obstacle_images = {}  # 障碍类型 -> ScaledImageCache, 由 RunnerGame 设置
+        self.rng_version = 0  # 每消耗一次 rng 加一, 回退时按版本恢复随机数状态
+        self.reset()
+        
+    def reset(self):
+        self.player = Player()
+        self.obstacles = []
+        self.score = 0
+        self.game_speed = self.start_speed
+        self.tick = 0
+        self.alive = True
+        self.next_gap = self.rng.randint(*self.spawn_gap)
+        self.rng_version += 1
+        
+    def spawn_obstacle(self):
+        obs_type = 'air' if self.rng.random() < self.air_chance else 'ground'
+        self.obstacles.append(Obstacle(obs_type, self.game_speed, self.obstacle_images.get(obs_type)))
+        # 下一个障碍的间距在生成时就抽好, 每个障碍只消耗一次随机数
+        self.next_gap = self.rng.randint(*self.spawn_gap)
+        self.rng_version += 1
+        
+    def step(self):
+        """推进一个 tick, 撞上障碍时返回 False"""
+        self.tick += 1
+        self.player.update()
+        
+        if len(self.obstacles) == 0 or self.obstacles[-1].x < SCREEN_WIDTH - self.next_gap:
+            self.spawn_obstacle()
+            
+        time_ms = self.tick * 1000 / SIM_HZ
+        for obs in self.obstacles:
+            obs.update(self.game_speed, time_ms)
+            
+        # 障碍按生成顺序从右往左排列, 出界的总在队首
+        while self.obstacles and self.obstacles[0].x < -50:
+            self.obstacles.pop(0)
+            self.score += 10
+            if self.score % self.speed_every == 0:
+                self.game_speed = min(self.max_speed, self.game_speed + self.speed_step)
+                
+        player_rect = self.player.get_rect()
+        for obs in self.obstacles:
+            if obs.x >= player_rect.right:
+                break  # 后面的障碍只会更靠右
+            if player_rect.colliderect(obs.get_rect()):
+                self.alive = False
+                break
+        return self.alive
+        
+    def run(self, max_ticks, autopilot=None):
+        """连续模拟直到撞上障碍或达到 max_ticks, 返回得分"""
+        while self.alive and self.tick < max_ticks:
+            if autopilot:
+                autopilot.act(self)
+            self.step()
+        return self.score
+
+class Autopilot:
+    """
+    基于规则的自动操作: 根据 Player 的跳跃弧线, 让地面障碍正好落在
+    跳跃的安全窗口中间时起跳; 空中障碍靠近时下蹲, 通过后站起。
+    """
+    def __init__(self, duck_lead=2):
+        self.duck_lead = duck_lead  # 提前下蹲的 tick 数
+        
+        probe = Player()
+        stand_rect = probe.get_rect()
+        self.stand_left, self.stand_right = stand_rect.left, stand_rect.right
+        self.duck_right = probe.x + 50
+        
+        # 地面障碍的碰撞箱顶部, 脚要抬到它之上
+        obs_top = Obstacle('ground', 0).get_rect().top
+        need = stand_rect.bottom - obs_top
+        
+        # 模拟一次跳跃, 记录每个 tick 的离地高度
+        base_y = probe.y
+        probe.jump()
+        arc = []
+        while True:
+            probe.update()
+            if not probe.is_jumping:
+                break
+            arc.append(base_y - probe.y)
+        self.jump_arc = arc
+        
+        clear = [t for t, h in enumerate(arc, 1) if h >= need]
+        self.clear_mid = (clear[0] + clear[-1]) / 2
+        
+    def act(self, sim):
+        player = sim.player
+        speed = sim.game_speed
+        
+        # 找出最近一个还没越过玩家的障碍
+        target = None
+        for obs in sim.obstacles:
+            if obs.get_rect().right > self.stand_left:
+                target = obs
+                break
+        if target is None:
+            player.duck(False)
+            return
+            
+        rect = target.get_rect()
+        if target.type == 'air':
+            if rect.left - speed * self.duck_lead < self.duck_right:
+                player.duck(True)
+            return
+            
+        if player.is_ducking:
+            player.duck(False)
+            return
+        # 障碍与站立碰撞箱重叠区间的中点, 还有多少 tick 到达
+        overlap_mid = ((rect.left - self.stand_right) + (rect.right - self.stand_left)) / (2 * speed)
+        if overlap_mid <= self.clear_mid:
+            player.jump()
+
 class Button:
     def __init__(self, x, y, w, h, text, color, hover_color):
         self.rect = pygame.Rect(x, y, w, h)
@@ -162,13 +354,13 @@ class Button:
         self.color = color
         self.hover_color = hover_color
         self.is_hovered = False
-        self.font = pygame.font.Font(None, 32)
+        self.font = load_font(None, 32)
         
     def draw(self, screen):
         color = self.hover_color if self.is_hovered else self.color
         pygame.draw.rect(screen, color, self.rect, border_radius=8)
         pygame.draw.rect(screen, WHITE, self.rect, 2, border_radius=8)
-        text_surf = self.font.render(self.text, True, WHITE)
+        text_surf = render_text(self.font, self.text, WHITE)
         text_rect = text_surf.get_rect(center=self.rect.center)
         screen.blit(text_surf, text_rect)
         
@@ -179,18 +371,30 @@ class Button:
         return clicked and self.rect.collidepoint(pos)
 
 class RunnerGame:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("Parkour Runner")
-        self.clock = pygame.time.Clock()
+    def __init__(self, fps=FPS, dirty_rects=False, profile=None, gc_control=False, pacing="tick",
+                 quality=False, memory_limit_mb=None):
+        # 帧节奏: 默认 clock.tick, 见 LDKpark.pacing
+        self.pacer = FramePacer(fps, pacing)
+        self.screen = ensure_display((SCREEN_WIDTH, SCREEN_HEIGHT), "Parkour Runner", self.pacer.vsync)
+        self.clock = self.pacer.clock
+        self.fps = fps
+        # 脏矩形渲染: 静态画面只画一次, 只提交改动区域
+        self.renderer = DirtyRenderer(self.screen, dirty_rects)
+        # 分阶段计时, F3 切换 HUD; profile 为导出路径时从启动开始记录, 退出时写出
+        self.profile_path = profile
+        self.profiler = FrameProfiler(bool(profile), self.entity_counts)
+        # 可选的 GC 暂停控制: 冻结已加载的资源, 只在帧的空闲时间或两局之间回收
+        self.collector = GCController(gc_control, memory_limit_mb=memory_limit_mb)
+        self.profiler.collector = self.collector
+        # 可选的自适应画质: 帧时间超出预算时减少粒子和背景层
+        self.quality = QualityGovernor(quality, fps)
+        self.profiler.quality = self.quality
+        self.timestep = FixedTimestep()
         
         self.state = "MENU"
-        self.score = 0
         self.high_score = 0
-        self.game_speed = 7
         
-        self.player = Player()
-        self.obstacles = []
+        self.sim = RunnerSim()
         self.particles = []
         
         self.bg_scroll = 0
@@ -199,14 +403,19 @@ class RunnerGame:
         
         self.jump_key = pygame.K_SPACE
         self.duck_key = pygame.K_DOWN
+        self.rewind_key = pygame.K_BACKSPACE
+        
+        # 回退: 每个 tick 一条快照, 按住 rewind_key 倒放最近 10 秒
+        self.history = SnapshotRing(RECORD_SIZE)
+        self.rewinding = False
         
         self.bgm_path = None
+        self.bgm_data = None  # 后台预读的音乐文件 (Future)
         self.custom_player_img = None
-        self.custom_ground_obs_img = None
-        self.custom_air_obs_img = None
+        self.pending_images = {}  # 图片类型 -> (路径, 后台加载中的 PendingAsset)
         
-        self.font = pygame.font.Font(None, 36)
-        self.big_font = pygame.font.Font(None, 72)
+        self.font = load_font(None, 36)
+        self.big_font = load_font(None, 72)
         
         self.setup_buttons()
         
@@ -226,22 +435,42 @@ class RunnerGame:
         self.bgm_btn = Button(50, 340, 300, 40, "Load BGM", (0, 150, 136), (77, 182, 172))
         self.back_btn = Button(SCREEN_WIDTH//2 - 50, 420, 100, 40, "BACK", (158, 158, 158), (224, 224, 224))
 
+    # 玩家、障碍、分数和速度都由 RunnerSim 维护
+    @property
+    def player(self):
+        return self.sim.player
+        
+    @property
+    def obstacles(self):
+        return self.sim.obstacles
+        
+    @property
+    def score(self):
+        return self.sim.score
+        
+    @property
+    def game_speed(self):
+        return self.sim.game_speed
+
     def reset_game(self):
-        self.player = Player()
+        self.collector.between_rounds()
+        self.sim.reset()
         if self.custom_player_img:
             self.player.image = self.custom_player_img
             
-        self.obstacles = []
         self.particles = []
-        self.score = 0
-        self.game_speed = 7
+        self.timestep.reset()
+        self.history.clear()
+        self.snapshot()
         
     def spawn_particles(self, x, y, count=10, color=WHITE):
-        for _ in range(count):
+        for _ in range(self.quality.count(count)):
             self.particles.append(Particle(x, y, color))
 
     def update_game(self):
-        self.player.update()
+        if not self.sim.step():
+            self.game_over()
+            return
         
         self.bg_scroll += self.game_speed
         
@@ -255,39 +484,16 @@ class RunnerGame:
             m[0] -= self.game_speed * 0.5
             if m[0] < -m[2]:
                 m[0] = SCREEN_WIDTH + random.randint(0, 200)
-        
-        if len(self.obstacles) == 0 or self.obstacles[-1].x < SCREEN_WIDTH - random.randint(300, 500):
-            if random.random() < 0.4:
-                obs_type = 'air'
-                img = self.custom_air_obs_img
-            else:
-                obs_type = 'ground'
-                img = self.custom_ground_obs_img
                 
-            self.obstacles.append(Obstacle(obs_type, self.game_speed, img))
-            
-        for obs in self.obstacles[:]:
-            obs.update(self.game_speed)
-            if obs.x < -50:
-                self.obstacles.remove(obs)
-                self.score += 10
-                if self.score % 100 == 0:
-                    self.game_speed = min(20, self.game_speed + 0.5)
-                    
-        player_rect = self.player.get_rect()
-        for obs in self.obstacles:
-            obs_rect = obs.get_rect()
-            if player_rect.colliderect(obs_rect):
-                self.game_over()
-                return
-                
-        if not self.player.is_jumping and random.random() < 0.3:
+        # 尘土按画质档位降低出现概率
+        if not self.player.is_jumping and random.random() < 0.3 * self.quality.settings["particles"]:
             self.spawn_particles(self.player.x + 10, 410, 1, (150, 140, 100))
             
         for p in self.particles[:]:
             p.update()
             if p.life <= 0:
                 self.particles.remove(p)
+        self.snapshot()
 
     def game_over(self):
         self.state = "GAME_OVER"
@@ -296,36 +502,131 @@ class RunnerGame:
         self.spawn_particles(self.player.x, self.player.y, 30, (255, 100, 0))
         self.stop_bgm()
 
-    def draw_background(self):
-        for y in range(SCREEN_HEIGHT):
-            r = int(135 + (200 - 135) * y / SCREEN_HEIGHT)
-            g = int(206 + (220 - 206) * y / SCREEN_HEIGHT)
-            b = int(235 + (240 - 235) * y / SCREEN_HEIGHT)
-            pygame.draw.line(self.screen, (r, g, b), (0, y), (SCREEN_WIDTH, y))
-            
-        pygame.draw.circle(self.screen, (255, 255, 200), (700, 100), 40)
+    # --- 回退 ---
+
+    def snapshot(self):
+        """把当前 tick 的状态打包进回退缓冲区"""
+        history = self.history
+        buffer = history.buffer
+        base = history.push()
+        sim = self.sim
+        player = sim.player
+        obstacles = sim.obstacles
+        if len(obstacles) > MAX_OBSTACLES:
+            obstacles = obstacles[:MAX_OBSTACLES]
+        particles = self.particles
+        if len(particles) > MAX_PARTICLES:
+            particles = particles[-MAX_PARTICLES:]  # 只保留最新的粒子
+        SNAP_HEADER.pack_into(buffer, base, sim.tick, sim.score, sim.game_speed, sim.next_gap,
+                              sim.rng_version, self.bg_scroll, player.y, player.prev_y, player.vel_y,
+                              player.is_jumping, player.is_ducking, player.height,
+                              player.animation_count, len(obstacles), len(particles))
+        SNAP_SCENERY.pack_into(buffer, base + SNAP_HEADER.size,
+                               *chain.from_iterable(self.clouds), *chain.from_iterable(self.mountains))
+        offset = base + OBSTACLES_AT
+        for obs in obstacles:
+            SNAP_OBSTACLE.pack_into(buffer, offset, obs.type == 'air', obs.x, obs.prev_x, obs.y,
+                                    obs.prev_y, obs.speed, obs.passed)
+            offset += SNAP_OBSTACLE.size
+        offset = base + PARTICLES_AT
+        for p in particles:
+            SNAP_PARTICLE.pack_into(buffer, offset, p.x, p.y, p.prev_x, p.prev_y, p.vx, p.vy,
+                                    p.size, p.life, *p.color)
+            offset += SNAP_PARTICLE.size
+        history.save_rng(sim.rng_version, sim.rng)
+
+    def restore(self, base):
+        """从回退缓冲区 base 处的记录恢复状态"""
+        history = self.history
+        buffer = history.buffer
+        sim = self.sim
+        player = sim.player
+        (sim.tick, sim.score, sim.game_speed, sim.next_gap, version, self.bg_scroll,
+         player.y, player.prev_y, player.vel_y, player.is_jumping, player.is_ducking,
+         player.height, player.animation_count, n_obstacles, n_particles) = SNAP_HEADER.unpack_from(buffer, base)
+        sim.alive = True
+        history.load_rng(version, sim.rng)
+        sim.rng_version = version
+
+        scenery = SNAP_SCENERY.unpack_from(buffer, base + SNAP_HEADER.size)
+        for i, row in enumerate(chain(self.clouds, self.mountains)):
+            row[:] = scenery[i * 3:i * 3 + 3]
+
+        obstacles = []
+        offset = base + OBSTACLES_AT
+        for _ in range(n_obstacles):
+            is_air, x, prev_x, y, prev_y, speed, passed = SNAP_OBSTACLE.unpack_from(buffer, offset)
+            obs_type = 'air' if is_air else 'ground'
+            obs = Obstacle(obs_type, speed, sim.obstacle_images.get(obs_type))
+            obs.x, obs.prev_x, obs.y, obs.prev_y, obs.passed = x, prev_x, y, prev_y, passed
+            obstacles.append(obs)
+            offset += SNAP_OBSTACLE.size
+        sim.obstacles = obstacles
+
+        particles = []
+        offset = base + PARTICLES_AT
+        for _ in range(n_particles):
+            p = Particle.__new__(Particle)  # 不走 __init__, 避免消耗随机数
+            (p.x, p.y, p.prev_x, p.prev_y, p.vx, p.vy, p.size, p.life,
+             r, g, b) = SNAP_PARTICLE.unpack_from(buffer, offset)
+            p.color = (r, g, b)
+            particles.append(p)
+            offset += SNAP_PARTICLE.size
+        self.particles = particles
+
+    def rewind(self, ticks):
+        """退回 ticks 个 tick, 最早的一条快照保留; 在结束画面里回退会回到游戏中"""
+        history = self.history
+        for _ in range(ticks):
+            if len(history) < 2:
+                break
+            history.pop()
+        base = history.peek()
+        if base is None:
+            return
+        self.restore(base)
+        if self.state == "GAME_OVER":
+            self.state = "PLAYING"
+            self.play_bgm()
+
+    def draw_background(self, t=1.0):
+        # 远景按固定速度滚动, 直接用本步位移回推插值位置
+        lag = (1 - t) * self.game_speed
+        self.screen.blit(assets.get("runner.sky", self._build_sky), (0, 0))
+        layers = self.quality.settings["layers"]  # 2: 山和云, 1: 只有山, 0: 只有天空
         
-        for m in self.mountains:
+        for m in self.mountains if layers >= 1 else ():
             color = (100, 120, 100)
-            points = [(m[0], 400), (m[0] + m[2]//2, 400 - m[1]), (m[0] + m[2], 400)]
+            x = m[0] + lag * 0.5
+            points = [(x, 400), (x + m[2]//2, 400 - m[1]), (x + m[2], 400)]
             pygame.draw.polygon(self.screen, color, points)
             
-        for c in self.clouds:
-            pygame.draw.ellipse(self.screen, WHITE, (c[0], c[1], c[2], c[2]//2))
+        for c in self.clouds if layers >= 2 else ():
+            pygame.draw.ellipse(self.screen, WHITE, (c[0] + lag * 0.2, c[1], c[2], c[2]//2))
             
         pygame.draw.rect(self.screen, GROUND_COLOR, (0, 410, SCREEN_WIDTH, 90))
         pygame.draw.line(self.screen, (170, 150, 100), (0, 410), (SCREEN_WIDTH, 410), 3)
+    
+    def _build_sky(self):
+        """渐变天空和太阳是静态的, 只构建一次"""
+        sky = assets.gradient((SCREEN_WIDTH, SCREEN_HEIGHT), (135, 206, 235), (200, 220, 240)).copy()
+        pygame.draw.circle(sky, (255, 255, 200), (700, 100), 40)
+        return sky
         
     def draw_ui(self):
-        score_text = self.font.render(f"Score: {self.score}", True, BLACK)
+        score_text = render_text(self.font, f"Score: {self.score}", BLACK)
         self.screen.blit(score_text, (20, 20))
         
-        speed_text = self.font.render(f"Speed: {self.game_speed:.1f}", True, BLACK)
+        speed_text = render_text(self.font, f"Speed: {self.game_speed:.1f}", BLACK)
         self.screen.blit(speed_text, (20, 50))
+        
+        if self.rewinding:
+            rewind_text = render_text(self.font, "<< REWIND", BLACK)
+            self.screen.blit(rewind_text, (SCREEN_WIDTH - rewind_text.get_width() - 20, 20))
 
     def draw_menu(self):
         self.draw_background()
-        title = self.big_font.render("PARKOUR RUNNER", True, (50, 50, 50))
+        title = render_text(self.big_font, "PARKOUR RUNNER", (50, 50, 50))
         rect = title.get_rect(center=(SCREEN_WIDTH//2, 120))
         self.screen.blit(title, rect)
         self.player.x = SCREEN_WIDTH//2 - 50
@@ -337,16 +638,13 @@ class RunnerGame:
         self.settings_btn.draw(self.screen)
 
     def draw_game_over(self):
-        s = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        s.set_alpha(150)
-        s.fill(BLACK)
-        self.screen.blit(s, (0,0))
+        self.screen.blit(assets.overlay((SCREEN_WIDTH, SCREEN_HEIGHT), (*BLACK, 150)), (0, 0))
         
-        text = self.big_font.render("GAME OVER", True, (255, 50, 50))
+        text = render_text(self.big_font, "GAME OVER", (255, 50, 50))
         rect = text.get_rect(center=(SCREEN_WIDTH//2, 180))
         self.screen.blit(text, rect)
         
-        score_text = self.font.render(f"Score: {self.score}  Best: {self.high_score}", True, WHITE)
+        score_text = render_text(self.font, f"Score: {self.score}  Best: {self.high_score}", WHITE)
         rect = score_text.get_rect(center=(SCREEN_WIDTH//2, 230))
         self.screen.blit(score_text, rect)
         
@@ -355,7 +653,7 @@ class RunnerGame:
 
     def draw_settings(self):
         self.screen.fill((240, 240, 240))
-        title = self.big_font.render("SETTINGS", True, (50, 50, 50))
+        title = render_text(self.big_font, "SETTINGS", (50, 50, 50))
         self.screen.blit(title, (SCREEN_WIDTH//2 - 100, 20))
         
         self.key_jump_btn.draw(self.screen)
@@ -370,9 +668,50 @@ class RunnerGame:
         self.player.y = 300
         self.player.draw(self.screen)
         
-        hint = self.font.render("Custom images will be scaled", True, (100,100,100))
+        hint = render_text(self.font, "Custom images will be scaled", (100,100,100))
         self.screen.blit(hint, (50, 390))
 
+    def draw(self):
+        renderer = self.renderer
+        if self.state == "MENU":
+            if renderer.static(("MENU", self.player.image, self.start_btn.is_hovered,
+                                self.settings_btn.is_hovered, self.quality.level)):
+                self.draw_menu()
+        elif self.state == "PLAYING":
+            renderer.dynamic()
+            t = self.timestep.alpha
+            self.draw_background(t)
+            for obs in self.obstacles:
+                obs.draw(self.screen, t)
+            for p in self.particles:
+                p.draw(self.screen, t)
+            self.player.draw(self.screen, t)
+            self.draw_ui()
+        elif self.state == "GAME_OVER":
+            if renderer.static(("GAME_OVER", self.retry_btn.is_hovered, self.menu_btn.is_hovered,
+                                self.quality.level)):
+                self.draw_background()
+                for obs in self.obstacles: obs.draw(self.screen)
+                for p in self.particles: p.draw(self.screen)
+                self.player.draw(self.screen)
+                self.draw_game_over()
+        elif self.state == "SETTINGS":
+            buttons = (self.key_jump_btn, self.key_duck_btn, self.player_img_btn, self.ground_obs_btn,
+                       self.air_obs_btn, self.bgm_btn, self.back_btn)
+            if renderer.static(("SETTINGS", self.player.image,
+                                tuple((b.text, b.is_hovered) for b in buttons))):
+                self.draw_settings()
+        
+        renderer.overlay("hud", lambda: self.profiler.draw_hud(self.screen))
+        # 画质只按绘制的工作量调整, 不含 flip (vsync 时会阻塞到垂直同步)
+        self.quality.end()
+        renderer.present()
+        self.profiler.latency.presented()
+        self.collector.idle(1.0 / self.fps)
+
+    def entity_counts(self):
+        return {"obstacles": len(self.obstacles), "particles": len(self.particles)}
+
     # --- 资源加载 ---
 
     def open_key_dialog(self, type):
@@ -413,18 +752,27 @@ class RunnerGame:
         root.withdraw()
         path = filedialog.askopenfilename(filetypes=[("Image", "*.png;*.jpg;*.bmp")])
         if path:
+            # 在后台线程解码, 完成前继续使用默认画法
+            self.pending_images[type] = (path, assets.load_async(path))
+        root.destroy()
+
+    def poll_assets(self):
+        """把后台加载完成的图片换上去"""
+        for type, (path, pending) in list(self.pending_images.items()):
+            if not pending.done():
+                continue
+            del self.pending_images[type]
             try:
-                img = pygame.image.load(path)
+                pending.result()
                 if type == "player":
-                    self.custom_player_img = img
-                    self.player.image = img
+                    self.custom_player_img = ScaledImageCache(path, (PLAYER_STAND_SIZE, PLAYER_DUCK_SIZE))
+                    self.player.image = self.custom_player_img
                 elif type == "ground_obs":
-                    self.custom_ground_obs_img = img
+                    self.sim.obstacle_images['ground'] = ScaledImageCache(path, (OBSTACLE_SIZES['ground'],))
                 elif type == "air_obs":
-                    self.custom_air_obs_img = img
+                    self.sim.obstacle_images['air'] = ScaledImageCache(path, (OBSTACLE_SIZES['air'],))
             except Exception as e:
                 print(e)
-        root.destroy()
 
     def load_bgm_resource(self):
         root = tk.Tk()
@@ -432,12 +780,17 @@ class RunnerGame:
         path = filedialog.askopenfilename(filetypes=[("Audio", "*.mp3;*.wav")])
         if path:
             self.bgm_path = path
+            self.bgm_data = assets.read_async(path)
         root.destroy()
 
     def play_bgm(self):
         if self.bgm_path:
             try:
-                pygame.mixer.music.load(self.bgm_path)
+                source = self.bgm_path
+                # 预读完成时直接从内存播放, 不在主线程读盘
+                if self.bgm_data and self.bgm_data.done() and not self.bgm_data.exception():
+                    source = io.BytesIO(self.bgm_data.result())
+                pygame.mixer.music.load(source, os.path.splitext(self.bgm_path)[1][1:])
                 pygame.mixer.music.play(-1)
             except: pass
 
@@ -446,17 +799,23 @@ class RunnerGame:
 
     # --- 主循环 ---
     
-    def handle_events(self):
+    def handle_events(self, events=None):
         mouse_pos = pygame.mouse.get_pos()
         clicked = False
         
-        for event in pygame.event.get():
+        for event in pygame.event.get() if events is None else events:
             if event.type == pygame.QUIT:
                 return False
             if event.type == pygame.MOUSEBUTTONDOWN:
                 clicked = True
             if event.type == pygame.KEYDOWN:
-                if self.state == "PLAYING":
+                self.profiler.latency.input(event)
+                if event.key == pygame.K_F3:
+                    self.profiler.toggle()
+                    self.renderer.invalidate()
+                elif event.key == self.rewind_key:
+                    self.rewinding = True
+                elif self.state == "PLAYING":
                     if event.key == self.jump_key:
                         self.player.jump()
                         self.spawn_particles(self.player.x, 410, 5, (200, 200, 200))
@@ -468,6 +827,8 @@ class RunnerGame:
             if event.type == pygame.KEYUP:
                 if event.key == self.duck_key:
                     self.player.duck(False)
+                if event.key == self.rewind_key:
+                    self.rewinding = False
                     
         if self.state == "MENU":
             self.start_btn.check_hover(mouse_pos)
@@ -504,45 +865,93 @@ class RunnerGame:
             
         return True
 
-    def run(self):
-        running = True
-        while running:
-            running = self.handle_events()
-            
-            if self.state == "PLAYING":
+    # --- 场景接口, 独立运行和 arcade 共用 ---
+
+    def enter(self):
+        """切入: 复用当前窗口, 整屏重绘, 丢弃离开期间的时间"""
+        self.screen = self.renderer.screen = ensure_display((SCREEN_WIDTH, SCREEN_HEIGHT), "Parkour Runner", self.pacer.vsync)
+        self.pacer.reset()
+        self.renderer.invalidate()
+        self.timestep.reset()
+        self.collector.enter()
+        if self.state == "PLAYING":
+            self.play_bgm()
+
+    def exit(self):
+        self.stop_bgm()
+        self.rewinding = False
+        self.collector.exit()
+
+    def step(self, frame_time, events=None):
+        """
+        处理输入并推进一帧的逻辑, 收到退出请求时返回 False。
+        events 为本帧的事件 (默认从队列取), 见 LDKpark.arcade
+        """
+        self.collector.begin()
+        self.quality.begin()
+        running = self.handle_events(events)
+        self.poll_assets()
+        self.profiler.mark("events")
+        steps = 0
+        if running and self.rewinding and self.state in ("PLAYING", "GAME_OVER"):
+            # 按住回退键: 每个 tick 退回一条快照
+            steps = self.timestep.advance(frame_time)
+            self.rewind(steps)
+        elif running and self.state == "PLAYING":
+            # 固定步长推进物理, 与渲染帧率无关
+            steps = self.timestep.advance(frame_time)
+            for _ in range(steps):
                 self.update_game()
+                if self.state != "PLAYING":
+                    break
+        if steps or self.state != "PLAYING":
+            self.profiler.latency.applied()
+        self.profiler.mark("update")
+        return running
+
+    def run(self, on_frame=None):
+        """on_frame(game) 在每帧末尾调用, 返回 False 时退出循环 (见 LDKpark.launcher)"""
+        frame_time = 0
+        profiler = self.profiler
+        self.enter()
+        while True:
+            profiler.begin()
+            if not self.step(frame_time):
+                break
+            self.draw()
+            profiler.mark("draw")
+            frame_time = self.pacer.tick()
+            profiler.end()
+            if on_frame and not on_frame(self):
+                break
+        self.exit()
             
-            if self.state == "MENU":
-                self.draw_menu()
-            elif self.state == "PLAYING":
-                self.draw_background()
-                for obs in self.obstacles:
-                    obs.draw(self.screen)
-                for p in self.particles:
-                    p.draw(self.screen)
-                self.player.draw(self.screen)
-                self.draw_ui()
-            elif self.state == "GAME_OVER":
-                self.draw_background()
-                for obs in self.obstacles: obs.draw(self.screen)
-                for p in self.particles: p.draw(self.screen)
-                self.player.draw(self.screen)
-                self.draw_game_over()
-            elif self.state == "SETTINGS":
-                self.draw_settings()
-                
-            pygame.display.flip()
-            self.clock.tick(FPS)
-            
+        if self.profile_path:
+            profiler.export(self.profile_path)
+        pygame.quit()
+
+    async def run_async(self, on_frame=None):
+        """run() 的协程版本, 每帧之间把剩余时间让给 asyncio 事件循环"""
+        await run_scene(self, self.fps, on_frame)
+        if self.profile_path:
+            self.profiler.export(self.profile_path)
         pygame.quit()
 
 # --- 模块接口 ---
 _game = None
 
-def run():
+def run(fps=FPS, dirty_rects=False, profile=None, gc_control=False, pacing="tick", quality=False,
+        memory_limit_mb=None, on_frame=None):
+    global _game
+    _game = RunnerGame(fps, dirty_rects, profile, gc_control, pacing, quality, memory_limit_mb)
+    _game.run(on_frame)
+
+async def run_async(fps=FPS, dirty_rects=False, profile=None, gc_control=False, pacing="tick", quality=False,
+                    memory_limit_mb=None, on_frame=None):
+    """run() 的协程版本, 可以和其他协程共用一个 asyncio 事件循环"""
     global _game
-    _game = RunnerGame()
-    _game.run()
+    _game = RunnerGame(fps, dirty_rects, profile, gc_control, pacing, quality, memory_limit_mb)
+    await _game.run_async(on_frame)
 
 def close():
     global _game
@@ -3,6 +3,23 @@ import random
 import math
 import os
 import sys
+from itertools import repeat
+
+from ..text import load_font, render as render_text
+from ..assets import assets
+from ..render import DirtyRenderer, ensure_display
+from ..perf import FrameProfiler
+from ..aio import run_scene
+from ..gcpause import GCController
+from ..pacing import FramePacer
+from ..quality import QualityGovernor
+
+# NumPy 为可选依赖, 弹幕模式的子弹池需要它
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
 
 # --- 配置与常量 ---
 
@@ -36,12 +53,92 @@ PLAYER_SPEED = 6
 BULLET_SPEED = 12
 ENEMY_BULLET_SPEED = 5
 POWERUP_SPEED = 2
+GRID_CELL = 64  # 碰撞网格的格子边长
+
+# 精灵缓存的量化档数
+ROTATION_STEPS = 60  # 旋转敌机在一个对称周期内的角度档数
+PULSE_PHASES = 40    # 道具脉动一周的相位档数
+FLAME_HEIGHTS = range(15, 24)  # 玩家引擎火焰的高度
+
+# 背景星星数量: 有 numpy 时使用向量化星空, 可以画得更密
+STAR_COUNT = 2000 if HAS_NUMPY else 50
 
 # 敌机类型配置
 ENEMY_TYPES = {
     'small': {'hp': 1, 'score': 10, 'speed': (2, 4), 'size': 30, 'color': COLORS['enemy_small']},
     'medium': {'hp': 3, 'score': 30, 'speed': (1.5, 2.5), 'size': 45, 'color': COLORS['enemy_medium']},
     'large': {'hp': 8, 'score': 100, 'speed': (0.8, 1.5), 'size': 60, 'color': COLORS['enemy_large']},
+    'boss': {'hp': 150, 'score': 1000, 'speed': (1.5, 1.5), 'size': 100, 'color': COLORS['boss']},
+}
+
+# 会旋转的敌机外形的对称周期 (度), 未列出的不旋转
+ENEMY_ROTATION_PERIOD = {'medium': 120}
+
+# 难度配置
+# bullet_pool: 子弹改用 NumPy 子弹池; ring: 各类敌机每次射击发出的环形弹数量 (0 为单发)
+# spawn_scale: 敌机生成间隔的倍率
+DIFFICULTY = {
+    'normal': {
+        'bullet_pool': False,
+        'ring': {},
+        'ring_speed': ENEMY_BULLET_SPEED,
+        'shoot_interval': (60, 120),
+        'spawn_scale': 1,
+    },
+    'bullet_hell': {
+        'bullet_pool': True,
+        'ring': {'small': 16, 'medium': 32, 'large': 64},
+        'ring_speed': ENEMY_BULLET_SPEED * 0.4,
+        'shoot_interval': (20, 40),
+        'spawn_scale': 0.5,
+    },
+}
+
+# 波次模板: spawns 中每项为 (第几个生成间隔, 敌机类型, 横向位置 0~1, None 为随机),
+# length 为一个循环的间隔数。每波开始时按当前生成间隔编译成按帧排序的时间线循环播放
+WAVE_TEMPLATES = {
+    # 混编, small/medium/large 约 6:3:1
+    'mixed': {'length': 10, 'spawns': (
+        (0, 'small', None), (1, 'medium', None), (2, 'small', None), (3, 'small', None),
+        (4, 'medium', None), (5, 'small', None), (6, 'large', None), (7, 'small', None),
+        (8, 'medium', None), (9, 'small', None),
+    )},
+    # V 字编队
+    'v_formation': {'length': 10, 'spawns': (
+        (0, 'small', 0.5), (0.3, 'small', 0.35), (0.3, 'small', 0.65),
+        (0.6, 'small', 0.2), (0.6, 'small', 0.8), (3, 'medium', None),
+        (5, 'large', 0.5), (6, 'small', None), (7, 'medium', None), (9, 'small', None),
+    )},
+    # 两侧夹击
+    'pincer': {'length': 10, 'spawns': (
+        (0, 'medium', 0.1), (0, 'medium', 0.9), (2, 'small', 0.2), (2, 'small', 0.8),
+        (4, 'large', None), (5, 'small', None), (7, 'small', 0.1), (7, 'small', 0.9),
+        (8, 'medium', None), (9, 'small', None),
+    )},
+}
+WAVE_ORDER = ('mixed', 'v_formation', 'mixed', 'pincer')  # 各波使用的模板, 按波数循环
+BOSS_EVERY = 5  # 每 5 波出现一次 Boss, Boss 存活期间暂停普通生成与波数推进
+
+# Boss 弹幕模式, 启动时预计算成速度数组
+# ring: 一次 count 发的环形弹; spiral: 每 every 帧发 arms 发, 每次旋转 turn 度, 共 volleys 次;
+# fan: 朝玩家方向张开 spread 度的 count 发扇形
+BULLET_PATTERNS = {
+    'ring': {'kind': 'ring', 'count': 24, 'speed': 3},
+    'spiral': {'kind': 'spiral', 'arms': 4, 'turn': 11, 'volleys': 30, 'every': 4, 'speed': 3},
+    'fan': {'kind': 'fan', 'count': 7, 'spread': 60, 'speed': 4.5},
+}
+
+# Boss 入场后悬停的高度与横移速度, 攻击时间线 (帧, 弹幕模式) 每 cycle 帧循环一次
+BOSS_HOVER_Y = 140
+BOSS_STRAFE_SPEED = 1.5
+BOSS_SCRIPT = {
+    'cycle': 420,
+    'attacks': (
+        (30, 'fan'), (60, 'fan'), (90, 'fan'),
+        (140, 'ring'), (170, 'ring'), (200, 'ring'),
+        (250, 'spiral'),
+        (390, 'fan'),
+    ),
 }
 
 # --- 辅助函数 ---
@@ -79,12 +176,311 @@ def draw_hexagon(surface, color, center, size):
     pygame.draw.polygon(surface, color, points)
     pygame.draw.polygon(surface, (255, 255, 255), points, 2)
 
+def draw_enemy_shape(surface, enemy_type, center, angle=0):
+    """按类型绘制敌机外形"""
+    config = ENEMY_TYPES[enemy_type]
+    color = config['color']
+    radius = config['size'] // 2
+    if enemy_type == 'small':
+        draw_diamond(surface, color, center, radius)
+    elif enemy_type == 'medium':
+        draw_triangle(surface, color, center, radius, angle)
+    elif enemy_type == 'boss':
+        draw_hexagon(surface, color, center, radius)
+        draw_diamond(surface, COLORS['enemy_large'], center, radius // 2)
+    else:  # large
+        draw_hexagon(surface, color, center, radius)
+
+def draw_powerup_shape(surface, powerup_type, center, size):
+    """按类型绘制道具, size 为当前脉动大小"""
+    x, y = center
+    color = PowerUp.COLORS[powerup_type]
+    if powerup_type == 'health':
+        # 十字形状
+        pygame.draw.rect(surface, color, (x - size, y - 4, size * 2, 8))
+        pygame.draw.rect(surface, color, (x - 4, y - size, 8, size * 2))
+    elif powerup_type == 'weapon':
+        # 箭头形状
+        points = [
+            (x, y - size),
+            (x + size * 0.7, y + size * 0.5),
+            (x, y),
+            (x - size * 0.7, y + size * 0.5),
+        ]
+        pygame.draw.polygon(surface, color, points)
+    else:  # shield
+        # 圆形
+        pygame.draw.circle(surface, color, (int(x), int(y)), int(size))
+    
+    # 外圈
+    pygame.draw.circle(surface, (255, 255, 255), (int(x), int(y)), int(size + 4), 2)
+
+def draw_ship(surface, center, radius, flame_height):
+    """绘制玩家飞机与引擎火焰"""
+    x, y = center
+    # 飞机主体 - 三角形
+    color = COLORS['player']
+    points = [
+        (x, y - radius),
+        (x + radius * 0.8, y + radius * 0.5),
+        (x, y + radius * 0.2),
+        (x - radius * 0.8, y + radius * 0.5),
+    ]
+    pygame.draw.polygon(surface, color, points)
+    pygame.draw.polygon(surface, (255, 255, 255), points, 2)
+    
+    # 引擎火焰
+    flame_points = [
+        (x - radius * 0.3, y + radius * 0.3),
+        (x, y + radius * 0.3 + flame_height),
+        (x + radius * 0.3, y + radius * 0.3),
+    ]
+    pygame.draw.polygon(surface, COLORS['player_engine'], flame_points)
+
+def powerup_size(angle):
+    """道具的脉动大小"""
+    return 12 + math.sin(math.radians(angle)) * 3
+
 def check_collision(obj1, obj2):
-    """圆形碰撞检测"""
+    """圆形碰撞检测 (比较距离平方, 不开方)"""
     dx = obj1.x - obj2.x
     dy = obj1.y - obj2.y
-    distance = math.sqrt(dx * dx + dy * dy)
-    return distance < (obj1.radius + obj2.radius)
+    r = obj1.radius + obj2.radius
+    return dx * dx + dy * dy < r * r
+
+class SpatialGrid:
+    """
+    均匀网格宽相位, 每帧重建。
+    每个目标登记到它外接框 (半径加上 pad) 覆盖的所有格子里,
+    查询时只需看点所在的一个格子; 格子内保持原列表顺序。
+    """
+    def __init__(self, cell_size=GRID_CELL):
+        self.cell_size = cell_size
+        self.cells = {}
+    
+    def rebuild(self, objects, pad=0):
+        cells = {}
+        size = self.cell_size
+        for obj in objects:
+            r = obj.radius + pad
+            x0 = int((obj.x - r) // size)
+            x1 = int((obj.x + r) // size)
+            y0 = int((obj.y - r) // size)
+            y1 = int((obj.y + r) // size)
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    bucket = cells.get((cx, cy))
+                    if bucket is None:
+                        cells[(cx, cy)] = [obj]
+                    else:
+                        bucket.append(obj)
+        self.cells = cells
+    
+    def query(self, x, y):
+        size = self.cell_size
+        return self.cells.get((int(x // size), int(y // size)), ())
+
+def find_bullet_hits(bullets, enemies, grid):
+    """返回 (子弹, 敌机) 命中列表: 每颗子弹只命中列表中最靠前的一架敌机"""
+    if not bullets or not enemies:
+        return []
+    grid.rebuild(enemies, pad=max(b.radius for b in bullets))
+    hits = []
+    for bullet in bullets:
+        bx = bullet.x
+        by = bullet.y
+        br = bullet.radius
+        for enemy in grid.query(bx, by):
+            dx = bx - enemy.x
+            dy = by - enemy.y
+            r = br + enemy.radius
+            if dx * dx + dy * dy < r * r:
+                hits.append((bullet, enemy))
+                break
+    return hits
+
+_ring_cache = {}
+
+def ring_velocity(count, speed):
+    """环形弹幕的速度分量 (vx, vy), 按 (数量, 速度) 缓存"""
+    key = (count, speed)
+    if key not in _ring_cache:
+        angles = np.linspace(0, 2 * math.pi, count, endpoint=False)
+        _ring_cache[key] = (np.cos(angles) * speed, np.sin(angles) * speed)
+    return _ring_cache[key]
+
+def pattern_volleys(spec):
+    """把一个弹幕模式预计算成若干组速度 (vx, vy), fan 以 +x 方向为瞄准方向"""
+    speed = spec['speed']
+    if spec['kind'] == 'ring':
+        count = spec['count']
+        angle_sets = [[2 * math.pi * i / count for i in range(count)]]
+    elif spec['kind'] == 'spiral':
+        arms = spec['arms']
+        angle_sets = [
+            [math.radians(v * spec['turn']) + 2 * math.pi * i / arms for i in range(arms)]
+            for v in range(spec['volleys'])
+        ]
+    else:  # fan
+        spread = math.radians(spec['spread'])
+        count = spec['count']
+        angle_sets = [[spread * (i / (count - 1) - 0.5) for i in range(count)]]
+    
+    volleys = []
+    for angles in angle_sets:
+        vx = [math.cos(a) * speed for a in angles]
+        vy = [math.sin(a) * speed for a in angles]
+        if HAS_NUMPY:
+            vx, vy = np.array(vx), np.array(vy)
+        volleys.append((vx, vy))
+    return volleys
+
+def rotate_velocity(vx, vy, angle):
+    """把一组速度旋转 angle 弧度"""
+    c = math.cos(angle)
+    s = math.sin(angle)
+    if HAS_NUMPY:
+        return vx * c - vy * s, vx * s + vy * c
+    return [x * c - y * s for x, y in zip(vx, vy)], [x * s + y * c for x, y in zip(vx, vy)]
+
+def compile_boss_script(script=BOSS_SCRIPT, patterns=BULLET_PATTERNS):
+    """把 Boss 攻击脚本编译成 (周期, [(帧, vx, vy, 是否瞄准), ...]) 按帧排序"""
+    timeline = []
+    for frame, name in script['attacks']:
+        spec = patterns[name]
+        aimed = spec['kind'] == 'fan'
+        for i, (vx, vy) in enumerate(pattern_volleys(spec)):
+            timeline.append((frame + i * spec.get('every', 0), vx, vy, aimed))
+    timeline.sort(key=lambda e: e[0])
+    return script['cycle'], timeline
+
+BOSS_TIMELINE = compile_boss_script()
+
+_wave_cache = {}
+
+def compile_wave(name, interval):
+    """把波次模板编译成 (周期帧数, [(帧, 敌机类型, 横向位置), ...]), 按 (模板, 间隔) 缓存"""
+    key = (name, interval)
+    if key not in _wave_cache:
+        template = WAVE_TEMPLATES[name]
+        timeline = sorted(
+            ((int(step * interval), enemy_type, x) for step, enemy_type, x in template['spawns']),
+            key=lambda e: e[0])
+        _wave_cache[key] = (int(template['length'] * interval), timeline)
+    return _wave_cache[key]
+
+def render_sprite(half, draw):
+    """在边长 2*half 的透明画布中心调用 draw(surface, center), 返回 (精灵, 中心偏移)"""
+    surface = pygame.Surface((half * 2, half * 2), pygame.SRCALPHA)
+    draw(surface, (half, half))
+    return surface.convert_alpha(), half
+
+class SpriteCache:
+    """
+    启动时预渲染的精灵, 绘制时只需一次 blit:
+    敌机按量化后的旋转角度, 道具按脉动相位, 玩家飞机按火焰高度。
+    需要在 set_mode 之后创建。
+    """
+    def __init__(self, rotation_steps=ROTATION_STEPS, pulse_phases=PULSE_PHASES):
+        self.enemies = {}
+        for enemy_type, config in ENEMY_TYPES.items():
+            half = config['size'] // 2 + 3
+            period = ENEMY_ROTATION_PERIOD.get(enemy_type, 0)
+            steps = rotation_steps if period else 1
+            frames = [
+                render_sprite(half, lambda s, c, t=enemy_type, a=period * i / steps:
+                              draw_enemy_shape(s, t, c, a))
+                for i in range(steps)
+            ]
+            self.enemies[enemy_type] = (frames, period)
+        
+        self.pulse_phases = pulse_phases
+        self.powerups = {}
+        for powerup_type in PowerUp.TYPES:
+            self.powerups[powerup_type] = [
+                render_sprite(22, lambda s, c, t=powerup_type, a=360 * i / pulse_phases:
+                              draw_powerup_shape(s, t, c, powerup_size(a)))
+                for i in range(pulse_phases)
+            ]
+        
+        self.ship = {
+            h: render_sprite(32, lambda s, c, h=h: draw_ship(s, c, 20, h))
+            for h in FLAME_HEIGHTS
+        }
+    
+    def enemy(self, enemy_type, angle):
+        frames, period = self.enemies[enemy_type]
+        if not period:
+            return frames[0]
+        return frames[int(angle % period * len(frames) / period)]
+    
+    def powerup(self, powerup_type, angle):
+        frames = self.powerups[powerup_type]
+        return frames[int(angle % 360 * self.pulse_phases / 360)]
+
+def make_bullet_sprite(color):
+    """子弹带光晕的完整外观, 与 Bullet.draw 一致"""
+    sprite = pygame.Surface((12, 12), pygame.SRCALPHA)
+    pygame.draw.circle(sprite, color, (6, 6), 4)
+    pygame.draw.circle(sprite, (*color[:3], 100), (6, 6), 5)
+    return sprite.convert_alpha()
+
+class ObjectPool:
+    """
+    空闲链表对象池。
+    acquire() 优先复用已归还的对象 (调用其 reset 重新初始化), 没有时才新建;
+    enabled 为 False 时不回收, 每次都新建, 用于对比测试。
+    """
+    def __init__(self, cls, enabled=True):
+        self.cls = cls
+        self.enabled = enabled
+        self.free = []
+        self.created = 0
+    
+    def acquire(self, *args):
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args)
+            return obj
+        self.created += 1
+        return self.cls(*args)
+    
+    def release(self, obj):
+        if self.enabled:
+            self.free.append(obj)
+    
+    def release_all(self, objs):
+        if self.enabled:
+            self.free.extend(objs)
+
+def update_active(objs, pool):
+    """逐个 update, 失效的对象用末尾元素顶替 (swap-remove) 并归还对象池"""
+    i = 0
+    while i < len(objs):
+        obj = objs[i]
+        obj.update()
+        if obj.active:
+            i += 1
+        else:
+            swap_remove(objs, i)
+            pool.release(obj)
+
+def compact_active(objs, pool):
+    """移除所有 active 为 False 的对象 (swap-remove, 不保持顺序)"""
+    i = 0
+    while i < len(objs):
+        obj = objs[i]
+        if obj.active:
+            i += 1
+        else:
+            swap_remove(objs, i)
+            pool.release(obj)
+
+def swap_remove(objs, i):
+    """O(1) 删除第 i 个元素"""
+    last = objs.pop()
+    if i < len(objs):
+        objs[i] = last
 
 # --- 游戏对象类 ---
 
@@ -107,9 +503,96 @@ class Star:
         color = (self.brightness, self.brightness, self.brightness)
         pygame.draw.circle(screen, color, (int(self.x), int(self.y)), self.size)
 
+class Starfield:
+    """
+    向量化的视差星空。
+    位置、速度存放在 NumPy 数组中, 每帧一次向量化位移与回绕;
+    远处 (depth 小) 的星星更小、更暗、移动更慢。
+    大小为 1 的远星直接写进 pixels2d, 其余星星按 (大小, 亮度档)
+    预先烘焙成精灵, 一次 blits 画完。
+    """
+    BRIGHTNESS_LEVELS = 8
+    
+    def __init__(self, count=STAR_COUNT, seed=None):
+        self.rng = np.random.default_rng(seed)
+        self.count = count
+        depth = self.rng.random(count) ** 2  # 远处的星星更多
+        self.x = self.rng.uniform(0, SCREEN_WIDTH, count)
+        self.y = self.rng.uniform(0, SCREEN_HEIGHT, count)
+        self.speed = 0.5 + 1.5 * depth
+        size = 1 + np.minimum((depth * 3).astype(np.int32), 2)
+        self.level = np.minimum((depth * self.BRIGHTNESS_LEVELS).astype(np.int32),
+                                self.BRIGHTNESS_LEVELS - 1)
+        self.sprite_index = (size - 1) * self.BRIGHTNESS_LEVELS + self.level
+        self.dots = np.flatnonzero(size == 1)
+        self.big = np.flatnonzero(size > 1)
+        self.sprites = []
+        self.dot_colors = None
+        self._visible = None
+    
+    def build_sprites(self, surface=None):
+        """需要在 set_mode 之后调用"""
+        surface = surface or pygame.display.get_surface()
+        colors = []
+        self.sprites = []
+        for size in (1, 2, 3):
+            for level in range(self.BRIGHTNESS_LEVELS):
+                b = 100 + 155 * (level + 1) // self.BRIGHTNESS_LEVELS
+                s = pygame.Surface((size * 2 + 1, size * 2 + 1), pygame.SRCALPHA)
+                pygame.draw.circle(s, (b, b, b), (size, size), size)
+                self.sprites.append((s.convert_alpha(), size))
+                if size == 1:
+                    colors.append(surface.map_rgb((b, b, b)))
+        self.dot_colors = np.array(colors, dtype=np.uint32)[self.level[self.dots]]
+        self._visible = None
+    
+    def update(self):
+        self.y += self.speed
+        wrapped = self.y > SCREEN_HEIGHT
+        n = int(np.count_nonzero(wrapped))
+        if n:
+            self.y[wrapped] = 0
+            self.x[wrapped] = self.rng.uniform(0, SCREEN_WIDTH, n)
+    
+    def visible(self, fraction):
+        """只画前 fraction 比例的星星 (位置是随机的, 前缀就是随机子集), 按数量缓存索引"""
+        limit = int(self.count * fraction)
+        if limit >= self.count:
+            return self.dots, self.big, self.dot_colors
+        if self._visible is None or self._visible[0] != limit:
+            dots = self.dots < limit
+            self._visible = (limit, self.dots[dots], self.big[self.big < limit], self.dot_colors[dots])
+        return self._visible[1:]
+    
+    def draw(self, screen, fraction=1.0):
+        xs = self.x.astype(np.int32)
+        ys = self.y.astype(np.int32)
+        dots, big, dot_colors = self.visible(fraction)
+        if screen.get_bytesize() == 4:
+            dx = xs[dots]
+            dy = ys[dots]
+            inside = (dx < screen.get_width()) & (dy < screen.get_height())
+            pixels = pygame.surfarray.pixels2d(screen)
+            pixels[dx[inside], dy[inside]] = dot_colors[inside]
+            del pixels  # 释放对 screen 的锁
+            stars = big
+        else:
+            stars = np.arange(int(self.count * fraction))  # 非 32 位屏幕全部走精灵
+        sprites = self.sprites
+        screen.blits([
+            (sprites[i][0], (x - sprites[i][1], y - sprites[i][1]))
+            for i, x, y in zip(self.sprite_index[stars].tolist(),
+                               xs[stars].tolist(), ys[stars].tolist())
+        ], False)
+
 class Particle:
     """粒子效果"""
+    __slots__ = ('x', 'y', 'color', 'vx', 'vy', 'life', 'max_life', 'size')
+    
     def __init__(self, x, y, color, speed=3, life=30):
+        self.reset(x, y, color, speed, life)
+    
+    def reset(self, x, y, color, speed=3, life=30):
         self.x = x
         self.y = y
         self.color = color
@@ -136,30 +619,164 @@ class Particle:
     
     def is_dead(self):
         return self.life <= 0
+    
+    @property
+    def active(self):
+        return self.life > 0
 
 class Bullet:
     """子弹类"""
-    def __init__(self, x, y, speed, is_player=True, damage=1):
+    __slots__ = ('x', 'y', 'speed', 'vx', 'is_player', 'damage', 'radius', 'active')
+    
+    def __init__(self, x, y, speed, is_player=True, damage=1, vx=0):
+        self.reset(x, y, speed, is_player, damage, vx)
+    
+    def reset(self, x, y, speed, is_player=True, damage=1, vx=0):
         self.x = x
         self.y = y
         self.speed = speed
+        self.vx = vx
         self.is_player = is_player
         self.damage = damage
         self.radius = 4
         self.active = True
     
     def update(self):
+        self.x += self.vx
         self.y += self.speed
-        if self.y < -10 or self.y > SCREEN_HEIGHT + 10:
+        if (self.y < -10 or self.y > SCREEN_HEIGHT + 10
+                or self.x < -10 or self.x > SCREEN_WIDTH + 10):
             self.active = False
     
-    def draw(self, screen):
+    def draw(self, screen, glow=True):
         color = COLORS['bullet'] if self.is_player else (255, 100, 100)
-        pygame.draw.circle(screen, color, (int(self.x), int(self.y)), self.radius)
-        # 光晕效果
-        glow = pygame.Surface((12, 12), pygame.SRCALPHA)
-        pygame.draw.circle(glow, (*color[:3], 100), (6, 6), 5)
-        screen.blit(glow, (int(self.x - 6), int(self.y - 6)))
+        if not glow:
+            pygame.draw.circle(screen, color, (int(self.x), int(self.y)), self.radius)
+            return
+        # 带光晕的外观只渲染一次, 之后每颗子弹直接 blit 同一张精灵
+        sprite = assets.get(("shooter.bullet", color), lambda: make_bullet_sprite(color))
+        screen.blit(sprite, (int(self.x - 6), int(self.y - 6)))
+
+OWNER_PLAYER = 0
+OWNER_ENEMY = 1
+
+class BulletPool:
+    """
+    弹幕模式的子弹池 (结构数组)。
+    x, y, vx, vy, owner, damage 存放在预分配的 NumPy 数组里, 前 count 个是活动子弹;
+    每帧一次向量化移动, 碰撞只做标记, 帧末 compact() 统一剔除。
+    """
+    RADIUS = 4
+    
+    def __init__(self, capacity=8192):
+        self.capacity = capacity
+        self.x = np.zeros(capacity, np.float32)
+        self.y = np.zeros(capacity, np.float32)
+        self.vx = np.zeros(capacity, np.float32)
+        self.vy = np.zeros(capacity, np.float32)
+        self.owner = np.zeros(capacity, np.int8)
+        self.damage = np.zeros(capacity, np.int16)
+        self.alive = np.zeros(capacity, np.bool_)
+        self.arrays = (self.x, self.y, self.vx, self.vy, self.owner, self.damage)
+        self.count = 0
+        self.sprites = {}
+    
+    def build_sprites(self):
+        """需要在 set_mode 之后调用"""
+        self.sprites = {
+            OWNER_PLAYER: make_bullet_sprite(COLORS['bullet']),
+            OWNER_ENEMY: make_bullet_sprite((255, 100, 100)),
+        }
+    
+    def clear(self):
+        self.count = 0
+    
+    def spawn(self, x, y, vx, vy, owner, damage=1):
+        if self.count >= self.capacity:
+            return False
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.owner[i] = owner
+        self.damage[i] = damage
+        self.alive[i] = True
+        self.count += 1
+        return True
+    
+    def spawn_many(self, x, y, vx, vy, owner, damage=1):
+        """以 (x, y) 为起点一次生成一组子弹, vx/vy 为速度数组"""
+        n = min(len(vx), self.capacity - self.count)
+        s = slice(self.count, self.count + n)
+        self.x[s] = x
+        self.y[s] = y
+        self.vx[s] = vx[:n]
+        self.vy[s] = vy[:n]
+        self.owner[s] = owner
+        self.damage[s] = damage
+        self.alive[s] = True
+        self.count += n
+    
+    def update(self):
+        n = self.count
+        x = self.x[:n]
+        y = self.y[:n]
+        x += self.vx[:n]
+        y += self.vy[:n]
+        self.alive[:n] = (y > -10) & (y < SCREEN_HEIGHT + 10) & (x > -10) & (x < SCREEN_WIDTH + 10)
+    
+    def compact(self):
+        """把存活的子弹紧凑到数组前部"""
+        n = self.count
+        keep = self.alive[:n]
+        kept = int(np.count_nonzero(keep))
+        if kept == n:
+            return
+        for arr in self.arrays:
+            arr[:kept] = arr[:n][keep]
+        self.alive[:kept] = True
+        self.count = kept
+    
+    def hits_on(self, x, y, radius, owner):
+        """与圆 (x, y, radius) 相交的、属于 owner 的存活子弹下标"""
+        n = self.count
+        dx = self.x[:n] - x
+        dy = self.y[:n] - y
+        r = radius + self.RADIUS
+        mask = (dx * dx + dy * dy < r * r) & (self.owner[:n] == owner) & self.alive[:n]
+        return np.flatnonzero(mask)
+    
+    def hits_on_enemies(self, enemies):
+        """
+        玩家子弹 x 敌机的一次性距离矩阵。
+        返回 (子弹下标, 敌机下标) 数组, 每颗子弹只算命中列表中最靠前的敌机。
+        """
+        n = self.count
+        idx = np.flatnonzero((self.owner[:n] == OWNER_PLAYER) & self.alive[:n])
+        if len(idx) == 0 or not enemies:
+            return idx[:0], idx[:0]
+        ex = np.array([e.x for e in enemies], np.float32)
+        ey = np.array([e.y for e in enemies], np.float32)
+        er = np.array([e.radius for e in enemies], np.float32) + self.RADIUS
+        dx = self.x[idx][None, :] - ex[:, None]
+        dy = self.y[idx][None, :] - ey[:, None]
+        hit = dx * dx + dy * dy < (er * er)[:, None]
+        any_hit = hit.any(axis=0)
+        return idx[any_hit], hit[:, any_hit].argmax(axis=0)
+    
+    def draw(self, screen):
+        """每种子弹共用一张带光晕的精灵, 一次 blits 画完"""
+        n = self.count
+        if n == 0:
+            return
+        pos = np.empty((n, 2), np.int32)
+        pos[:, 0] = self.x[:n] - 6
+        pos[:, 1] = self.y[:n] - 6
+        owner = self.owner[:n]
+        for key, sprite in self.sprites.items():
+            points = pos[owner == key].tolist()
+            screen.blits(zip(repeat(sprite, len(points)), points), False)
 
 class PowerUp:
     """道具类"""
@@ -169,8 +786,12 @@ class PowerUp:
         'weapon': COLORS['powerup_weapon'],
         'shield': COLORS['powerup_shield'],
     }
+    __slots__ = ('x', 'y', 'type', 'speed', 'radius', 'active', 'angle')
     
     def __init__(self, x, y):
+        self.reset(x, y)
+    
+    def reset(self, x, y):
         self.x = x
         self.y = y
         self.type = random.choice(self.TYPES)
@@ -185,34 +806,23 @@ class PowerUp:
         if self.y > SCREEN_HEIGHT + 20:
             self.active = False
     
-    def draw(self, screen):
-        color = self.COLORS[self.type]
-        # 旋转效果
-        size = 12 + math.sin(math.radians(self.angle)) * 3
-        
-        if self.type == 'health':
-            # 十字形状
-            pygame.draw.rect(screen, color, (self.x - size, self.y - 4, size * 2, 8))
-            pygame.draw.rect(screen, color, (self.x - 4, self.y - size, 8, size * 2))
-        elif self.type == 'weapon':
-            # 箭头形状
-            points = [
-                (self.x, self.y - size),
-                (self.x + size * 0.7, self.y + size * 0.5),
-                (self.x, self.y),
-                (self.x - size * 0.7, self.y + size * 0.5),
-            ]
-            pygame.draw.polygon(screen, color, points)
-        else:  # shield
-            # 圆形
-            pygame.draw.circle(screen, color, (int(self.x), int(self.y)), int(size))
-        
-        # 外圈
-        pygame.draw.circle(screen, (255, 255, 255), (int(self.x), int(self.y)), int(size + 4), 2)
+    def draw(self, screen, sprites=None):
+        if sprites:
+            sprite, half = sprites.powerup(self.type, self.angle)
+            screen.blit(sprite, (self.x - half, self.y - half))
+        else:
+            # 旋转效果
+            draw_powerup_shape(screen, self.type, (self.x, self.y), powerup_size(self.angle))
 
 class Enemy:
     """敌机基类"""
+    __slots__ = ('type', 'config', 'x', 'y', 'hp', 'max_hp', 'radius', 'speed_y', 'speed_x',
+                 'active', 'shoot_timer', 'shoot_interval', 'angle')
+    
     def __init__(self, enemy_type, x, y):
+        self.reset(enemy_type, x, y)
+    
+    def reset(self, enemy_type, x, y):
         self.type = enemy_type
         self.config = ENEMY_TYPES[enemy_type]
         self.x = x
@@ -245,15 +855,12 @@ class Enemy:
         
         self.shoot_timer += 1
     
-    def draw(self, screen):
-        color = self.config['color']
-        
-        if self.type == 'small':
-            draw_diamond(screen, color, (self.x, self.y), self.radius)
-        elif self.type == 'medium':
-            draw_triangle(screen, color, (self.x, self.y), self.radius, self.angle)
-        else:  # large
-            draw_hexagon(screen, color, (self.x, self.y), self.radius)
+    def draw(self, screen, sprites=None):
+        if sprites:
+            sprite, half = sprites.enemy(self.type, self.angle)
+            screen.blit(sprite, (self.x - half, self.y - half))
+        else:
+            draw_enemy_shape(screen, self.type, (self.x, self.y), self.angle)
         
         # 血条
         if self.hp < self.max_hp:
@@ -322,7 +929,7 @@ class Player:
         
         self.shoot_timer += 1
     
-    def draw(self, screen):
+    def draw(self, screen, sprites=None):
         # 无敌闪烁效果
         if self.invincible > 0 and self.invincible % 6 < 3:
             return
@@ -332,40 +939,28 @@ class Player:
             shield_radius = self.radius + 15 + math.sin(pygame.time.get_ticks() / 100) * 3
             pygame.draw.circle(screen, (100, 100, 255, 100), (int(self.x), int(self.y)), int(shield_radius), 3)
         
-        # 飞机主体 - 三角形
-        color = COLORS['player']
-        points = [
-            (self.x, self.y - self.radius),
-            (self.x + self.radius * 0.8, self.y + self.radius * 0.5),
-            (self.x, self.y + self.radius * 0.2),
-            (self.x - self.radius * 0.8, self.y + self.radius * 0.5),
-        ]
-        pygame.draw.polygon(screen, color, points)
-        pygame.draw.polygon(screen, (255, 255, 255), points, 2)
-        
-        # 引擎火焰
         flame_height = 15 + random.randint(0, 8)
-        flame_points = [
-            (self.x - self.radius * 0.3, self.y + self.radius * 0.3),
-            (self.x, self.y + self.radius * 0.3 + flame_height),
-            (self.x + self.radius * 0.3, self.y + self.radius * 0.3),
-        ]
-        pygame.draw.polygon(screen, COLORS['player_engine'], flame_points)
+        if sprites:
+            sprite, half = sprites.ship[flame_height]
+            screen.blit(sprite, (self.x - half, self.y - half))
+        else:
+            draw_ship(screen, (self.x, self.y), self.radius, flame_height)
     
-    def shoot(self):
+    def shoot(self, make_bullet=Bullet):
+        """make_bullet 用来创建子弹, 可传入对象池的 acquire"""
         if self.shoot_timer >= self.shoot_interval:
             self.shoot_timer = 0
             bullets = []
             
             if self.weapon_level == 1:
-                bullets.append(Bullet(self.x, self.y - self.radius, -BULLET_SPEED))
+                bullets.append(make_bullet(self.x, self.y - self.radius, -BULLET_SPEED))
             elif self.weapon_level == 2:
-                bullets.append(Bullet(self.x - 10, self.y - self.radius, -BULLET_SPEED))
-                bullets.append(Bullet(self.x + 10, self.y - self.radius, -BULLET_SPEED))
+                bullets.append(make_bullet(self.x - 10, self.y - self.radius, -BULLET_SPEED))
+                bullets.append(make_bullet(self.x + 10, self.y - self.radius, -BULLET_SPEED))
             elif self.weapon_level >= 3:
-                bullets.append(Bullet(self.x, self.y - self.radius, -BULLET_SPEED))
-                bullets.append(Bullet(self.x - 15, self.y - self.radius + 5, -BULLET_SPEED))
-                bullets.append(Bullet(self.x + 15, self.y - self.radius + 5, -BULLET_SPEED))
+                bullets.append(make_bullet(self.x, self.y - self.radius, -BULLET_SPEED))
+                bullets.append(make_bullet(self.x - 15, self.y - self.radius + 5, -BULLET_SPEED))
+                bullets.append(make_bullet(self.x + 15, self.y - self.radius + 5, -BULLET_SPEED))
             
             return bullets
         return []
@@ -401,26 +996,77 @@ class Player:
 # --- 游戏主类 ---
 
 class ShooterGame:
-    def __init__(self):
+    def __init__(self, difficulty='normal', star_count=STAR_COUNT, dirty_rects=False, profile=None, gc_control=False,
+                 pacing="tick", quality=False, memory_limit_mb=None, fps=FPS):
         pygame.init()
         pygame.mixer.init()
         
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("Shooter")
-        self.clock = pygame.time.Clock()
+        # 帧节奏: 默认 clock.tick, 见 LDKpark.pacing
+        self.fps = fps
+        self.pacer = FramePacer(fps, pacing)
+        self.screen = ensure_display((SCREEN_WIDTH, SCREEN_HEIGHT), "Shooter", self.pacer.vsync)
+        self.clock = self.pacer.clock
+        # 脏矩形渲染: 暂停与结束画面只画一次
+        self.renderer = DirtyRenderer(self.screen, dirty_rects)
+        # 分阶段计时, F3 切换 HUD; profile 为导出路径时从启动开始记录, 退出时写出
+        self.profile_path = profile
+        self.profiler = FrameProfiler(bool(profile), self.entity_counts)
+        # 可选的 GC 暂停控制: 冻结已加载的资源, 只在帧的空闲时间或两局之间回收
+        self.collector = GCController(gc_control, memory_limit_mb=memory_limit_mb)
+        self.profiler.collector = self.collector
+        # 可选的自适应画质: 帧时间超出预算时减少粒子、光晕和星星
+        self.quality = QualityGovernor(quality, fps)
+        self.profiler.quality = self.quality
+        
+        # 难度与子弹池
+        if DIFFICULTY[difficulty]['bullet_pool'] and not HAS_NUMPY:
+            print("未安装 numpy, 无法使用弹幕模式。请运行: pip install numpy")
+            difficulty = 'normal'
+        self.difficulty = difficulty
+        self.settings = DIFFICULTY[difficulty]
+        self.pool = None
+        if self.settings['bullet_pool']:
+            self.pool = BulletPool()
+            self.pool.build_sprites()
+        
+        # 对象池: 子弹、敌机、道具、粒子反复复用, 减少对象分配。
+        # 这些对象靠引用计数即时释放, 几乎不触发 GC, 对帧耗时没有明显影响 (见 bench shooter_object_pools)
+        self.bullet_objects = ObjectPool(Bullet)
+        self.enemy_objects = ObjectPool(Enemy)
+        self.powerup_objects = ObjectPool(PowerUp)
+        self.particle_objects = ObjectPool(Particle)
         
         # 字体
-        self.font_large = pygame.font.SysFont('simhei', 48)
-        self.font_medium = pygame.font.SysFont('simhei', 32)
-        self.font_small = pygame.font.SysFont('simhei', 20)
+        self.font_large = load_font('simhei', 48)
+        self.font_medium = load_font('simhei', 32)
+        self.font_small = load_font('simhei', 20)
         
         # 游戏状态
         self.reset_game()
+        self.paused_on_exit = False  # 切出前的暂停状态, 切回来时恢复
+        
+        # 背景星星: 有 numpy 时用向量化星空, 否则逐个 Star 对象
+        self.starfield = None
+        self.stars = []
+        if HAS_NUMPY:
+            self.starfield = Starfield(star_count)
+            self.starfield.build_sprites()
+        else:
+            self.stars = [Star() for _ in range(star_count)]
         
-        # 背景星星
-        self.stars = [Star() for _ in range(50)]
+        self.grid = SpatialGrid()
+        self.sprites = SpriteCache()
     
     def reset_game(self):
+        self.collector.between_rounds()
+        # 上一局的对象归还对象池
+        if hasattr(self, 'player'):
+            self.bullet_objects.release_all(self.bullets)
+            self.bullet_objects.release_all(self.enemy_bullets)
+            self.enemy_objects.release_all(self.enemies)
+            self.powerup_objects.release_all(self.powerups)
+            self.particle_objects.release_all(self.particles)
+        
         self.player = Player()
         self.bullets = []
         self.enemy_bullets = []
@@ -429,27 +1075,46 @@ class ShooterGame:
         self.particles = []
         self.score = 0
         self.wave = 1
-        self.enemy_spawn_timer = 0
         self.game_over = False
         self.paused = False
-        self.boss_fight = False
-    
-    def spawn_enemy(self):
-        """生成敌机"""
-        # 根据波数决定敌机类型
-        if self.wave % 5 == 0 and not self.boss_fight:
-            # Boss战
-            self.boss_fight = True
-            return
-        
-        # 随机生成普通敌机
-        weights = {'small': 60, 'medium': 30, 'large': 10}
-        enemy_type = random.choices(list(weights.keys()), weights=list(weights.values()))[0]
+        self.boss = None
+        if self.pool:
+            self.pool.clear()
+        self.start_wave()
+    
+    def start_wave(self):
+        """进入新的一波: 取本波的生成时间线, 每 BOSS_EVERY 波出现 Boss"""
+        interval = max(30, 90 - self.wave * 2) * self.settings['spawn_scale']
+        name = WAVE_ORDER[(self.wave - 1) % len(WAVE_ORDER)]
+        self.wave_cycle, self.wave_timeline = compile_wave(name, interval)
+        self.wave_cursor = 0
+        self.wave_frame = 0
+        if self.wave % BOSS_EVERY == 0:
+            self.spawn_boss()
+    
+    def advance_wave(self):
+        """时间线游标前进一帧, 生成到点的敌机"""
+        timeline = self.wave_timeline
+        while self.wave_cursor < len(timeline) and timeline[self.wave_cursor][0] <= self.wave_frame:
+            _, enemy_type, x = timeline[self.wave_cursor]
+            self.spawn_enemy(enemy_type, x)
+            self.wave_cursor += 1
         
-        x = random.randint(40, SCREEN_WIDTH - 40)
+        self.wave_frame += 1
+        if self.wave_frame >= self.wave_cycle:
+            self.wave_frame = 0
+            self.wave_cursor = 0
+    
+    def spawn_enemy(self, enemy_type, x=None):
+        """生成敌机, x 为 0~1 的横向位置, None 为随机"""
+        if x is None:
+            x = random.randint(40, SCREEN_WIDTH - 40)
+        else:
+            x = 40 + x * (SCREEN_WIDTH - 80)
         y = -50
         
-        enemy = Enemy(enemy_type, x, y)
+        enemy = self.enemy_objects.acquire(enemy_type, x, y)
+        enemy.shoot_interval = random.randint(*self.settings['shoot_interval'])
         
         # 添加横向移动
         if enemy_type == 'medium':
@@ -457,111 +1122,130 @@ class ShooterGame:
         
         self.enemies.append(enemy)
     
+    def spawn_boss(self):
+        boss = self.enemy_objects.acquire('boss', SCREEN_WIDTH // 2, -60)
+        self.boss = boss
+        self.boss_frame = 0
+        self.boss_cursor = 0
+        self.enemies.append(boss)
+    
+    def update_boss(self):
+        """Boss 入场后悬停并左右横移, 按预编译的攻击时间线发射弹幕"""
+        boss = self.boss
+        if boss.speed_y:
+            if boss.y < BOSS_HOVER_Y:
+                return  # 入场途中不射击
+            boss.y = BOSS_HOVER_Y
+            boss.speed_y = 0
+            boss.speed_x = BOSS_STRAFE_SPEED
+        
+        cycle, timeline = BOSS_TIMELINE
+        x = boss.x
+        y = boss.y + boss.radius
+        while self.boss_cursor < len(timeline) and timeline[self.boss_cursor][0] <= self.boss_frame:
+            _, vx, vy, aimed = timeline[self.boss_cursor]
+            if aimed:
+                vx, vy = rotate_velocity(vx, vy, math.atan2(self.player.y - y, self.player.x - x))
+            self.fire_volley(x, y, vx, vy)
+            self.boss_cursor += 1
+        
+        self.boss_frame += 1
+        if self.boss_frame >= cycle:
+            self.boss_frame = 0
+            self.boss_cursor = 0
+    
+    def fire_volley(self, x, y, vx, vy):
+        """从 (x, y) 发射一组敌方子弹"""
+        if self.pool:
+            self.pool.spawn_many(x, y, vx, vy, OWNER_ENEMY)
+        else:
+            acquire = self.bullet_objects.acquire
+            self.enemy_bullets.extend(acquire(x, y, dy, False, 1, dx) for dx, dy in zip(vx, vy))
+    
     def create_explosion(self, x, y, color, count=15):
-        """创建爆炸效果"""
-        for _ in range(count):
-            self.particles.append(Particle(x, y, color))
+        """创建爆炸效果, 粒子数量随画质档位缩放"""
+        for _ in range(self.quality.count(count)):
+            self.particles.append(self.particle_objects.acquire(x, y, color))
     
-    def update(self):
-        """更新游戏逻辑"""
+    def update(self, keys=None):
+        """更新游戏逻辑, keys 为空时读取当前键盘状态"""
         if self.game_over or self.paused:
             return
         
-        keys = pygame.key.get_pressed()
+        if keys is None:
+            keys = pygame.key.get_pressed()
         self.player.update(keys)
         
         # 自动射击
-        new_bullets = self.player.shoot()
-        self.bullets.extend(new_bullets)
+        new_bullets = self.player.shoot(self.bullet_objects.acquire)
+        if self.pool:
+            for b in new_bullets:
+                self.pool.spawn(b.x, b.y, 0, b.speed, OWNER_PLAYER, b.damage)
+            self.bullet_objects.release_all(new_bullets)
+        else:
+            self.bullets.extend(new_bullets)
         
         # 更新背景星星
+        if self.starfield:
+            self.starfield.update()
         for star in self.stars:
             star.update()
         
         # 更新子弹
-        for bullet in self.bullets[:]:
-            bullet.update()
-            if not bullet.active:
-                self.bullets.remove(bullet)
-        
-        for bullet in self.enemy_bullets[:]:
-            bullet.update()
-            if not bullet.active:
-                self.enemy_bullets.remove(bullet)
+        if self.pool:
+            self.pool.update()
+        update_active(self.bullets, self.bullet_objects)
+        update_active(self.enemy_bullets, self.bullet_objects)
         
         # 更新敌机
-        for enemy in self.enemies[:]:
+        enemies = self.enemies
+        i = 0
+        while i < len(enemies):
+            enemy = enemies[i]
             enemy.update()
             
             # 敌机射击
-            if enemy.can_shoot() and enemy.y > 0:
-                self.enemy_bullets.append(
-                    Bullet(enemy.x, enemy.y + enemy.radius, ENEMY_BULLET_SPEED, False)
-                )
+            if enemy is self.boss:
+                self.update_boss()
+            elif enemy.can_shoot() and enemy.y > 0:
+                self.enemy_shoot(enemy)
             
-            if not enemy.active:
-                self.enemies.remove(enemy)
-        
-        # 更新道具
-        for powerup in self.powerups[:]:
-            powerup.update()
-            if not powerup.active:
-                self.powerups.remove(powerup)
-        
-        # 更新粒子
-        for particle in self.particles[:]:
-            particle.update()
-            if particle.is_dead():
-                self.particles.remove(particle)
-        
-        # 碰撞检测 - 玩家子弹击中敌机
-        for bullet in self.bullets[:]:
-            for enemy in self.enemies[:]:
-                if check_collision(bullet, enemy):
-                    bullet.active = False
-                    if bullet in self.bullets:
-                        self.bullets.remove(bullet)
-                    
-                    if enemy.take_damage(bullet.damage):
-                        self.create_explosion(enemy.x, enemy.y, enemy.config['color'])
-                        self.score += enemy.config['score']
-                        
-                        # 随机掉落道具
-                        if random.random() < 0.15:
-                            self.powerups.append(PowerUp(enemy.x, enemy.y))
-                    break
-        
-        # 碰撞检测 - 敌机子弹击中玩家
-        for bullet in self.enemy_bullets[:]:
-            if check_collision(bullet, self.player):
-                bullet.active = False
-                if bullet in self.enemy_bullets:
-                    self.enemy_bullets.remove(bullet)
-                
-                if self.player.take_damage():
-                    self.create_explosion(self.player.x, self.player.y, COLORS['player'], 30)
-                
-                if not self.player.active:
-                    self.game_over = True
-                break
+            if enemy.active:
+                i += 1
+            else:
+                if enemy is self.boss:
+                    self.boss = None
+                swap_remove(enemies, i)
+                self.enemy_objects.release(enemy)
+        
+        # 更新道具与粒子
+        update_active(self.powerups, self.powerup_objects)
+        update_active(self.particles, self.particle_objects)
+        
+        # 碰撞检测 - 子弹
+        if self.pool:
+            self.pool_collisions()
+        else:
+            self.bullet_collisions()
         
         # 碰撞检测 - 玩家撞击敌机
-        for enemy in self.enemies[:]:
+        for enemy in self.enemies:
             if check_collision(self.player, enemy):
                 if self.player.take_damage():
                     self.create_explosion(self.player.x, self.player.y, COLORS['player'], 30)
                 
-                enemy.take_damage(10)  # 撞击对敌机造成伤害
+                if enemy is not self.boss:
+                    enemy.take_damage(10)  # 撞击对敌机造成伤害
                 
                 if not self.player.active:
                     self.game_over = True
         
         # 碰撞检测 - 玩家拾取道具
-        for powerup in self.powerups[:]:
+        picked = False
+        for powerup in self.powerups:
             if check_collision(self.player, powerup):
                 powerup.active = False
-                if powerup in self.powerups:
-                    self.powerups.remove(powerup)
+                picked = True
                 
                 if powerup.type == 'health':
                     self.player.heal()
@@ -571,45 +1255,119 @@ class ShooterGame:
                     self.player.activate_shield()
                 
                 self.score += 50
+        if picked:
+            compact_active(self.powerups, self.powerup_objects)
+        
+        # 生成敌机与波数进度, Boss 战期间暂停
+        if not self.boss:
+            self.advance_wave()
+            if self.score > self.wave * 500:
+                self.wave += 1
+                self.start_wave()
+    
+    def enemy_shoot(self, enemy):
+        """敌机射击: 普通模式单发, 弹幕模式按难度发射环形弹"""
+        x = enemy.x
+        y = enemy.y + enemy.radius
+        ring = self.settings['ring'].get(enemy.type, 0)
+        if self.pool:
+            if ring:
+                vx, vy = ring_velocity(ring, self.settings['ring_speed'])
+                self.pool.spawn_many(x, y, vx, vy, OWNER_ENEMY)
+            else:
+                self.pool.spawn(x, y, 0, ENEMY_BULLET_SPEED, OWNER_ENEMY)
+        else:
+            self.enemy_bullets.append(self.bullet_objects.acquire(x, y, ENEMY_BULLET_SPEED, False))
+    
+    def on_enemy_hit(self, enemy, damage):
+        if enemy.take_damage(damage):
+            self.create_explosion(enemy.x, enemy.y, enemy.config['color'])
+            self.score += enemy.config['score']
+            
+            # 随机掉落道具
+            if random.random() < 0.15:
+                self.powerups.append(self.powerup_objects.acquire(enemy.x, enemy.y))
+    
+    def on_player_hit(self):
+        if self.player.take_damage():
+            self.create_explosion(self.player.x, self.player.y, COLORS['player'], 30)
+        
+        if not self.player.active:
+            self.game_over = True
+    
+    def bullet_collisions(self):
+        """子弹对象的碰撞检测"""
+        # 玩家子弹击中敌机 (网格宽相位, 命中的子弹统一在最后移除)
+        hits = find_bullet_hits(self.bullets, self.enemies, self.grid)
+        for bullet, enemy in hits:
+            bullet.active = False
+            self.on_enemy_hit(enemy, bullet.damage)
+        if hits:
+            compact_active(self.bullets, self.bullet_objects)
+        
+        # 敌机子弹击中玩家
+        for i, bullet in enumerate(self.enemy_bullets):
+            if check_collision(bullet, self.player):
+                swap_remove(self.enemy_bullets, i)
+                self.bullet_objects.release(bullet)
+                self.on_player_hit()
+                break
+    
+    def pool_collisions(self):
+        """子弹池的碰撞检测, 全部是数组距离运算"""
+        pool = self.pool
+        bullet_idx, enemy_idx = pool.hits_on_enemies(self.enemies)
+        for b, e in zip(bullet_idx.tolist(), enemy_idx.tolist()):
+            pool.alive[b] = False
+            self.on_enemy_hit(self.enemies[e], int(pool.damage[b]))
         
-        # 生成敌机
-        self.enemy_spawn_timer += 1
-        spawn_interval = max(30, 90 - self.wave * 2)
-        if self.enemy_spawn_timer >= spawn_interval:
-            self.enemy_spawn_timer = 0
-            self.spawn_enemy()
+        hits = pool.hits_on(self.player.x, self.player.y, self.player.radius, OWNER_ENEMY)
+        if len(hits):
+            pool.alive[hits[0]] = False
+            self.on_player_hit()
         
-        # 波数进度
-        if self.score > self.wave * 500:
-            self.wave += 1
+        pool.compact()
     
     def draw(self):
         """渲染画面"""
+        if self.game_over or self.paused:
+            if not self.renderer.static((self.game_over, self.paused, self.quality.level)):
+                self.present()
+                return
+        else:
+            self.renderer.dynamic()
+        
         # 背景
         self.screen.fill(COLORS['bg'])
         
         # 绘制星星
-        for star in self.stars:
+        settings = self.quality.settings
+        if self.starfield:
+            self.starfield.draw(self.screen, settings['stars'])
+        for star in self.stars[:int(len(self.stars) * settings['stars'])]:
             star.draw(self.screen)
         
         if not self.game_over:
             # 绘制道具
             for powerup in self.powerups:
-                powerup.draw(self.screen)
+                powerup.draw(self.screen, self.sprites)
             
             # 绘制子弹
+            if self.pool:
+                self.pool.draw(self.screen)
+            glow = settings['glow']
             for bullet in self.bullets:
-                bullet.draw(self.screen)
+                bullet.draw(self.screen, glow)
             for bullet in self.enemy_bullets:
-                bullet.draw(self.screen)
+                bullet.draw(self.screen, glow)
             
             # 绘制敌机
             for enemy in self.enemies:
-                enemy.draw(self.screen)
+                enemy.draw(self.screen, self.sprites)
             
             # 绘制玩家
             if self.player.active:
-                self.player.draw(self.screen)
+                self.player.draw(self.screen, self.sprites)
             
             # 绘制粒子
             for particle in self.particles:
@@ -620,106 +1378,195 @@ class ShooterGame:
         else:
             self.draw_game_over()
         
-        pygame.display.flip()
+        self.present()
+    
+    def present(self):
+        """叠加计时 HUD 并提交本帧"""
+        self.renderer.overlay("hud", lambda: self.profiler.draw_hud(self.screen))
+        # 画质只按绘制的工作量调整, 不含 flip (vsync 时会阻塞到垂直同步)
+        self.quality.end()
+        self.renderer.present()
+        self.profiler.latency.presented()
+        self.collector.idle(1.0 / self.fps)
+    
+    def entity_counts(self):
+        return {
+            "enemies": len(self.enemies),
+            "bullets": len(self.bullets) + len(self.enemy_bullets) + (self.pool.count if self.pool else 0),
+            "particles": len(self.particles),
+        }
     
     def draw_ui(self):
         """绘制用户界面"""
         # 半透明背景
-        ui_surface = pygame.Surface((SCREEN_WIDTH, 60), pygame.SRCALPHA)
-        ui_surface.fill(COLORS['ui_bg'])
-        self.screen.blit(ui_surface, (0, 0))
+        self.screen.blit(assets.overlay((SCREEN_WIDTH, 60), COLORS['ui_bg']), (0, 0))
         
         # 分数
-        score_text = self.font_medium.render(f"分数: {self.score}", True, COLORS['text'])
+        score_text = render_text(self.font_medium, f"分数: {self.score}", COLORS['text'])
         self.screen.blit(score_text, (10, 10))
         
         # 波数
-        wave_text = self.font_medium.render(f"波数: {self.wave}", True, COLORS['text_highlight'])
+        wave_text = render_text(self.font_medium, f"波数: {self.wave}", COLORS['text_highlight'])
         self.screen.blit(wave_text, (SCREEN_WIDTH // 2 - wave_text.get_width() // 2, 10))
         
         # 生命值
-        hp_text = self.font_medium.render(f"生命: {self.player.hp}/{self.player.max_hp}", True, (255, 100, 100))
+        hp_text = render_text(self.font_medium, f"生命: {self.player.hp}/{self.player.max_hp}", (255, 100, 100))
         self.screen.blit(hp_text, (SCREEN_WIDTH - hp_text.get_width() - 10, 10))
         
         # 武器等级
-        weapon_text = self.font_small.render(f"武器 Lv.{self.player.weapon_level}", True, COLORS['powerup_weapon'])
+        weapon_text = render_text(self.font_small, f"武器 Lv.{self.player.weapon_level}", COLORS['powerup_weapon'])
         self.screen.blit(weapon_text, (10, 70))
         
         # 护盾状态
         if self.player.shield:
-            shield_text = self.font_small.render("护盾激活", True, COLORS['powerup_shield'])
+            shield_text = render_text(self.font_small, "护盾激活", COLORS['powerup_shield'])
             self.screen.blit(shield_text, (10, 90))
         
         # 操作提示
-        hint_text = self.font_small.render("WASD/方向键移动 | P暂停", True, COLORS['text_dim'])
+        hint_text = render_text(self.font_small, "WASD/方向键移动 | P暂停", COLORS['text_dim'])
         self.screen.blit(hint_text, (SCREEN_WIDTH - hint_text.get_width() - 10, SCREEN_HEIGHT - 25))
     
     def draw_game_over(self):
         """绘制游戏结束画面"""
         # 半透明遮罩
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(assets.overlay((SCREEN_WIDTH, SCREEN_HEIGHT), (0, 0, 0, 180)), (0, 0))
         
         # 游戏结束文字
-        over_text = self.font_large.render("游戏结束", True, (255, 80, 80))
+        over_text = render_text(self.font_large, "游戏结束", (255, 80, 80))
         self.screen.blit(over_text, 
                         (SCREEN_WIDTH // 2 - over_text.get_width() // 2, SCREEN_HEIGHT // 2 - 100))
         
         # 最终分数
-        score_text = self.font_medium.render(f"最终分数: {self.score}", True, COLORS['text'])
+        score_text = render_text(self.font_medium, f"最终分数: {self.score}", COLORS['text'])
         self.screen.blit(score_text, 
                         (SCREEN_WIDTH // 2 - score_text.get_width() // 2, SCREEN_HEIGHT // 2 - 20))
         
         # 波数
-        wave_text = self.font_medium.render(f"到达波数: {self.wave}", True, COLORS['text_highlight'])
+        wave_text = render_text(self.font_medium, f"到达波数: {self.wave}", COLORS['text_highlight'])
         self.screen.blit(wave_text, 
                         (SCREEN_WIDTH // 2 - wave_text.get_width() // 2, SCREEN_HEIGHT // 2 + 30))
         
         # 重新开始提示
-        restart_text = self.font_small.render("按 R 重新开始 | 按 ESC 退出", True, COLORS['text_dim'])
+        restart_text = render_text(self.font_small, "按 R 重新开始 | 按 ESC 退出", COLORS['text_dim'])
         self.screen.blit(restart_text, 
                         (SCREEN_WIDTH // 2 - restart_text.get_width() // 2, SCREEN_HEIGHT // 2 + 100))
     
-    def handle_events(self):
+    def handle_events(self, events=None):
         """处理输入事件"""
-        for event in pygame.event.get():
+        for event in pygame.event.get() if events is None else events:
             if event.type == pygame.QUIT:
                 return False
             
             if event.type == pygame.KEYDOWN:
+                self.profiler.latency.input(event)
                 if event.key == pygame.K_ESCAPE:
                     return False
                 
                 if event.key == pygame.K_p:
                     self.paused = not self.paused
                 
+                if event.key == pygame.K_F3:
+                    self.profiler.toggle()
+                    self.renderer.invalidate()
+                
                 if self.game_over:
                     if event.key == pygame.K_r:
                         self.reset_game()
         
         return True
     
-    def run(self):
-        """主游戏循环"""
-        running = True
-        
-        while running:
-            running = self.handle_events()
+    # --- 场景接口, 独立运行和 arcade 共用 ---
+    
+    def enter(self):
+        """切入: 复用当前窗口, 整屏重绘"""
+        self.screen = self.renderer.screen = ensure_display((SCREEN_WIDTH, SCREEN_HEIGHT), "Shooter", self.pacer.vsync)
+        self.paused = self.paused_on_exit
+        self.pacer.reset()
+        self.renderer.invalidate()
+        self.collector.enter()
+    
+    def exit(self):
+        """切出时记下暂停状态并暂停, 切回来时恢复成切出前的样子"""
+        self.paused_on_exit = self.paused
+        self.paused = True
+        self.collector.exit()
+    
+    def step(self, frame_time=0, events=None):
+        """
+        处理输入并推进一帧的逻辑, 收到退出请求时返回 False。
+        events 为本帧的事件 (默认从队列取), 见 LDKpark.arcade
+        """
+        self.collector.begin()
+        self.quality.begin()
+        running = self.handle_events(events)
+        self.profiler.mark("events")
+        if running:
             self.update()
+        self.profiler.latency.applied()
+        self.profiler.mark("update")
+        return running
+    
+    def run(self, on_frame=None):
+        """主游戏循环, on_frame(game) 在每帧末尾调用, 返回 False 时退出 (见 LDKpark.launcher)"""
+        profiler = self.profiler
+        self.enter()
+        while True:
+            profiler.begin()
+            if not self.step():
+                break
             self.draw()
-            self.clock.tick(FPS)
+            profiler.mark("draw")
+            self.pacer.tick()
+            profiler.end()
+            if on_frame and not on_frame(self):
+                break
+        self.exit()
+        
+        if self.profile_path:
+            profiler.export(self.profile_path)
         
+    async def run_async(self, on_frame=None):
+        """run() 的协程版本, 每帧之间把剩余时间让给 asyncio 事件循环"""
+        await run_scene(self, self.fps, on_frame)
+        if self.profile_path:
+            self.profiler.export(self.profile_path)
+    
     def close(self):
         """关闭游戏"""
         pygame.quit()
 
 # --- 外部调用接口 ---
 
-def run():
-    """外部调用接口"""
-    game = ShooterGame()
+def run(difficulty='normal', star_count=STAR_COUNT, dirty_rects=False, profile=None, gc_control=False,
+        pacing="tick", quality=False, memory_limit_mb=None, fps=FPS, on_frame=None):
+    """
+    外部调用接口
+
+    参数:
+        difficulty: 'normal' 或 'bullet_hell' (弹幕模式, 需要 numpy)
+        star_count: 背景星星数量
+        dirty_rects: 暂停与结束画面只绘制一次, 降低空闲时的 CPU 占用
+        profile: 帧计时导出路径 (.jsonl 或 Chrome trace .json), 为空时按 F3 临时查看
+        gc_control: 接管循环 GC, 只在帧的空闲时间或两局之间回收, 见 LDKpark.gcpause
+        pacing: 帧节奏策略 "tick" / "busy_loop" / "sleep_spin" / "vsync", 见 LDKpark.pacing
+        quality: 帧时间超出预算时自动降低粒子、光晕和星星数量, 有余量时再恢复, 见 LDKpark.quality
+        memory_limit_mb: 配合 gc_control, 进程内存超过这个值 (MB) 时立即做一次完整回收
+        fps: 帧率上限
+        on_frame: 每帧末尾调用 on_frame(game), 返回 False 时退出
+    """
+    game = ShooterGame(difficulty, star_count, dirty_rects, profile, gc_control, pacing, quality,
+                       memory_limit_mb, fps)
+    try:
+        game.run(on_frame)
+    finally:
+        game.close()
+
+async def run_async(difficulty='normal', star_count=STAR_COUNT, dirty_rects=False, profile=None, gc_control=False,
+                    pacing="tick", quality=False, memory_limit_mb=None, fps=FPS, on_frame=None):
+    """run() 的协程版本, 参数相同, 可以和其他协程共用一个 asyncio 事件循环"""
+    game = ShooterGame(difficulty, star_count, dirty_rects, profile, gc_control, pacing, quality,
+                       memory_limit_mb, fps)
     try:
-        game.run()
+        await game.run_async(on_frame)
     finally:
         game.close()
@@ -0,0 +1,499 @@
+import pygame
+import random
+from collections import deque
+
+from ..timestep import FixedTimestep
+from ..text import load_font, render as render_text
+from ..assets import assets
+from ..render import DirtyRenderer, ensure_display
+from ..perf import FrameProfiler
+from ..pacing import FramePacer
+from ..aio import run_scene
+
+# 初始化 Pygame
+pygame.init()
+
+# 游戏常量
+GRID_WIDTH = 24
+GRID_HEIGHT = 18
+CELL_SIZE = 25
+HUD_HEIGHT = 50
+SCREEN_WIDTH = GRID_WIDTH * CELL_SIZE
+SCREEN_HEIGHT = GRID_HEIGHT * CELL_SIZE + HUD_HEIGHT
+FPS = 60  # 渲染帧率上限, 逻辑固定以 timestep.SIM_HZ 推进
+MOVE_EVERY = 8  # 开局每 8 个 tick 走一格, 每吃 5 个食物快一档
+MIN_MOVE_EVERY = 3
+
+# 颜色定义
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+BOARD_COLOR = (30, 30, 40)
+GRID_COLOR = (38, 38, 50)
+HUD_COLOR = (20, 20, 28)
+HEAD_COLOR = (120, 230, 120)
+BODY_COLOR = (60, 180, 75)
+FOOD_COLOR = (230, 60, 60)
+RED = (255, 69, 0)
+
+UP = (0, -1)
+DOWN = (0, 1)
+LEFT = (-1, 0)
+RIGHT = (1, 0)
+
+KEY_DIRECTIONS = {
+    pygame.K_UP: UP, pygame.K_w: UP,
+    pygame.K_DOWN: DOWN, pygame.K_s: DOWN,
+    pygame.K_LEFT: LEFT, pygame.K_a: LEFT,
+    pygame.K_RIGHT: RIGHT, pygame.K_d: RIGHT,
+}
+
+
+class SnakeSim:
+    """
+    贪吃蛇的纯逻辑部分, 不依赖显示窗口。
+    格子用下标 y * width + x 表示; 蛇身是 deque (头在左), 占用情况是扁平的 bytearray,
+    撞自己的判断是 O(1)。空格子放在 free 列表里, free_pos 记录每个格子在列表中的位置,
+    占用/释放都是交换删除, 放食物直接从 free 里抽, 蛇再长也不用反复重试。
+    """
+    def __init__(self, width=GRID_WIDTH, height=GRID_HEIGHT, rng=None):
+        self.width = width
+        self.height = height
+        self.rng = rng if rng is not None else random.Random()
+        self.reset()
+
+    def reset(self):
+        size = self.width * self.height
+        self.occupied = bytearray(size)
+        self.free = list(range(size))
+        self.free_pos = list(range(size))
+        self.body = deque()
+        y = self.height // 2
+        for x in (self.width // 4, self.width // 4 - 1, self.width // 4 - 2):
+            cell = y * self.width + x
+            self.body.append(cell)
+            self._occupy(cell)
+        self.direction = RIGHT
+        self.turns = deque(maxlen=3)  # 两次移动之间按下的方向键, 依次生效
+        self.score = 0
+        self.tick = 0
+        self.alive = True
+        self.won = False
+        self.food = None
+        self.changed = set()  # 上次 take_changed 之后内容变化的格子
+        self.place_food()
+
+    def _occupy(self, cell):
+        # 与 free 的最后一个元素交换后删除
+        i = self.free_pos[cell]
+        last = self.free.pop()
+        if last != cell:
+            self.free[i] = last
+            self.free_pos[last] = i
+        self.free_pos[cell] = -1
+        self.occupied[cell] = 1
+
+    def _release(self, cell):
+        self.free_pos[cell] = len(self.free)
+        self.free.append(cell)
+        self.occupied[cell] = 0
+
+    def place_food(self):
+        """在空格子里随机放食物, 没有空格子时就是赢了"""
+        if not self.free:
+            self.food = None
+            self.alive = False
+            self.won = True
+            return
+        self.food = self.free[self.rng.randrange(len(self.free))]
+        self.changed.add(self.food)
+
+    @property
+    def head(self):
+        return self.body[0]
+
+    def cell_xy(self, cell):
+        return cell % self.width, cell // self.width
+
+    def turn(self, direction):
+        """记下一次转向, 与上一个方向相反的输入忽略"""
+        last = self.turns[-1] if self.turns else self.direction
+        if direction != last and direction != (-last[0], -last[1]):
+            self.turns.append(direction)
+
+    def move_every(self):
+        return max(MIN_MOVE_EVERY, MOVE_EVERY - self.score // 5)
+
+    def step(self):
+        """推进一个 tick, 死亡时返回 False"""
+        if not self.alive:
+            return False
+        self.tick += 1
+        if self.tick % self.move_every():
+            return True
+        return self.move()
+
+    def move(self):
+        """走一格"""
+        if self.turns:
+            self.direction = self.turns.popleft()
+        x, y = self.cell_xy(self.head)
+        x += self.direction[0]
+        y += self.direction[1]
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            self.alive = False
+            return False
+
+        cell = y * self.width + x
+        eating = cell == self.food
+        tail = self.body[-1]
+        # 不吃食物时尾巴同时离开, 头可以跟进尾巴原来的格子
+        if self.occupied[cell] and (eating or cell != tail):
+            self.alive = False
+            return False
+
+        if not eating:
+            self.body.pop()
+            self._release(tail)
+            self.changed.add(tail)
+        self.changed.add(self.head)  # 旧的头变成身体
+        self.body.appendleft(cell)
+        self._occupy(cell)
+        self.changed.add(cell)
+
+        if eating:
+            self.score += 1
+            self.place_food()
+        return self.alive
+
+    def take_changed(self):
+        """取出并清空变化过的格子"""
+        changed = self.changed
+        self.changed = set()
+        return changed
+
+    def run(self, max_ticks, autopilot=None):
+        """无窗口跑一局, 返回分数"""
+        for _ in range(max_ticks):
+            if autopilot:
+                autopilot.act(self)
+            if not self.step():
+                break
+        return self.score
+
+
+class Autopilot:
+    """简单的贪心: 在不会立刻撞死的方向里选离食物最近的, 用于基准和批量跑局"""
+    def act(self, sim):
+        if sim.turns or sim.food is None:
+            return
+        hx, hy = sim.cell_xy(sim.head)
+        fx, fy = sim.cell_xy(sim.food)
+        tail = sim.body[-1]
+        best = None
+        for d in (sim.direction, (sim.direction[1], sim.direction[0]),
+                  (-sim.direction[1], -sim.direction[0])):
+            x, y = hx + d[0], hy + d[1]
+            if not (0 <= x < sim.width and 0 <= y < sim.height):
+                continue
+            cell = y * sim.width + x
+            if sim.occupied[cell] and cell != tail:
+                continue
+            distance = abs(fx - x) + abs(fy - y)
+            if best is None or distance < best[0]:
+                best = (distance, d)
+        if best and best[1] != sim.direction:
+            sim.turn(best[1])
+
+
+class Button:
+    def __init__(self, x, y, width, height, text, color, hover_color, text_color=WHITE):
+        self.rect = pygame.Rect(x, y, width, height)
+        self.text = text
+        self.color = color
+        self.hover_color = hover_color
+        self.text_color = text_color
+        self.is_hovered = False
+        self.font = load_font(None, 36)
+
+    def draw(self, screen):
+        color = self.hover_color if self.is_hovered else self.color
+        pygame.draw.rect(screen, color, self.rect, border_radius=10)
+        pygame.draw.rect(screen, WHITE, self.rect, 3, border_radius=10)
+        text_surface = render_text(self.font, self.text, self.text_color)
+        screen.blit(text_surface, text_surface.get_rect(center=self.rect.center))
+
+    def check_hover(self, pos):
+        self.is_hovered = self.rect.collidepoint(pos)
+        return self.is_hovered
+
+    def is_clicked(self, pos, clicked):
+        return clicked and self.rect.collidepoint(pos)
+
+
+class SnakeGame:
+    """
+    游戏进行中只在开局 (或 HUD 开关后) 整屏画一次棋盘,
+    之后每步只重画变化的格子 (新的头、旧的头、离开的尾巴、新食物) 并只提交这些矩形。
+    因此脏矩形渲染默认开启; dirty_rects=False 时每帧整屏重画, 用于对照。
+    """
+    def __init__(self, fps=FPS, dirty_rects=True, profile=None, rng=None, pacing="tick"):
+        # 帧节奏: 默认 clock.tick, 见 LDKpark.pacing
+        self.pacer = FramePacer(fps, pacing)
+        self.screen = ensure_display((SCREEN_WIDTH, SCREEN_HEIGHT), "Snake", self.pacer.vsync)
+        self.clock = self.pacer.clock
+        self.fps = fps
+        self.renderer = DirtyRenderer(self.screen, dirty_rects)
+        self.profile_path = profile
+        self.profiler = FrameProfiler(bool(profile), self.entity_counts)
+        self.timestep = FixedTimestep()
+
+        self.state = "HOME"
+        self.high_score = 0
+        self.round = 0  # 每开一局加一, 用作静态画面的 key
+        self.sim = SnakeSim(rng=rng)
+        self.drawn_score = None
+
+        self.font_large = load_font(None, 72)
+        self.font_medium = load_font(None, 48)
+        self.font_small = load_font(None, 32)
+        self.setup_buttons()
+
+    def setup_buttons(self):
+        center_x = SCREEN_WIDTH // 2
+        self.play_button = Button(center_x - 80, 280, 160, 50, "PLAY",
+                                  (76, 175, 80), (129, 199, 132))
+        self.restart_button = Button(center_x - 80, 300, 160, 50, "RESTART",
+                                     (255, 152, 0), (255, 183, 77))
+        self.home_button = Button(center_x - 80, 370, 160, 50, "HOME",
+                                  (156, 39, 176), (186, 104, 200))
+
+    @property
+    def score(self):
+        return self.sim.score
+
+    def reset_game(self):
+        self.sim.reset()
+        self.round += 1
+        self.timestep.reset()
+
+    def start_game(self):
+        self.state = "PLAYING"
+        self.reset_game()
+
+    def game_over(self):
+        self.state = "GAME_OVER"
+        if self.sim.score > self.high_score:
+            self.high_score = self.sim.score
+
+    def cell_rect(self, cell):
+        x, y = self.sim.cell_xy(cell)
+        return pygame.Rect(x * CELL_SIZE, HUD_HEIGHT + y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+
+    def draw_cell(self, cell):
+        """按格子当前的内容重画一格"""
+        sim = self.sim
+        rect = self.cell_rect(cell)
+        pygame.draw.rect(self.screen, BOARD_COLOR, rect)
+        pygame.draw.rect(self.screen, GRID_COLOR, rect, 1)
+        if sim.occupied[cell]:
+            color = HEAD_COLOR if cell == sim.head else BODY_COLOR
+            pygame.draw.rect(self.screen, color, rect.inflate(-4, -4), border_radius=5)
+        elif cell == sim.food:
+            pygame.draw.circle(self.screen, FOOD_COLOR, rect.center, CELL_SIZE // 2 - 3)
+        return rect
+
+    def draw_board(self):
+        self.screen.blit(assets.get("snake.board", self._build_board), (0, HUD_HEIGHT))
+        for cell in self.sim.body:
+            self.draw_cell(cell)
+        if self.sim.food is not None:
+            self.draw_cell(self.sim.food)
+
+    def _build_board(self):
+        board = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT - HUD_HEIGHT))
+        board.fill(BOARD_COLOR)
+        for x in range(GRID_WIDTH):
+            for y in range(GRID_HEIGHT):
+                pygame.draw.rect(board, GRID_COLOR, (x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE), 1)
+        return board
+
+    def draw_hud(self):
+        rect = pygame.Rect(0, 0, SCREEN_WIDTH, HUD_HEIGHT)
+        pygame.draw.rect(self.screen, HUD_COLOR, rect)
+        score = render_text(self.font_small, f"Score: {self.sim.score}", WHITE)
+        self.screen.blit(score, (15, 12))
+        best = render_text(self.font_small, f"Best: {self.high_score}", WHITE)
+        self.screen.blit(best, (SCREEN_WIDTH - best.get_width() - 15, 12))
+        self.drawn_score = self.sim.score
+        return rect
+
+    def draw_game_screen(self):
+        renderer = self.renderer
+        if renderer.static(("PLAYING", self.round)):
+            self.sim.take_changed()
+            self.draw_board()
+            self.draw_hud()
+            return
+        # 只重画本帧变化的格子
+        for cell in self.sim.take_changed():
+            renderer.mark(self.draw_cell(cell))
+        if self.drawn_score != self.sim.score:
+            renderer.mark(self.draw_hud())
+
+    def draw_home_screen(self):
+        self.screen.fill(BOARD_COLOR)
+        title = render_text(self.font_large, "SNAKE", HEAD_COLOR)
+        self.screen.blit(title, title.get_rect(center=(SCREEN_WIDTH // 2, 150)))
+        hint = render_text(self.font_small, "Arrows / WASD to move", WHITE)
+        self.screen.blit(hint, hint.get_rect(center=(SCREEN_WIDTH // 2, 220)))
+        self.play_button.draw(self.screen)
+        if self.high_score > 0:
+            best = render_text(self.font_small, f"Best: {self.high_score}", WHITE)
+            self.screen.blit(best, best.get_rect(center=(SCREEN_WIDTH // 2, 380)))
+
+    def draw_game_over_screen(self):
+        self.draw_board()
+        self.draw_hud()
+        self.screen.blit(assets.overlay((SCREEN_WIDTH, SCREEN_HEIGHT), (*BLACK, 128)), (0, 0))
+        title = render_text(self.font_large, "YOU WIN" if self.sim.won else "GAME OVER", RED)
+        self.screen.blit(title, title.get_rect(center=(SCREEN_WIDTH // 2, 170)))
+        score = render_text(self.font_medium, f"Score: {self.sim.score}", WHITE)
+        self.screen.blit(score, score.get_rect(center=(SCREEN_WIDTH // 2, 240)))
+        self.restart_button.draw(self.screen)
+        self.home_button.draw(self.screen)
+
+    def draw(self):
+        renderer = self.renderer
+        if self.state == "HOME":
+            if renderer.static(("HOME", self.high_score, self.play_button.is_hovered)):
+                self.draw_home_screen()
+        elif self.state == "PLAYING":
+            self.draw_game_screen()
+        elif self.state == "GAME_OVER":
+            if renderer.static(("GAME_OVER", self.round, self.restart_button.is_hovered,
+                                self.home_button.is_hovered)):
+                self.draw_game_over_screen()
+
+        renderer.overlay("hud", lambda: self.profiler.draw_hud(self.screen))
+        renderer.present()
+        self.profiler.latency.presented()
+
+    def entity_counts(self):
+        return {"length": len(self.sim.body), "free": len(self.sim.free)}
+
+    def handle_events(self, events=None):
+        mouse_pos = pygame.mouse.get_pos()
+        clicked = False
+
+        for event in pygame.event.get() if events is None else events:
+            if event.type == pygame.QUIT:
+                return False
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                clicked = True
+            if event.type == pygame.KEYDOWN:
+                self.profiler.latency.input(event)
+                if event.key == pygame.K_F3:
+                    self.profiler.toggle()
+                    self.renderer.invalidate()
+                elif self.state == "PLAYING":
+                    if event.key in KEY_DIRECTIONS:
+                        self.sim.turn(KEY_DIRECTIONS[event.key])
+                elif event.key in (pygame.K_SPACE, pygame.K_RETURN):
+                    self.start_game()
+
+        if self.state == "HOME":
+            self.play_button.check_hover(mouse_pos)
+            if self.play_button.is_clicked(mouse_pos, clicked):
+                self.start_game()
+        elif self.state == "GAME_OVER":
+            self.restart_button.check_hover(mouse_pos)
+            self.home_button.check_hover(mouse_pos)
+            if self.restart_button.is_clicked(mouse_pos, clicked):
+                self.start_game()
+            elif self.home_button.is_clicked(mouse_pos, clicked):
+                self.state = "HOME"
+        return True
+
+    def update(self):
+        if self.state == "PLAYING" and not self.sim.step():
+            self.game_over()
+
+    # --- 场景接口, 独立运行和 arcade 共用 ---
+
+    def enter(self):
+        """切入: 复用当前窗口, 整屏重绘, 丢弃离开期间的时间"""
+        self.screen = self.renderer.screen = ensure_display((SCREEN_WIDTH, SCREEN_HEIGHT), "Snake", self.pacer.vsync)
+        self.pacer.reset()
+        self.renderer.invalidate()
+        self.timestep.reset()
+
+    def exit(self):
+        pass
+
+    def step(self, frame_time, events=None):
+        """
+        处理输入并推进一帧的逻辑, 收到退出请求时返回 False。
+        events 为本帧的事件 (默认从队列取), 见 LDKpark.arcade
+        """
+        running = self.handle_events(events)
+        self.profiler.mark("events")
+        steps = 0
+        if running and self.state == "PLAYING":
+            steps = self.timestep.advance(frame_time)
+            for _ in range(steps):
+                self.update()
+                if self.state != "PLAYING":
+                    break
+        # 转向要等到下一次走格才反映在画面上
+        if (steps and not self.sim.turns) or self.state != "PLAYING":
+            self.profiler.latency.applied()
+        self.profiler.mark("update")
+        return running
+
+    def run(self, on_frame=None):
+        """on_frame(game) 在每帧末尾调用, 返回 False 时退出循环 (见 LDKpark.launcher)"""
+        frame_time = 0
+        profiler = self.profiler
+        self.enter()
+        while True:
+            profiler.begin()
+            if not self.step(frame_time):
+                break
+            self.draw()
+            profiler.mark("draw")
+            frame_time = self.pacer.tick()
+            profiler.end()
+            if on_frame and not on_frame(self):
+                break
+        self.exit()
+
+        if self.profile_path:
+            profiler.export(self.profile_path)
+        pygame.quit()
+
+    async def run_async(self, on_frame=None):
+        """run() 的协程版本, 每帧之间把剩余时间让给 asyncio 事件循环"""
+        await run_scene(self, self.fps, on_frame)
+        if self.profile_path:
+            self.profiler.export(self.profile_path)
+        pygame.quit()
+
+# --- 模块接口 ---
+_game_instance = None
+
+def run(fps=FPS, dirty_rects=True, profile=None, pacing="tick", on_frame=None):
+    global _game_instance
+    _game_instance = SnakeGame(fps, dirty_rects, profile, pacing=pacing)
+    _game_instance.run(on_frame)
+
+async def run_async(fps=FPS, dirty_rects=True, profile=None, pacing="tick", on_frame=None):
+    """run() 的协程版本, 可以和其他协程共用一个 asyncio 事件循环"""
+    global _game_instance
+    _game_instance = SnakeGame(fps, dirty_rects, profile, pacing=pacing)
+    await _game_instance.run_async(on_frame)
+
+def close():
+    global _game_instance
+    if _game_instance:
+        pygame.quit()
+        _game_instance = None
@@ -5,6 +5,9 @@ import threading
 import time
 import os
 
+from ..aio import pump_tk
+from ..perf import InputLatency
+
 # 尝试导入音频播放库
 # 为了兼容性，我们尝试导入 pygame (需要安装)，如果没有则尝试使用系统命令播放
 try:
@@ -37,8 +40,10 @@ class TetrisApp:
         'L': [(0, 2), (1, 0), (1, 1), (1, 2)],
     }
 
-    def __init__(self, root):
+    def __init__(self, root, latency=False):
         self.root = root
+        # 按键到画面重绘的延迟, 只在 latency=True 时记录
+        self.latency = InputLatency(latency)
         self.root.title("俄罗斯方块 - Tetris")
         
         # 游戏常量
@@ -138,6 +143,7 @@ class TetrisApp:
         if not self.is_running or self.game_over:
             return
 
+        self.latency.input()
         key = event.keysym.lower()
         
         if key == self.keys['left']:
@@ -152,6 +158,11 @@ class TetrisApp:
             self.hard_drop()
         elif key == self.keys['pause']:
             self.toggle_pause()
+        
+        if self.latency.enabled:
+            # 画布的重绘排在空闲回调里, 之后注册的回调在重绘完成后执行
+            self.latency.applied()
+            self.root.after_idle(self.latency.presented)
 
     def start_game(self):
         """开始/重新开始游戏"""
@@ -462,21 +473,53 @@ class TetrisApp:
 # --- 模块接口函数 ---
 _root = None
 _app = None
+POLL_MS = 50  # on_frame 的调用间隔
 
-def run():
-    """启动游戏"""
+def _open(latency=False):
+    """创建窗口; 窗口已存在时把它提到前台并返回 False"""
     global _root, _app
     if _root is not None:
         try:
             _root.lift()
-            return
+            return False
         except tk.TclError:
             pass
             
     _root = tk.Tk()
-    _app = TetrisApp(_root)
+    _app = TetrisApp(_root, latency)
+    return True
+
+def run(on_frame=None, latency=False):
+    """
+    启动游戏
+    on_frame: on_frame(app) 每 POLL_MS 毫秒调用一次, 返回 False 时关闭窗口 (见 LDKpark.launcher)
+    latency: 记录按键到画面重绘的延迟, 用 latency_stats() 查看
+    """
+    if not _open(latency):
+        return
+    if on_frame:
+        _poll(on_frame)
     _root.mainloop()
 
+async def run_async(on_frame=None, latency=False):
+    """run() 的协程版本: 用 root.update() 代替 mainloop, 不阻塞 asyncio 事件循环"""
+    if not _open(latency):
+        return
+    await pump_tk(_root, _app, on_frame)
+    close()
+
+def _poll(on_frame):
+    if _root is None:
+        return
+    if on_frame(_app):
+        _root.after(POLL_MS, _poll, on_frame)
+    else:
+        close()
+
+def latency_stats():
+    """按键到画面重绘的延迟 p50/p95/p99 (毫秒), 需要以 latency=True 启动"""
+    return _app.latency.stats() if _app else None
+
 def close():
     """关闭游戏"""
     global _root
@@ -0,0 +1,137 @@
+"""
+循环垃圾回收的暂停控制与统计。
+
+射击、跑酷这类游戏每帧都在创建粒子、Rect 和 Surface, 分代 GC 会在任意一帧
+触发, 造成 5~15 ms 的卡顿。启用 GCController 后:
+
+- 进入游戏时 (资源已经加载完) 做一次完整回收并 gc.freeze(), 之后的回收不再扫描这些对象;
+- 关闭自动回收, 只在一帧画完后剩余时间足够 (idle_budget) 时回收年轻代,
+  较老的代留到两局之间 (between_rounds, 由 reset_game 调用) 再回收;
+- 安全兜底: 待回收的新对象超过 max_pending 时立即回收年轻代,
+  进程内存超过 memory_limit_mb 时立即做一次完整回收, 不管有没有空闲时间。
+
+未启用时不改变 GC 的任何设置, 只通过 gc.callbacks 记录每次回收的暂停时间,
+FrameProfiler 会把它们放进 stats()["gc"]、HUD 和导出的 trace。
+"""
+import gc
+import os
+import time
+from collections import deque
+
+from .perf import summarize
+
+IDLE_BUDGET = 0.002     # 秒, 剩余帧时间至少这么多才在空闲时回收
+MAX_PENDING = 20000     # 待回收的新容器对象上限, 超过时强制回收
+RSS_CHECK_EVERY = 30    # 每隔多少帧检查一次进程内存
+PAUSE_WINDOW = 600      # 保留最近多少次回收的记录
+
+
+def rss_bytes():
+    """当前进程的常驻内存 (字节), 只支持 Linux, 其他平台返回 None"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class GCController:
+    def __init__(self, enabled=False, idle_budget=IDLE_BUDGET, max_pending=MAX_PENDING,
+                 memory_limit_mb=None):
+        self.enabled = enabled
+        self.idle_budget = idle_budget
+        self.max_pending = max_pending
+        self.memory_limit = memory_limit_mb * 1024 * 1024 if memory_limit_mb else None
+        self.installed = False
+        self.was_enabled = True
+        self.frame_start = time.perf_counter()
+        self.frames = 0
+        self.pause_start = 0.0
+        self.pauses = deque(maxlen=PAUSE_WINDOW)  # (开始时间, 秒, 代, 回收对象数)
+        self.idle_collections = 0
+        self.round_collections = 0
+        self.forced_collections = 0
+
+    def _callback(self, phase, info):
+        if phase == "start":
+            self.pause_start = time.perf_counter()
+        else:
+            now = time.perf_counter()
+            self.pauses.append((self.pause_start, now - self.pause_start,
+                                info["generation"], info["collected"]))
+
+    def enter(self):
+        """游戏开始 (资源加载完成后) 调用: 注册统计回调, 启用时冻结现有对象并接管回收"""
+        if not self.installed:
+            gc.callbacks.append(self._callback)
+            self.installed = True
+        if self.enabled:
+            self.was_enabled = gc.isenabled()
+            gc.collect()
+            gc.freeze()
+            gc.disable()
+        self.frame_start = time.perf_counter()
+
+    def exit(self):
+        """游戏结束或切走时调用: 恢复自动回收, 解冻对象, 移除回调"""
+        if self.installed:
+            gc.callbacks.remove(self._callback)
+            self.installed = False
+        if self.enabled:
+            gc.unfreeze()
+            if self.was_enabled:
+                gc.enable()
+
+    def begin(self):
+        """一帧开始"""
+        self.frame_start = time.perf_counter()
+
+    def idle(self, period):
+        """
+        一帧画完、等待下一帧之前调用, period 为帧周期 (秒)。
+        剩余时间足够时回收年轻代; 超过上限时不管剩余时间立即回收
+        """
+        if not self.enabled:
+            return
+        self.frames += 1
+        pending, gen0_runs, _ = gc.get_count()
+        if self._over_memory():
+            # 自动回收已关闭, 老一代的垃圾只有完整回收才能释放
+            gc.collect()
+            self.forced_collections += 1
+            return
+        if pending > self.max_pending:
+            gc.collect(1)
+            self.forced_collections += 1
+            return
+        threshold0, threshold1, _ = gc.get_threshold()
+        if pending < threshold0:
+            return
+        if period - (time.perf_counter() - self.frame_start) < self.idle_budget:
+            return
+        gc.collect(1 if gen0_runs >= threshold1 else 0)
+        self.idle_collections += 1
+
+    def _over_memory(self):
+        if not self.memory_limit or self.frames % RSS_CHECK_EVERY:
+            return False
+        rss = rss_bytes()
+        return rss is not None and rss > self.memory_limit
+
+    def between_rounds(self):
+        """两局之间 (reset_game) 调用: 启用时做一次完整回收"""
+        if self.enabled:
+            gc.collect()
+            self.round_collections += 1
+
+    def stats(self):
+        """最近的回收次数 (按代)、暂停时间 p50/p95/p99/max (毫秒) 与各类回收的次数"""
+        durations = [p[1] for p in self.pauses]
+        result = summarize(durations)
+        result["max_ms"] = max(durations) * 1000 if durations else 0.0
+        result["count"] = len(durations)
+        result["by_generation"] = {g: sum(1 for p in self.pauses if p[2] == g) for g in range(3)}
+        result["idle"] = self.idle_collections
+        result["between_rounds"] = self.round_collections
+        result["forced"] = self.forced_collections
+        return result
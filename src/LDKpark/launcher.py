@@ -0,0 +1,122 @@
+"""
+在子进程里启动游戏, 返回可以在本进程里控制的句柄。
+
+各游戏的 run() 都会阻塞 (Tk 的 mainloop 或 pygame 的 while 循环),
+同一线程里没有机会调用 close()。start() 用 spawn 方式开一个子进程跑游戏:
+控制命令走管道, 帧率、分数等统计写在共享内存里, 读取时不需要子进程配合。
+游戏卡死时 close() 超时后直接结束子进程, 不影响宿主进程。
+
+    from LDKpark import start
+    handle = start("snake", fps=30)
+    handle.stats()   # {"fps": 30.0, "score": 0, "frames": 12, "idle_sec": 0.01, ...}
+    handle.close()
+"""
+import importlib
+import math
+import multiprocessing
+import time
+
+GAMES = ("minesweeper", "tetris", "flappybird", "runner", "snake", "shooter")
+STAT_FIELDS = ("fps", "score", "frames", "updated")
+CLOSE_TIMEOUT = 3.0  # 秒, 等待游戏自己退出的时间, 超时后结束子进程
+
+
+def _child_main(game, opts, conn, shared):
+    """子进程入口: 跑游戏, 每帧写统计并检查控制命令"""
+    module = importlib.import_module("LDKpark.games100." + game)
+    frames = [0]
+
+    def on_frame(instance):
+        frames[0] += 1
+        clock = getattr(instance, "clock", None)  # Tk 游戏没有帧循环, fps 留空
+        score = getattr(instance, "score", None)
+        shared[0] = clock.get_fps() if clock else math.nan
+        shared[1] = math.nan if score is None else score
+        shared[2] = frames[0]
+        shared[3] = time.time()
+        try:
+            if conn.poll():
+                return conn.recv() != "close"
+        except (EOFError, OSError):
+            return False  # 父进程已经退出
+        return True
+
+    try:
+        module.run(on_frame=on_frame, **opts)
+    finally:
+        conn.close()
+
+
+class GameHandle:
+    """start() 返回的句柄"""
+    def __init__(self, game, process, conn, shared):
+        self.game = game
+        self.process = process
+        self.conn = conn
+        self.shared = shared
+
+    @property
+    def pid(self):
+        return self.process.pid
+
+    def is_alive(self):
+        return self.process.is_alive()
+
+    def wait(self, timeout=None):
+        """等待游戏退出, 返回退出码; 超时仍在运行时返回 None"""
+        self.process.join(timeout)
+        return self.process.exitcode
+
+    def stats(self):
+        """
+        最近一帧的统计: fps, score (游戏没有分数时为 None), frames,
+        idle_sec (距最近一帧的秒数, 一直变大说明游戏卡住了), alive, exitcode
+        """
+        fps, score, frames, updated = self.shared[:]
+        return {
+            "fps": None if math.isnan(fps) else fps,
+            "score": None if math.isnan(score) else score,
+            "frames": int(frames),
+            "idle_sec": time.time() - updated if updated else None,
+            "alive": self.process.is_alive(),
+            "exitcode": self.process.exitcode,
+        }
+
+    def close(self, timeout=CLOSE_TIMEOUT):
+        """请求游戏退出, timeout 秒内没有退出就结束子进程, 返回退出码"""
+        if self.process.is_alive():
+            try:
+                self.conn.send("close")
+            except (BrokenPipeError, OSError):
+                pass
+            self.process.join(timeout)
+        if self.process.is_alive():
+            self.kill()
+        self.conn.close()
+        return self.process.exitcode
+
+    def kill(self):
+        """立即结束子进程"""
+        self.process.terminate()
+        self.process.join(1.0)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+
+
+def start(game, **opts):
+    """
+    在子进程里启动游戏, 立即返回 GameHandle。
+    opts 原样传给游戏模块的 run(), 例如 start("minesweeper", difficulty="中级")
+    """
+    if game not in GAMES:
+        raise ValueError("未知的游戏: %s" % game)
+    # spawn 而不是 fork: 父进程可能已经初始化了 SDL 或 Tk
+    ctx = multiprocessing.get_context("spawn")
+    parent_conn, child_conn = ctx.Pipe()
+    shared = ctx.Array("d", [math.nan, math.nan, 0.0, 0.0], lock=False)
+    process = ctx.Process(target=_child_main, args=(game, opts, child_conn, shared),
+                          name="LDKpark-" + game, daemon=True)
+    process.start()
+    child_conn.close()
+    return GameHandle(game, process, parent_conn, shared)
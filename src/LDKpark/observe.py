@@ -0,0 +1,185 @@
+"""
+像素观测。
+
+训练基于画面的智能体需要把每一帧当作数组, pygame.surfarray.array3d 每帧要复制一整屏。
+PixelObserver 改为:
+
+- 把游戏画到 32 位的离屏 Surface 上 (不提交到窗口), 直接引用它的像素, 不复制:
+  frame() 是 pixels3d 的 RGB 视图, pixels() 是通过缓冲区协议拿到的内存原样的
+  (高, 宽, 4) 连续字节视图 (通道顺序见 byte_order);
+- 可选的处理阶段都是写入预分配缓冲区的 NumPy 运算: downsample (k×k 均值池化)、
+  grayscale (ITU-R 601 亮度, 整数权重 77/150/29)、stack (最近几帧按时间顺序叠在一起)。
+  叠帧用两倍长度的环形缓冲区, 每帧写两份, 按时间顺序的结果也是视图。
+
+处理阶段从连续字节视图读取: pixels3d 的通道步长是 -1, NumPy 在它上面做运算很慢。
+池化先把每 k 行加成 uint16, 再把每个像素的 4 个 uint16 当成一个 uint64 做列方向的加法
+(k ≤ 16 时每个通道的和不超过 65535, 不会进位到相邻通道)。
+
+视图存在时 Surface 处于锁定状态, 不能往上画。observe() / frame() 的结果
+只在下一次绘制之前有效, 需要保留时请自行 copy()。需要 numpy, dummy 驱动下同样可用。
+
+    game = runner.RunnerGame()
+    game.enter()
+    observer = PixelObserver(game, grayscale=True, downsample=4, stack=4)
+    while training:
+        game.update_game()
+        obs = observer.step(game.draw)   # (4, 125, 225) uint8
+"""
+import sys
+
+import pygame
+
+# NumPy 为可选依赖, 像素观测需要它
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+LUMA = (77, 150, 29)  # R, G, B 的亮度权重, 和为 256
+MAX_DOWNSAMPLE = 16   # uint16 通道和不溢出的最大池化边长
+
+
+class PixelObserver:
+    def __init__(self, game, grayscale=False, downsample=1, stack=1):
+        """在 game.enter() 之后创建: enter 会把 game.screen 换回窗口"""
+        if not HAS_NUMPY:
+            raise ImportError("像素观测需要 numpy, 请运行: pip install numpy")
+        if not 1 <= downsample <= MAX_DOWNSAMPLE:
+            raise ValueError("downsample 需要在 1 到 %d 之间" % MAX_DOWNSAMPLE)
+        self.game = game
+        self.display = game.screen
+        width, height = self.display.get_size()
+        if self.display.get_bitsize() == 32:
+            self.surface = pygame.Surface((width, height), 0, self.display)
+        else:
+            self.surface = pygame.Surface((width, height), 0, 32)
+        # R, G, B 在每个像素 4 个字节中的位置
+        shifts = self.surface.get_shifts()[:3]
+        if sys.byteorder == "little":
+            self.byte_order = tuple(s // 8 for s in shifts)
+        else:
+            self.byte_order = tuple(3 - s // 8 for s in shifts)
+        self.grayscale = grayscale
+        self.downsample = downsample
+        self.stack = stack
+        self.view = None
+        self.buffer = None
+
+        # 不能整除 downsample 时裁掉右边和下边的余数
+        k = downsample
+        self.height, self.width = height // k, width // k
+        frame_shape = (self.height, self.width) if grayscale else (self.height, self.width, 3)
+        self.shape = frame_shape if stack == 1 else (stack,) + frame_shape
+        self.processed = grayscale or k > 1 or stack > 1
+        if k > 1:
+            self.rows = np.zeros((self.height, self.width * k, 4), np.uint16)
+            self.pooled = np.zeros((self.height, self.width, 4), np.uint16)
+            # 每个像素的 4 个 uint16 通道合成一个 uint64, 列方向一次加 4 个通道
+            self.rows_packed = self.rows.view(np.uint64)[:, :, 0]
+            self.pooled_packed = self.pooled.view(np.uint64)[:, :, 0]
+        if grayscale:
+            self.luma = np.zeros((self.height, self.width), np.uint32)
+            self.term = np.zeros((self.height, self.width), np.uint32)
+        self.out = np.zeros(frame_shape, np.uint8)
+        if stack > 1:
+            self.history = np.zeros((2 * stack,) + frame_shape, np.uint8)
+        self.index = 0
+        self.fresh = True
+        self.attach()
+
+    def attach(self):
+        """让游戏画到离屏 Surface, 不再提交到窗口"""
+        self.game.screen = self.game.renderer.screen = self.surface
+        self.game.renderer.offscreen = True
+        self.game.renderer.invalidate()
+
+    def detach(self):
+        """恢复画到窗口"""
+        self.release()
+        self.game.screen = self.game.renderer.screen = self.display
+        self.game.renderer.offscreen = False
+        self.game.renderer.invalidate()
+
+    def reset(self):
+        """新的一局: 下一帧填满整个叠帧缓冲区"""
+        self.index = 0
+        self.fresh = True
+
+    def frame(self):
+        """当前画面 RGB 顺序的 (高, 宽, 3) uint8 视图 (pixels3d), 不复制, 下一次绘制前有效"""
+        if self.view is None:
+            self.view = pygame.surfarray.pixels3d(self.surface).transpose(1, 0, 2)
+        return self.view
+
+    def pixels(self):
+        """当前画面内存原样的 (高, 宽, 4) uint8 连续视图, 通道位置见 byte_order"""
+        if self.buffer is None:
+            surface = self.surface
+            width, height = surface.get_size()
+            raw = np.frombuffer(surface.get_buffer(), np.uint8)
+            self.buffer = raw.reshape(height, surface.get_pitch())[:, :width * 4].reshape(height, width, 4)
+        return self.buffer
+
+    def release(self):
+        """放开视图, 解除 Surface 的锁定"""
+        self.view = None
+        self.buffer = None
+
+    def step(self, draw):
+        """放开上一帧的视图, 调用 draw() 画一帧, 返回观测"""
+        self.release()
+        draw()
+        return self.observe()
+
+    def observe(self):
+        """按配置的阶段处理当前画面, 返回形状为 self.shape 的 uint8 数组"""
+        if not self.processed:
+            return self.frame()
+        source = self.pixels()
+        k = self.downsample
+        if k > 1:
+            rows = self.rows
+            h, w = self.height * k, self.width * k
+            np.add(source[0:h:k, :w], source[1:h:k, :w], out=rows, dtype=np.uint16)
+            for dy in range(2, k):
+                np.add(rows, source[dy:h:k, :w], out=rows, dtype=np.uint16)
+            packed = self.rows_packed
+            pooled = self.pooled_packed
+            np.add(packed[:, 0::k], packed[:, 1::k], out=pooled)
+            for dx in range(2, k):
+                np.add(pooled, packed[:, dx::k], out=pooled)
+            source = self.pooled
+        area = k * k
+
+        if self.grayscale:
+            luma, term = self.luma, self.term
+            (r, g, b), (wr, wg, wb) = self.byte_order, LUMA
+            np.multiply(source[..., r], wr, out=luma, dtype=np.uint32)
+            np.multiply(source[..., g], wg, out=term, dtype=np.uint32)
+            np.add(luma, term, out=luma)
+            np.multiply(source[..., b], wb, out=term, dtype=np.uint32)
+            np.add(luma, term, out=luma)
+            np.floor_divide(luma, 256 * area, out=luma)
+            np.copyto(self.out, luma, casting="unsafe")
+        else:
+            for channel, offset in enumerate(self.byte_order):
+                if area > 1:
+                    np.floor_divide(source[..., offset], area, out=self.out[..., channel], casting="unsafe")
+                else:
+                    np.copyto(self.out[..., channel], source[..., offset])
+        self.release()  # 结果已经在缓冲区里, 不再需要锁住 Surface
+        if self.stack == 1:
+            return self.out
+
+        stack = self.stack
+        history = self.history
+        if self.fresh:
+            history[:] = self.out
+            self.fresh = False
+        i = self.index
+        history[i] = self.out
+        history[i + stack] = self.out
+        self.index = (i + 1) % stack
+        # 第 i+1 .. i+stack 格正好是从旧到新的最近 stack 帧
+        return history[i + 1:i + 1 + stack]
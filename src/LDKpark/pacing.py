@@ -0,0 +1,119 @@
+"""
+帧节奏控制。
+
+clock.tick(FPS) 按毫秒睡眠并且经常多睡, 60 FPS 实际在 16 ms 和 17 ms 之间交替,
+横向滚动的画面 (跑酷背景、Flappy 地面) 会一顿一顿的。FramePacer 提供几种策略:
+
+- "tick":       pygame.time.Clock.tick, 原来的行为 (默认)
+- "busy_loop":  Clock.tick_busy_loop, 整段等待都忙等, 最准但占满一个核
+- "sleep_spin": 按绝对截止时间安排每帧, 先 time.sleep 到截止前 SPIN_MARGIN,
+                再忙等剩下的一小段; 每帧多占约 SPIN_MARGIN 的 CPU,
+                静态画面 (脏矩形) 的空闲占用会明显上升, 适合需要平滑滚动时手动选择
+- "vsync":      用 set_mode(vsync=1) 创建窗口, 由 flip 等待垂直同步;
+                驱动不支持 (flip 立即返回) 时退回 sleep_spin
+
+每帧的间隔记入滚动窗口和直方图, stats() 给出均值、抖动 (标准差) 和分位数。
+"""
+import time
+from collections import deque
+
+from .perf import summarize
+
+STRATEGIES = ("tick", "busy_loop", "sleep_spin", "vsync")
+SPIN_MARGIN = 0.0015   # 秒, sleep_spin 在截止前改为忙等的时间
+HISTOGRAM_BIN = 0.25   # 毫秒, 直方图的桶宽
+WINDOW = 600
+
+
+class FramePacer:
+    def __init__(self, fps=60, strategy="tick", clock=None, window=WINDOW):
+        if strategy not in STRATEGIES:
+            raise ValueError("未知的帧节奏策略: %s" % strategy)
+        import pygame
+
+        self.fps = fps
+        self.period = 1.0 / fps
+        self.strategy = strategy
+        self.clock = clock or pygame.time.Clock()
+        self.deadline = None
+        self.last = None
+        self.intervals = deque(maxlen=window)
+        self.histogram = {}  # 桶 (毫秒) -> 帧数, 不限于滚动窗口
+
+    @property
+    def vsync(self):
+        """创建窗口时是否需要 vsync=1"""
+        return self.strategy == "vsync"
+
+    def reset(self):
+        """丢弃截止时间, 用于暂停或切换场景之后"""
+        self.deadline = None
+        self.last = None
+
+    def tick(self):
+        """等到下一帧开始, 返回与上一帧的间隔 (秒)"""
+        strategy = self.strategy
+        if strategy == "tick":
+            self.clock.tick(self.fps)
+        elif strategy == "busy_loop":
+            self.clock.tick_busy_loop(self.fps)
+        else:
+            self._wait(strategy == "vsync")
+            self.clock.tick()  # 不限帧率, 只让 clock.get_fps() 保持可用
+
+        now = time.perf_counter()
+        interval = now - self.last if self.last is not None else 0.0
+        self.last = now
+        if interval:
+            self._record(interval)
+        return interval
+
+    def _wait(self, vsync):
+        now = time.perf_counter()
+        if self.deadline is None:
+            self.deadline = now
+            return
+        self.deadline += self.period
+        if self.deadline < now - self.period:
+            self.deadline = now  # 落后一帧以上时重新排, 不连续补帧
+            return
+        if vsync and self.last is not None and now - self.last >= self.period - SPIN_MARGIN:
+            # flip 已经等过了垂直同步
+            self.deadline = now
+            return
+        remaining = self.deadline - now
+        if remaining > SPIN_MARGIN:
+            time.sleep(remaining - SPIN_MARGIN)
+        while time.perf_counter() < self.deadline:
+            pass
+
+    def _record(self, interval):
+        self.intervals.append(interval)
+        key = int(interval * 1000 / HISTOGRAM_BIN) * HISTOGRAM_BIN
+        self.histogram[key] = self.histogram.get(key, 0) + 1
+
+    def stats(self):
+        """最近 window 帧的间隔: 均值、抖动 (标准差)、与目标周期的最大偏差 (毫秒) 及分位数"""
+        intervals = self.intervals
+        result = summarize(intervals)
+        if intervals:
+            mean = sum(intervals) / len(intervals)
+            variance = sum((t - mean) ** 2 for t in intervals) / len(intervals)
+            result["mean_ms"] = mean * 1000
+            result["jitter_ms"] = variance ** 0.5 * 1000
+            result["max_error_ms"] = max(abs(t - self.period) for t in intervals) * 1000
+        else:
+            result["mean_ms"] = result["jitter_ms"] = result["max_error_ms"] = 0.0
+        result["strategy"] = self.strategy
+        return result
+
+    def format_histogram(self, width=40):
+        """文本直方图, 每行一个桶"""
+        if not self.histogram:
+            return ""
+        peak = max(self.histogram.values())
+        lines = []
+        for key in sorted(self.histogram):
+            count = self.histogram[key]
+            lines.append("%6.2f ms %6d %s" % (key, count, "#" * max(1, count * width // peak)))
+        return "\n".join(lines)
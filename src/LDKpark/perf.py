@@ -0,0 +1,266 @@
+"""
+帧分阶段计时。
+
+主循环在每个阶段结束时调用 mark(阶段名), 帧末调用 end(),
+得到每个阶段的高精度耗时以及滚动窗口内的 p50/p95/p99。
+F3 切换屏幕左上角的 HUD (FPS、各阶段耗时、实体数量);
+export 可以把记录的帧写成 JSON lines 或 Chrome trace (chrome://tracing, Perfetto)。
+启用时同时记录输入到画面的延迟 (InputLatency), 见 stats()["input_latency"];
+设置了 collector (gcpause.GCController) 时还包括 GC 暂停, 见 stats()["gc"];
+设置了 quality (quality.QualityGovernor) 时还包括画质档位的变化, 见 stats()["quality"]。
+
+未启用时 begin/mark/end 只做一次属性判断就返回, 开销可以忽略。
+
+    profiler = FrameProfiler(counter=lambda: {"enemies": len(enemies)})
+    while running:
+        profiler.begin()
+        handle_events(); profiler.mark("events")
+        update();        profiler.mark("update")
+        draw();          profiler.mark("draw")
+        clock.tick(60)
+        profiler.end()   # 剩余时间记为 "wait"
+"""
+import json
+import os
+import time
+from collections import deque
+
+WINDOW = 600          # 滚动统计的帧数
+TRACE_FRAMES = 36000  # 最多保留的逐帧记录 (60 FPS 下 10 分钟)
+HUD_REFRESH = 15      # HUD 每隔多少帧重新统计一次
+
+
+def percentile(sorted_values, p):
+    """已排序序列的百分位数 (最近秩法)"""
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, int(round(p / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[k]
+
+
+def summarize(values):
+    """秒为单位的耗时 -> 毫秒单位的 p50/p95/p99"""
+    ordered = sorted(values)
+    return {
+        "p50_ms": percentile(ordered, 50) * 1000,
+        "p95_ms": percentile(ordered, 95) * 1000,
+        "p99_ms": percentile(ordered, 99) * 1000,
+    }
+
+
+class InputLatency:
+    """
+    输入到画面的延迟。input(event) 在处理按键时调用, applied() 在游戏状态
+    已经反映了这些输入之后调用 (例如跑完一次模拟步), presented() 在提交画面
+    (flip / 脏矩形更新 / Tk 重绘) 之后调用, 把已生效的输入各记为一个样本。
+    事件带 SDL 时间戳 (event.timestamp, 毫秒, 部分 pygame 版本提供) 时,
+    事件在队列里等待的时间也算在内。
+    """
+    def __init__(self, enabled=False, window=WINDOW):
+        self.enabled = enabled
+        self.pending = []   # 已收到、还没生效的输入时间
+        self.applied_times = []
+        self.samples = deque(maxlen=window)
+
+    def input(self, event=None):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        stamp = getattr(event, "timestamp", None)
+        if stamp:
+            import pygame
+            now -= max(0, pygame.time.get_ticks() - stamp) / 1000.0
+        self.pending.append(now)
+
+    def applied(self):
+        if self.pending:
+            self.applied_times.extend(self.pending)
+            self.pending = []
+
+    def presented(self):
+        if self.applied_times:
+            now = time.perf_counter()
+            self.samples.extend(now - t for t in self.applied_times)
+            self.applied_times = []
+
+    def stats(self):
+        """最近 window 个输入的延迟 p50/p95/p99 (毫秒) 与样本数"""
+        result = summarize(self.samples)
+        result["count"] = len(self.samples)
+        return result
+
+    def reset(self):
+        self.pending = []
+        self.applied_times = []
+        self.samples.clear()
+
+
+class FrameProfiler:
+    def __init__(self, enabled=False, counter=None, window=WINDOW, trace_frames=TRACE_FRAMES):
+        self.enabled = enabled
+        self.latency = InputLatency(enabled, window)
+        self.collector = None   # gcpause.GCController, 由游戏设置
+        self.quality = None     # quality.QualityGovernor, 由游戏设置
+        self.counter = counter  # 返回 {名称: 数量} 的函数, 只在启用时调用
+        self.window = window
+        self.phases = {}        # 阶段名 -> 最近 window 帧的耗时
+        self.frames = deque(maxlen=window)
+        self.trace = deque(maxlen=trace_frames)
+        self.counts = {}
+        self.frame_start = 0.0
+        self.last = 0.0
+        self.current = []
+        self.hud_lines = []
+        self.hud_age = 0
+
+    def toggle(self):
+        """F3: 开关计时与 HUD"""
+        self.enabled = not self.enabled
+        self.latency.enabled = self.enabled
+        self.hud_age = HUD_REFRESH
+        return self.enabled
+
+    def begin(self):
+        if not self.enabled:
+            return
+        self.frame_start = self.last = time.perf_counter()
+        self.current = []
+
+    def mark(self, name):
+        """记录从上一个标记到现在的阶段耗时"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.current.append((name, self.last, now))
+        self.last = now
+
+    def end(self):
+        if not self.enabled or not self.current:
+            return
+        now = time.perf_counter()
+        self.current.append(("wait", self.last, now))
+        for name, start, stop in self.current:
+            samples = self.phases.get(name)
+            if samples is None:
+                samples = self.phases[name] = deque(maxlen=self.window)
+            samples.append(stop - start)
+        self.frames.append(now - self.frame_start)
+        if self.counter:
+            self.counts = self.counter()
+        self.trace.append((self.frame_start, self.current, self.counts))
+        self.hud_age += 1
+
+    def stats(self):
+        """滚动窗口内的 FPS、整帧与各阶段的 p50/p95/p99 (毫秒), 以及最近的实体数量"""
+        fps = len(self.frames) / sum(self.frames) if self.frames else 0.0
+        return {
+            "fps": fps,
+            "frame": summarize(self.frames),
+            "phases": {name: summarize(samples) for name, samples in self.phases.items()},
+            "counts": dict(self.counts),
+            "input_latency": self.latency.stats(),
+            "gc": self.collector.stats() if self.collector else None,
+            "quality": self.quality.stats() if self.quality else None,
+        }
+
+    def reset(self):
+        self.phases.clear()
+        self.frames.clear()
+        self.trace.clear()
+        self.latency.reset()
+
+    # --- HUD ---
+
+    def draw_hud(self, screen, font=None):
+        """在左上角绘制 HUD, 返回占用的矩形 (未启用时返回 None)"""
+        if not self.enabled:
+            return None
+        import pygame
+        from .text import load_font
+
+        if self.hud_age >= HUD_REFRESH or not self.hud_lines:
+            self.hud_age = 0
+            stats = self.stats()
+            lines = ["FPS %.1f  frame p50 %.2f p99 %.2f ms" % (
+                stats["fps"], stats["frame"]["p50_ms"], stats["frame"]["p99_ms"])]
+            for name, s in stats["phases"].items():
+                lines.append("%-7s %6.2f %6.2f %6.2f" % (name, s["p50_ms"], s["p95_ms"], s["p99_ms"]))
+            if stats["counts"]:
+                lines.append("  ".join("%s %d" % item for item in stats["counts"].items()))
+            latency = stats["input_latency"]
+            if latency["count"]:
+                lines.append("input   %6.2f %6.2f %6.2f  (%d)" % (
+                    latency["p50_ms"], latency["p95_ms"], latency["p99_ms"], latency["count"]))
+            pauses = stats["gc"]
+            if pauses and pauses["count"]:
+                lines.append("gc      %6.2f %6.2f max %.2f  (%d)" % (
+                    pauses["p50_ms"], pauses["p99_ms"], pauses["max_ms"], pauses["count"]))
+            quality = stats["quality"]
+            if quality and quality["enabled"]:
+                lines.append("quality %s  load %.2f  down %d up %d" % (
+                    quality["level"], quality["load"], quality["downgrades"], quality["upgrades"]))
+            font = font or load_font(None, 18)
+            self.hud_lines = [font.render(line, True, (255, 255, 255)) for line in lines]
+
+        width = max(s.get_width() for s in self.hud_lines) + 12
+        height = sum(s.get_height() for s in self.hud_lines) + 8
+        # 不透明底板: 脏矩形模式下直接覆盖上一次的 HUD
+        rect = pygame.Rect(4, 4, width, height)
+        screen.fill((20, 20, 20), rect)
+        y = rect.y + 4
+        for surface in self.hud_lines:
+            screen.blit(surface, (rect.x + 6, y))
+            y += surface.get_height()
+        return rect
+
+    # --- 导出 ---
+
+    def export_jsonl(self, path):
+        """每帧一行: 起始时间、各阶段耗时 (毫秒) 与实体数量"""
+        with open(path, "w", encoding="utf-8") as f:
+            for frame_start, phases, counts in self.trace:
+                record = {"t": frame_start,
+                          "phases": {name: (stop - start) * 1000 for name, start, stop in phases}}
+                if counts:
+                    record["counts"] = counts
+                f.write(json.dumps(record) + "\n")
+
+    def export_chrome_trace(self, path, name="frame"):
+        """Chrome trace-event 格式, 每帧与每个阶段是一个完整事件 (ph="X")"""
+        events = []
+        pid = os.getpid()
+        origin = self.trace[0][0] if self.trace else 0.0
+        for frame_start, phases, counts in self.trace:
+            frame_end = phases[-1][2]
+            events.append({"name": name, "ph": "X", "pid": pid, "tid": 1,
+                           "ts": (frame_start - origin) * 1e6,
+                           "dur": (frame_end - frame_start) * 1e6})
+            for phase, start, stop in phases:
+                events.append({"name": phase, "ph": "X", "pid": pid, "tid": 1,
+                               "ts": (start - origin) * 1e6, "dur": (stop - start) * 1e6})
+            if counts:
+                events.append({"name": "entities", "ph": "C", "pid": pid, "tid": 1,
+                               "ts": (frame_start - origin) * 1e6, "args": counts})
+        if self.collector:
+            # GC 暂停放在单独的一行 (tid 2)
+            for start, duration, generation, collected in self.collector.pauses:
+                if start >= origin:
+                    events.append({"name": "gc%d" % generation, "ph": "X", "pid": pid, "tid": 2,
+                                   "ts": (start - origin) * 1e6, "dur": duration * 1e6,
+                                   "args": {"collected": collected}})
+        if self.quality:
+            # 画质档位变化记为瞬时事件
+            for change in self.quality.changes:
+                if change["t"] >= origin:
+                    events.append({"name": "quality %s" % change["to"], "ph": "i", "s": "p",
+                                   "pid": pid, "tid": 1, "ts": (change["t"] - origin) * 1e6,
+                                   "args": {"from": change["from"], "load": change["load"]}})
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def export(self, path):
+        """按扩展名导出: .jsonl 为 JSON lines, 其他为 Chrome trace"""
+        if path.endswith(".jsonl"):
+            self.export_jsonl(path)
+        else:
+            self.export_chrome_trace(path)
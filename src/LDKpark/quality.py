@@ -0,0 +1,137 @@
+"""
+自适应画质。
+
+低配机器上射击游戏的大爆炸 (create_explosion 30 个粒子)、跑酷的尘土粒子
+都会让帧时间超出预算。QualityGovernor 统计每帧实际工作的时间 (不含 flip 和等待下一帧),
+滚动窗口的 p90 超过帧预算的 DOWNGRADE_AT 时降一档, 低于 UPGRADE_AT 且
+距上次变化已经 hold 帧时升一档:
+
+- 两个阈值之间留有间隔, 降档只需要一个窗口, 升档需要更长时间的余量;
+- 升档后很快又被迫降档, 说明上一档撑不住, 升档的等待时间翻倍 (最多 MAX_HOLD 帧)。
+
+每一档是一组设置 (LEVELS): 粒子数量比例、子弹光晕、背景层数和星星比例,
+游戏通过 governor.settings 或 count() 读取。每次变化记入 changes, stats() 给出
+当前档位、升降次数、最近的变化和窗口内的帧时间。未启用时始终是最高档。
+
+    governor = QualityGovernor(True, fps=60)
+    while running:
+        governor.begin()
+        update(); draw()
+        governor.end()      # 在 flip 之前: vsync 下 flip 会阻塞到垂直同步
+        flip()
+        clock.tick(60)
+"""
+import time
+from collections import deque
+
+from .perf import percentile
+
+LEVELS = (
+    {"name": "high",    "particles": 1.0,  "glow": True,  "layers": 2, "stars": 1.0},
+    {"name": "medium",  "particles": 0.5,  "glow": True,  "layers": 2, "stars": 0.6},
+    {"name": "low",     "particles": 0.25, "glow": False, "layers": 1, "stars": 0.3},
+    {"name": "minimal", "particles": 0.1,  "glow": False, "layers": 0, "stars": 0.15},
+)
+WINDOW = 30           # 统计帧时间的帧数
+DOWNGRADE_AT = 0.9    # p90 超过帧预算的这个比例时降档
+UPGRADE_AT = 0.6      # p90 低于帧预算的这个比例时可以升档
+HOLD = 120            # 升档前至少保持当前档位的帧数
+MAX_HOLD = 1920
+CHANGE_LOG = 100      # 保留最近多少次变化
+
+
+class QualityGovernor:
+    def __init__(self, enabled=False, fps=60, levels=LEVELS, window=WINDOW,
+                 downgrade_at=DOWNGRADE_AT, upgrade_at=UPGRADE_AT, hold=HOLD):
+        self.enabled = enabled
+        self.budget = 1.0 / fps
+        self.levels = levels
+        self.downgrade_at = downgrade_at
+        self.upgrade_at = upgrade_at
+        self.base_hold = hold
+        self.hold = hold
+        self.level = 0
+        self.settings = levels[0]
+        self.samples = deque(maxlen=window)
+        self.frame_start = 0.0
+        self.frames = 0
+        self.changed_at = 0       # 上次变化时的帧号
+        self.last_upgrade = None  # 上次升档时的帧号
+        self.changes = deque(maxlen=CHANGE_LOG)
+        self.downgrades = 0
+        self.upgrades = 0
+
+    def count(self, n):
+        """按当前档位缩放粒子数量, 原本非零时至少保留一个"""
+        if not n:
+            return 0
+        return max(1, int(n * self.settings["particles"]))
+
+    def begin(self):
+        """一帧开始"""
+        if self.enabled:
+            self.frame_start = time.perf_counter()
+
+    def end(self):
+        """一帧画完、提交画面 (flip) 之前调用, 需要时调整档位"""
+        if not self.enabled:
+            return
+        self.add(time.perf_counter() - self.frame_start)
+
+    def add(self, frame_time):
+        """记入一帧的工作时间 (秒)"""
+        self.frames += 1
+        samples = self.samples
+        samples.append(frame_time)
+        if len(samples) < samples.maxlen:
+            return
+        load = percentile(sorted(samples), 90) / self.budget
+        if load > self.downgrade_at and self.level < len(self.levels) - 1:
+            if self.last_upgrade is not None and self.frames - self.last_upgrade < self.hold:
+                self.hold = min(self.hold * 2, MAX_HOLD)
+            self._set(self.level + 1, load)
+        elif (load < self.upgrade_at and self.level > 0
+              and self.frames - self.changed_at >= self.hold):
+            self.last_upgrade = self.frames
+            self._set(self.level - 1, load)
+        elif self.last_upgrade is not None and self.frames - self.last_upgrade >= MAX_HOLD:
+            self.hold = self.base_hold  # 长时间稳定, 恢复升档的等待时间
+            self.last_upgrade = None
+
+    def _set(self, level, load):
+        if level > self.level:
+            self.downgrades += 1
+        else:
+            self.upgrades += 1
+        self.changes.append({"t": time.perf_counter(), "frame": self.frames, "from": self.levels[self.level]["name"],
+                             "to": self.levels[level]["name"], "load": load})
+        self.level = level
+        self.settings = self.levels[level]
+        self.changed_at = self.frames
+        self.samples.clear()  # 新档位重新积累一个窗口再做判断
+
+    def reset(self):
+        """回到最高档, 清空统计"""
+        self.level = 0
+        self.settings = self.levels[0]
+        self.samples.clear()
+        self.hold = self.base_hold
+        self.frames = self.changed_at = 0
+        self.last_upgrade = None
+        self.changes.clear()
+        self.downgrades = self.upgrades = 0
+
+    def stats(self):
+        """当前档位与设置、升降次数、最近的变化, 以及窗口内帧时间的 p90 (毫秒) 与负载"""
+        p90 = percentile(sorted(self.samples), 90)
+        return {
+            "enabled": self.enabled,
+            "level": self.settings["name"],
+            "settings": dict(self.settings),
+            "downgrades": self.downgrades,
+            "upgrades": self.upgrades,
+            "changes": list(self.changes),
+            "hold": self.hold,
+            "frame_p90_ms": p90 * 1000,
+            "load": p90 / self.budget,
+        }
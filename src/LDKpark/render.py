@@ -0,0 +1,147 @@
+"""
+可选的脏矩形渲染。
+
+菜单、设置、结束画面这类静态画面只在状态变化时整屏绘制一次,
+之后每帧什么都不画也不提交; 静态画面上的少量动画元素 (例如首页上下浮动的小鸟)
+通过 animate 报告自己改动的区域, 只重画并提交这些矩形。
+游戏进行中背景整屏滚动, 仍然整屏绘制并 flip。
+
+未启用时每帧都返回 "需要绘制" 并 flip, 行为与原来一致。
+"""
+import pygame
+
+_vsync = False  # 当前窗口是否以 vsync 创建
+
+
+def ensure_display(size, caption=None, vsync=False):
+    """
+    返回尺寸为 size 的显示窗口。已有同尺寸窗口时直接复用, 尺寸不同时只调整大小,
+    不会重新初始化 SDL, 多个游戏可以在同一个窗口里切换 (见 LDKpark.arcade)。
+    vsync=True 时以 SCALED | vsync=1 创建 (pygame 只在 SCALED 或 OPENGL 下支持 vsync)。
+    """
+    global _vsync
+    screen = pygame.display.get_surface()
+    if screen is None or screen.get_size() != tuple(size) or vsync != _vsync:
+        if vsync:
+            screen = pygame.display.set_mode(size, pygame.SCALED, vsync=1)
+        else:
+            screen = pygame.display.set_mode(size)
+        _vsync = vsync
+    if caption:
+        pygame.display.set_caption(caption)
+    return screen
+
+
+class DirtyRenderer:
+    def __init__(self, screen, enabled=True):
+        self.screen = screen
+        self.enabled = enabled
+        self.offscreen = False # 画在离屏 Surface 上, present 不提交到窗口 (见 LDKpark.observe)
+        self.key = None        # 当前静态画面的状态
+        self.backdrop = None   # 静态画面的底图, 用于擦除动画元素
+        self.sprites = {}      # 动画元素名 -> 上次绘制的矩形
+        self.rects = []
+        self.full = True
+        # 统计
+        self.frames = 0
+        self.full_updates = 0
+        self.partial_updates = 0
+
+    def static(self, key):
+        """
+        进入静态画面。key 描述画面上所有会变化的状态 (按钮悬停、文字等),
+        与上一帧相同时返回 False, 调用方跳过绘制; 否则返回 True, 调用方整屏重绘。
+        """
+        if not self.enabled:
+            return True
+        if key == self.key:
+            return False
+        self.key = key
+        self.backdrop = None
+        self.sprites.clear()
+        self.full = True
+        return True
+
+    def dynamic(self):
+        """整屏都在变化的画面, 本帧整屏提交"""
+        self.key = None
+        self.backdrop = None
+        self.sprites.clear()
+        self.full = True
+
+    def invalidate(self):
+        """强制下一帧整屏重绘, 例如关闭叠加在画面上的 HUD 之后"""
+        self.dynamic()
+
+    def animate(self, name, rect, draw):
+        """
+        静态画面上的动画元素: 用底图擦掉上次的位置, 调用 draw() 画到 rect,
+        两处都记为脏矩形。需要在本帧的静态部分画完之后调用。
+        """
+        if not self.enabled:
+            draw()
+            return
+        rect = pygame.Rect(rect)
+        old = self.sprites.get(name)
+        if old == rect and not self.full:
+            return
+        if self.backdrop is None:
+            self.backdrop = self.screen.copy()
+        elif old:
+            self.screen.blit(self.backdrop, old, old)
+            self.rects.append(old)
+        draw()
+        self.sprites[name] = rect
+        self.rects.append(rect)
+
+    def mark(self, rect):
+        """手动报告一个改动的区域"""
+        self.rects.append(pygame.Rect(rect))
+
+    def overlay(self, name, draw):
+        """
+        每帧叠加在最上层、大小会变的元素 (例如计时 HUD): draw() 绘制并返回占用的矩形,
+        没画时返回 None。静态画面上先用底图擦掉上一帧的区域, 新旧矩形的并集记为脏矩形,
+        变窄或关闭后旧区域不会残留。需要在本帧其他内容画完之后调用。
+        """
+        if not self.enabled or self.key is None:
+            return draw()  # 整屏重绘的帧不需要擦除
+        old = None if self.full else self.sprites.get(name)
+        if self.backdrop is None:
+            self.backdrop = self.screen.copy()
+        if old:
+            self.screen.blit(self.backdrop, old, old)
+        rect = draw()
+        if rect:
+            rect = pygame.Rect(rect)
+            self.sprites[name] = rect
+            self.rects.append(rect.union(old) if old else rect)
+        else:
+            self.sprites.pop(name, None)
+            if old:
+                self.rects.append(old)
+        return rect
+
+    def present(self):
+        """提交本帧: 整屏 flip, 或只更新脏矩形, 没有改动时什么都不做; 离屏时只清空脏矩形"""
+        self.frames += 1
+        if self.offscreen:
+            self.rects = []
+            self.full = False
+            return
+        if not self.enabled or self.full:
+            pygame.display.flip()
+            self.full_updates += 1
+        elif self.rects:
+            pygame.display.update(self.rects)
+            self.partial_updates += 1
+        self.rects = []
+        self.full = False
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "full_updates": self.full_updates,
+            "partial_updates": self.partial_updates,
+            "idle_frames": self.frames - self.full_updates - self.partial_updates,
+        }
@@ -0,0 +1,85 @@
+"""
+快照环形缓冲区, 用于回退 (按住回退键倒放最近 REWIND_SECONDS 秒)。
+
+每个模拟 tick 结束时, 游戏把自己的状态用 struct 打包成固定大小的记录, 写进预分配的
+bytearray 环形缓冲区 (不做 deepcopy, 不分配新对象); 缓冲区满了覆盖最旧的记录。
+变长的列表 (障碍、管道、粒子) 按上限预留位置, 记录头里存实际数量。
+
+随机数状态 (random.Random.getstate() 有 625 个整数) 不逐 tick 保存: 游戏在每次消耗
+模拟用的随机数时把版本号加一, 记录里只存版本号, 完整状态只在出现新版本时保存一份。
+回退时恢复到记录对应版本的状态, 并丢弃更新的版本, 之后重新生成的障碍流与原来一致。
+
+    history = SnapshotRing(RECORD_SIZE)
+    offset = history.push()
+    HEADER.pack_into(history.buffer, offset, ...)
+    history.save_rng(version, rng)
+"""
+from collections import deque
+
+from .timestep import SIM_HZ
+
+REWIND_SECONDS = 10
+
+
+class SnapshotRing:
+    def __init__(self, record_size, capacity=REWIND_SECONDS * SIM_HZ):
+        self.record_size = record_size
+        self.capacity = capacity
+        self.buffer = bytearray(record_size * capacity)
+        self.head = 0    # 下一条记录的位置
+        self.count = 0
+        # (版本, 随机数状态), 版本递增; 每次 push 最多新增一个版本, 所以保留 capacity 个就够
+        self.rng_states = deque(maxlen=capacity)
+
+    def __len__(self):
+        return self.count
+
+    def push(self):
+        """返回下一条记录在 buffer 中的偏移, 满了覆盖最旧的一条"""
+        offset = self.head * self.record_size
+        self.head = (self.head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+        return offset
+
+    def peek(self):
+        """最新一条记录的偏移, 没有记录时返回 None"""
+        if not self.count:
+            return None
+        return (self.head - 1) % self.capacity * self.record_size
+
+    def pop(self):
+        """丢弃最新一条记录, 返回它的偏移, 没有记录时返回 None"""
+        offset = self.peek()
+        if offset is not None:
+            self.head = (self.head - 1) % self.capacity
+            self.count -= 1
+        return offset
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+        self.rng_states.clear()
+
+    def save_rng(self, version, rng):
+        """版本号变化时保存一份随机数状态"""
+        states = self.rng_states
+        if not states or states[-1][0] != version:
+            states.append((version, rng.getstate()))
+
+    def load_rng(self, version, rng):
+        """把 rng 恢复到 version 时的状态, 丢弃更新的版本"""
+        states = self.rng_states
+        while len(states) > 1 and states[-1][0] > version:
+            states.pop()
+        if states:
+            rng.setstate(states[-1][1])
+
+    def stats(self):
+        return {
+            "records": self.count,
+            "capacity": self.capacity,
+            "record_bytes": self.record_size,
+            "buffer_kib": len(self.buffer) / 1024,
+            "rng_states": len(self.rng_states),
+        }
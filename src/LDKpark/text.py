@@ -0,0 +1,158 @@
+"""
+文字渲染工具。
+
+- load_font: 按名字加载系统字体。字体路径只解析一次并缓存到磁盘,
+  之后启动不再触发 fontconfig 的全量扫描 (pygame.font.SysFont 每个进程都会扫描)。
+  "找不到" 的结果也会缓存, 但只在各字体目录的修改时间不变时有效,
+  安装或删除字体后会重新查找。
+- TextCache: 按 (字体, 文本, 颜色) 缓存渲染好的文字 Surface 的 LRU,
+  分数、波数这类每帧都画但很少变化的文字只在变化时渲染一次。
+"""
+import json
+import os
+from collections import OrderedDict
+
+import pygame
+
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "LDKpark")
+FONT_CACHE_PATH = os.path.join(CACHE_DIR, "fonts.json")
+TEXT_CACHE_SIZE = 256
+# 常见平台的字体目录 (不存在的跳过); fontconfig 的缓存目录在 fc-cache 之后也会变
+FONT_DIRS = tuple(os.path.expanduser(d) for d in (
+    "/usr/share/fonts", "/usr/local/share/fonts", "~/.fonts", "~/.local/share/fonts",
+    "/var/cache/fontconfig", "/Library/Fonts", "/System/Library/Fonts", "~/Library/Fonts",
+    os.path.join(os.environ.get("WINDIR", r"C:\Windows"), "Fonts"),
+    os.path.join(os.environ.get("LOCALAPPDATA", "~"), "Microsoft", "Windows", "Fonts"),
+))
+
+_font_paths = None
+_font_dirs = None
+_fonts = {}
+_quit_registered = False
+
+
+def _font_dirs_state():
+    """各字体目录的修改时间 (纳秒), 安装或删除字体后会变化"""
+    state = {}
+    for d in FONT_DIRS:
+        try:
+            state[d] = os.stat(d).st_mtime_ns
+        except OSError:
+            pass
+    return state
+
+
+def _load_font_paths():
+    global _font_paths, _font_dirs
+    if _font_paths is None:
+        _font_dirs = _font_dirs_state()
+        try:
+            with open(FONT_CACHE_PATH, encoding="utf-8") as f:
+                data = json.load(f)
+            fonts = data["fonts"]
+            if data["dirs"] != _font_dirs:
+                # 字体目录变过: 找到的路径仍按文件是否存在检查, 找不到的结果作废
+                fonts = {name: path for name, path in fonts.items() if path is not None}
+            _font_paths = fonts
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            _font_paths = {}
+    return _font_paths
+
+
+def _save_font_paths():
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(FONT_CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump({"dirs": _font_dirs, "fonts": _font_paths}, f, ensure_ascii=False, indent=1)
+    except OSError:
+        pass  # 缓存写不进去只是下次再扫描一遍
+
+
+def find_font(name):
+    """字体文件路径, 找不到为 None。结果会写入磁盘缓存, 找不到的结果只在字体目录不变时有效"""
+    paths = _load_font_paths()
+    if name in paths:
+        path = paths[name]
+        if path is None or os.path.exists(path):
+            return path
+    path = pygame.font.match_font(name)
+    paths[name] = path
+    _save_font_paths()
+    return path
+
+
+def clear_font_cache():
+    """删除磁盘上的字体路径缓存, 安装新字体后使用"""
+    global _font_paths
+    _font_paths = None
+    _fonts.clear()
+    try:
+        os.remove(FONT_CACHE_PATH)
+    except OSError:
+        pass
+
+
+def load_font(name, size):
+    """
+    与 pygame.font.SysFont(name, size) 等价, 找不到字体时使用默认字体。
+    同名同字号的 Font 对象在进程内共用。
+    """
+    global _quit_registered
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        if not _quit_registered:
+            # pygame.quit 之后旧的 Font 和文字 Surface 都不能再用
+            pygame.register_quit(_forget_fonts)
+            _quit_registered = True
+        font = pygame.font.Font(find_font(name) if name else None, size)
+        _fonts[key] = font
+    return font
+
+
+def _forget_fonts():
+    global _quit_registered
+    _fonts.clear()
+    text_cache.clear()
+    _quit_registered = False
+
+
+class TextCache:
+    """渲染结果的 LRU 缓存, 颜色需为元组"""
+    def __init__(self, maxsize=TEXT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, color, antialias)
+        surface = self.items.get(key)
+        if surface is not None:
+            self.items.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.items[key] = surface
+        if len(self.items) > self.maxsize:
+            self.items.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.items.clear()
+
+    def stats(self):
+        return {"size": len(self.items), "hits": self.hits, "misses": self.misses}
+
+
+text_cache = TextCache()
+
+
+def render(font, text, color, antialias=True):
+    """用全局 TextCache 渲染文字"""
+    return text_cache.render(font, text, color, antialias)
@@ -0,0 +1,44 @@
+"""
+固定步长模拟工具。
+
+游戏逻辑按固定频率 (默认 60 Hz) 推进, 与渲染帧率无关:
+每个渲染帧把真实耗时累加进累加器, 再按需执行 0~N 次模拟步,
+剩余不足一步的时间用作插值系数 alpha, 绘制时在上一步与当前步之间插值。
+"""
+
+SIM_HZ = 60
+MAX_STEPS = 5  # 每个渲染帧最多追赶的模拟步数
+
+
+def lerp(a, b, t):
+    """线性插值"""
+    return a + (b - a) * t
+
+
+class FixedTimestep:
+    """累加器式固定步长"""
+    def __init__(self, hz=SIM_HZ, max_steps=MAX_STEPS):
+        self.dt = 1.0 / hz
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.alpha = 1.0
+
+    def reset(self):
+        """清空累加器, 用于开局或从暂停恢复"""
+        self.accumulator = 0.0
+        self.alpha = 1.0
+
+    def advance(self, frame_time):
+        """
+        累加本帧真实耗时 (秒), 返回本帧需要执行的模拟步数。
+        超过 max_steps 时丢弃积压的时间, 防止慢机器陷入死亡螺旋。
+        """
+        self.accumulator += frame_time
+        steps = int(self.accumulator / self.dt)
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator %= self.dt
+        else:
+            self.accumulator -= steps * self.dt
+        self.alpha = self.accumulator / self.dt
+        return steps
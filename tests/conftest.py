@@ -0,0 +1,5 @@
+import os
+
+# games100 在导入时就会初始化 pygame.mixer, 没有声卡和显示器的环境里用 SDL 的空驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
@@ -0,0 +1,54 @@
+import pygame
+
+from LDKpark.arcade import Arcade
+from LDKpark.perf import FrameProfiler
+
+class RecordingScene:
+    """只记录 step 收到的事件的场景"""
+    def __init__(self):
+        self.profiler = FrameProfiler()
+        self.keys = []
+
+    def enter(self):
+        pass
+
+    def exit(self):
+        pass
+
+    def step(self, frame_time, events=None):
+        self.keys.extend(e.key for e in events if e.type == pygame.KEYDOWN)
+        return True
+
+    def draw(self):
+        pass
+
+def post_keys(*keys):
+    for key in keys:
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key))
+
+def test_unconsumed_events_go_straight_to_scene():
+    arcade = Arcade(games=["snake"])
+    try:
+        scene = arcade.scene = RecordingScene()
+        post_keys(pygame.K_a, pygame.K_b, pygame.K_c)
+        arcade.frame(0)
+        left = pygame.event.get(pygame.KEYDOWN)
+    finally:
+        arcade.close()
+    # 事件按原顺序直接交给场景, 不放回队列
+    assert scene.keys == [pygame.K_a, pygame.K_b, pygame.K_c]
+    assert left == []
+
+def test_events_after_menu_key_reach_the_menu():
+    arcade = Arcade(games=["snake"])
+    try:
+        arcade.scene = RecordingScene()
+        menu = arcade.menu = RecordingScene()
+        post_keys(pygame.K_a, pygame.K_ESCAPE, pygame.K_b)
+        arcade.frame(0)
+        assert arcade.scene is menu
+        arcade.frame(0)
+    finally:
+        arcade.close()
+    # ESC 由 arcade 处理, 同一帧剩下的事件下一帧交给菜单
+    assert menu.keys == [pygame.K_a, pygame.K_b]
@@ -0,0 +1,22 @@
+import time
+
+from LDKpark import add, start
+
+def test_add():
+    assert add(1,2)==3
+
+def test_start_close(monkeypatch):
+    # 子进程继承环境变量, 用 SDL 的空驱动在无显示的环境里跑
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    monkeypatch.setenv("SDL_AUDIODRIVER", "dummy")
+    handle = start("snake", fps=30)
+    deadline = time.time() + 20
+    while handle.stats()["frames"] == 0 and time.time() < deadline:
+        assert handle.is_alive()
+        time.sleep(0.05)
+    stats = handle.stats()
+    assert stats["frames"] > 0
+    assert stats["alive"] and handle.is_alive()
+    assert handle.close() == 0
+    assert not handle.is_alive()
+    assert handle.stats()["exitcode"] == 0
@@ -0,0 +1,56 @@
+import pygame
+
+from LDKpark.render import DirtyRenderer
+
+def test_overlay_erases_previous_area_on_static_screen():
+    pygame.init()
+    try:
+        screen = pygame.display.set_mode((100, 100))
+        renderer = DirtyRenderer(screen)
+        width = [60]
+
+        def draw_hud():
+            if not width[0]:
+                return None
+            return screen.fill((255, 255, 255), (0, 0, width[0], 10))
+
+        def frame():
+            if renderer.static("PAUSED"):
+                screen.fill((0, 0, 255))
+            rect = renderer.overlay("hud", draw_hud)
+            dirty = list(renderer.rects)
+            renderer.present()
+            return rect, dirty
+
+        frame()
+        # HUD 变窄: 旧区域用底图擦掉, 新旧矩形的并集都要提交
+        width[0] = 20
+        rect, dirty = frame()
+        assert rect == pygame.Rect(0, 0, 20, 10)
+        assert dirty == [pygame.Rect(0, 0, 60, 10)]
+        assert screen.get_at((40, 5))[:3] == (0, 0, 255)
+        assert screen.get_at((10, 5))[:3] == (255, 255, 255)
+
+        # HUD 关闭: 只剩旧区域
+        width[0] = 0
+        rect, dirty = frame()
+        assert rect is None
+        assert dirty == [pygame.Rect(0, 0, 20, 10)]
+        assert screen.get_at((10, 5))[:3] == (0, 0, 255)
+
+        # 没有 HUD 时空闲帧不提交任何区域
+        _, dirty = frame()
+        assert dirty == []
+    finally:
+        pygame.quit()
+
+def test_overlay_on_dynamic_screen_just_draws():
+    pygame.init()
+    try:
+        screen = pygame.display.set_mode((50, 50))
+        renderer = DirtyRenderer(screen)
+        renderer.dynamic()
+        assert renderer.overlay("hud", lambda: pygame.Rect(0, 0, 5, 5)) == pygame.Rect(0, 0, 5, 5)
+        assert renderer.backdrop is None and renderer.rects == []
+    finally:
+        pygame.quit()
@@ -0,0 +1,105 @@
+import random
+import struct
+
+import pygame
+
+from LDKpark.rewind import SnapshotRing
+
+RECORD = struct.Struct("<id")
+
+def push(ring, i):
+    RECORD.pack_into(ring.buffer, ring.push(), i, i / 2)
+
+def pop_all(ring):
+    values = []
+    while len(ring):
+        values.append(RECORD.unpack_from(ring.buffer, ring.pop())[0])
+    return values
+
+def test_push_peek_pop_round_trip():
+    ring = SnapshotRing(RECORD.size, capacity=8)
+    assert ring.peek() is None and ring.pop() is None
+    for i in range(3):
+        push(ring, i)
+    assert len(ring) == 3
+    assert RECORD.unpack_from(ring.buffer, ring.peek()) == (2, 1.0)
+    assert pop_all(ring) == [2, 1, 0]
+    assert ring.pop() is None
+
+def test_wraparound_overwrites_oldest():
+    ring = SnapshotRing(RECORD.size, capacity=4)
+    for i in range(10):
+        push(ring, i)
+    assert len(ring) == 4
+    assert len(ring.buffer) == 4 * RECORD.size
+    assert pop_all(ring) == [9, 8, 7, 6]
+
+def test_push_after_pop_reuses_slot():
+    ring = SnapshotRing(RECORD.size, capacity=4)
+    for i in range(6):
+        push(ring, i)
+    ring.pop()
+    ring.pop()
+    push(ring, 100)
+    assert pop_all(ring) == [100, 3, 2]
+
+def test_clear():
+    ring = SnapshotRing(RECORD.size, capacity=4)
+    push(ring, 1)
+    ring.save_rng(1, random.Random(0))
+    ring.clear()
+    assert len(ring) == 0 and ring.peek() is None and not ring.rng_states
+
+def test_rng_versions():
+    ring = SnapshotRing(RECORD.size, capacity=4)
+    rng = random.Random(1)
+    ring.save_rng(1, rng)
+    ring.save_rng(1, rng)  # 版本没变, 不重复保存
+    assert len(ring.rng_states) == 1
+    first = [rng.random() for _ in range(3)]
+    ring.save_rng(2, rng)
+    second = [rng.random() for _ in range(3)]
+    ring.save_rng(3, rng)
+
+    ring.load_rng(2, rng)
+    assert [rng.random() for _ in range(3)] == second
+    assert [v for v, _ in ring.rng_states] == [1, 2]
+    ring.load_rng(1, rng)
+    assert [rng.random() for _ in range(3)] == first
+
+def test_runner_rewind_replays_same_stream():
+    from LDKpark.games100 import runner
+
+    pygame.init()
+    try:
+        game = runner.RunnerGame()
+        game.sim.rng = random.Random(0)
+        game.history = SnapshotRing(runner.RECORD_SIZE, capacity=50)
+        game.state = "PLAYING"
+        game.reset_game()
+        pilot = runner.Autopilot()
+
+        def step():
+            pilot.act(game.sim)
+            game.update_game()
+
+        def state():
+            sim = game.sim
+            return (sim.tick, sim.score, sim.game_speed, sim.player.y, sim.next_gap,
+                    [(o.type, o.x, o.y) for o in sim.obstacles])
+
+        timeline = []
+        for _ in range(200):  # 超过容量, 环形缓冲区已经覆盖过
+            step()
+            assert game.state == "PLAYING"
+            timeline.append(state())
+        assert len(game.history) == 50
+
+        game.rewind(30)
+        assert state() == timeline[-31]
+        # 随机数状态随快照恢复, 重放得到同样的障碍流
+        for expected in timeline[-30:]:
+            step()
+            assert state() == expected
+    finally:
+        pygame.quit()
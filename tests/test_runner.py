@@ -0,0 +1,44 @@
+import random
+
+from LDKpark.games100.runner import Autopilot, RunnerSim
+
+def trace(seed, ticks=2000):
+    """按 tick 记录得分、速度和每个障碍的 (类型, 位置)"""
+    sim = RunnerSim(random.Random(seed))
+    pilot = Autopilot()
+    frames = []
+    while sim.alive and sim.tick < ticks:
+        pilot.act(sim)
+        sim.step()
+        frames.append((sim.score, sim.game_speed, sim.player.y,
+                       tuple((o.type, o.x, o.y) for o in sim.obstacles)))
+    return frames
+
+def test_same_seed_replays_identically():
+    assert trace(7) == trace(7)
+
+def test_different_seeds_differ():
+    assert trace(1) != trace(2)
+
+def test_run_returns_score_and_is_deterministic():
+    scores = [RunnerSim(random.Random(3)).run(3000, Autopilot()) for _ in range(2)]
+    assert scores[0] == scores[1]
+    assert scores[0] > 0
+
+def test_without_autopilot_player_hits_an_obstacle():
+    sim = RunnerSim(random.Random(0))
+    results = [sim.step() for _ in range(2000) if sim.alive]
+    assert results[-1] is False
+    assert not sim.alive
+    # 撞上之后 run() 不再推进
+    tick = sim.tick
+    sim.run(5000)
+    assert sim.tick == tick
+
+def test_reset_starts_a_new_round():
+    sim = RunnerSim(random.Random(0))
+    sim.run(2000)
+    sim.reset()
+    assert sim.alive and sim.tick == 0 and sim.score == 0
+    assert sim.obstacles == []
+    assert sim.game_speed == sim.start_speed
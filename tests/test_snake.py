@@ -0,0 +1,107 @@
+import random
+
+from LDKpark.games100.snake import DOWN, LEFT, MOVE_EVERY, RIGHT, UP, SnakeSim
+
+def make(width=12, height=8, seed=0):
+    sim = SnakeSim(width, height, random.Random(seed))
+    sim.food = sim.width * sim.height - 1  # 右下角, 不在下面几步的路线上
+    return sim
+
+def cell(sim, x, y):
+    return y * sim.width + x
+
+def check_free_list(sim):
+    assert sorted(sim.free) == [c for c in range(len(sim.occupied)) if not sim.occupied[c]]
+    for i, c in enumerate(sim.free):
+        assert sim.free_pos[c] == i
+    assert sorted(sim.body) == [c for c in range(len(sim.occupied)) if sim.occupied[c]]
+
+def test_initial_state():
+    sim = make()
+    assert list(sim.body) == [cell(sim, 3, 4), cell(sim, 2, 4), cell(sim, 1, 4)]
+    assert sim.direction == RIGHT and sim.alive and sim.score == 0
+    check_free_list(sim)
+
+def test_step_moves_every_n_ticks():
+    sim = make()
+    head = sim.head
+    for _ in range(MOVE_EVERY - 1):
+        assert sim.step()
+        assert sim.head == head
+    assert sim.step()
+    assert sim.head == cell(sim, 4, 4)
+    assert len(sim.body) == 3
+    check_free_list(sim)
+
+def test_eating_grows_and_scores():
+    sim = make()
+    sim.food = cell(sim, 4, 4)
+    assert sim.move()
+    assert len(sim.body) == 4 and sim.score == 1
+    assert sim.food is not None and not sim.occupied[sim.food]
+    check_free_list(sim)
+
+def test_reverse_turn_is_ignored():
+    sim = make()
+    sim.turn(LEFT)
+    assert not sim.turns
+    sim.turn(UP)
+    sim.turn(DOWN)  # 与排队中的 UP 相反
+    assert list(sim.turns) == [UP]
+
+def test_wall_collision():
+    sim = make()
+    for _ in range(sim.width - 4):
+        assert sim.move()
+    assert not sim.move()
+    assert not sim.alive
+    assert not sim.step()
+
+def grow_to(sim, length):
+    x = sim.cell_xy(sim.head)[0]
+    while len(sim.body) < length:
+        x += 1
+        sim.food = cell(sim, x, 4)
+        assert sim.move()
+    sim.food = sim.width * sim.height - 1
+
+def test_self_collision():
+    sim = make()
+    grow_to(sim, 5)
+    for direction in (UP, LEFT):
+        sim.turn(direction)
+        assert sim.move()
+    sim.turn(DOWN)
+    assert not sim.move()
+    assert not sim.alive
+
+def test_head_may_follow_tail():
+    sim = make()
+    grow_to(sim, 4)
+    for direction in (UP, LEFT):
+        sim.turn(direction)
+        assert sim.move()
+    # 长度为 4 时绕一圈, 头走进尾巴刚离开的格子
+    tail = sim.body[-1]
+    sim.turn(DOWN)
+    assert sim.move()
+    assert sim.head == tail
+    assert len(sim.body) == 4
+    check_free_list(sim)
+
+def test_full_board_is_a_win():
+    sim = make(width=4, height=2)
+    for c in list(sim.free):
+        sim._occupy(c)
+    sim.place_food()
+    assert sim.won and not sim.alive and sim.food is None
+
+def test_same_seed_same_food():
+    foods = []
+    for _ in range(2):
+        sim = SnakeSim(rng=random.Random(5))
+        foods.append([sim.food])
+        for _ in range(3):
+            sim.place_food()
+            foods[-1].append(sim.food)
+    assert foods[0] == foods[1]
@@ -0,0 +1,69 @@
+import os
+
+import pygame
+
+from LDKpark import text
+
+def use_cache(monkeypatch, tmp_path, font_dir, matches):
+    """字体缓存和字体目录都放到临时目录, match_font 换成记录调用次数的假函数"""
+    monkeypatch.setattr(text, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(text, "FONT_CACHE_PATH", str(tmp_path / "fonts.json"))
+    monkeypatch.setattr(text, "FONT_DIRS", (str(font_dir),))
+    monkeypatch.setattr(text, "_font_paths", None)
+    calls = []
+
+    def match_font(name):
+        calls.append(name)
+        return matches.get(name)
+    monkeypatch.setattr(pygame.font, "match_font", match_font)
+    return calls
+
+def restart(monkeypatch):
+    """模拟新进程: 丢掉内存里的缓存, 从磁盘重新读"""
+    monkeypatch.setattr(text, "_font_paths", None)
+
+def test_missing_font_cached_until_font_dir_changes(monkeypatch, tmp_path):
+    font_dir = tmp_path / "fonts"
+    font_dir.mkdir()
+    matches = {}
+    calls = use_cache(monkeypatch, tmp_path, font_dir, matches)
+
+    assert text.find_font("nosuchfont") is None
+    restart(monkeypatch)
+    assert text.find_font("nosuchfont") is None
+    assert calls == ["nosuchfont"]
+
+    # 安装字体: 目录的修改时间变了, 找不到的结果作废
+    font = font_dir / "nosuchfont.ttf"
+    font.write_bytes(b"")
+    stat = os.stat(font_dir)
+    os.utime(font_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    matches["nosuchfont"] = str(font)
+    restart(monkeypatch)
+    assert text.find_font("nosuchfont") == str(font)
+    assert calls == ["nosuchfont", "nosuchfont"]
+
+def test_found_font_survives_font_dir_change(monkeypatch, tmp_path):
+    font_dir = tmp_path / "fonts"
+    font_dir.mkdir()
+    font = tmp_path / "a.ttf"
+    font.write_bytes(b"")
+    calls = use_cache(monkeypatch, tmp_path, font_dir, {"a": str(font)})
+
+    assert text.find_font("a") == str(font)
+    (font_dir / "b.ttf").write_bytes(b"")
+    restart(monkeypatch)
+    assert text.find_font("a") == str(font)
+    assert calls == ["a"]
+
+    # 字体文件被删掉时重新查找
+    font.unlink()
+    restart(monkeypatch)
+    text.find_font("a")
+    assert calls == ["a", "a"]
+
+def test_old_cache_format_is_ignored(monkeypatch, tmp_path):
+    calls = use_cache(monkeypatch, tmp_path, tmp_path, {})
+    (tmp_path / "fonts.json").write_text('{"simhei": null}', encoding="utf-8")
+    assert text.find_font("simhei") is None
+    assert calls == ["simhei"]
@@ -0,0 +1,43 @@
+import pytest
+
+from LDKpark.timestep import FixedTimestep, lerp
+
+def test_lerp():
+    assert lerp(10, 20, 0.0) == 10
+    assert lerp(10, 20, 0.25) == 12.5
+    assert lerp(10, 20, 1.0) == 20
+
+def test_accumulates_partial_frames():
+    ts = FixedTimestep(hz=100)
+    assert ts.advance(0.004) == 0
+    assert ts.alpha == pytest.approx(0.4)
+    assert ts.advance(0.004) == 0
+    assert ts.alpha == pytest.approx(0.8)
+    # 跨过一步后余下的时间留在累加器里
+    assert ts.advance(0.004) == 1
+    assert ts.accumulator == pytest.approx(0.002)
+    assert ts.alpha == pytest.approx(0.2)
+
+def test_several_steps_in_one_frame():
+    ts = FixedTimestep(hz=100, max_steps=5)
+    assert ts.advance(0.035) == 3
+    assert ts.alpha == pytest.approx(0.5)
+
+def test_total_steps_match_elapsed_time():
+    ts = FixedTimestep(hz=60)
+    steps = sum(ts.advance(1 / 144) for _ in range(144 * 3))
+    assert abs(steps - 180) <= 1
+
+def test_max_steps_drops_backlog():
+    ts = FixedTimestep(hz=100, max_steps=5)
+    assert ts.advance(1.0 + 0.003) == 5
+    # 积压的时间被丢弃, 只保留不足一步的部分
+    assert ts.accumulator == pytest.approx(0.003)
+    assert ts.advance(0.0) == 0
+
+def test_reset():
+    ts = FixedTimestep(hz=100)
+    ts.advance(0.005)
+    ts.reset()
+    assert ts.accumulator == 0.0
+    assert ts.alpha == 1.0